@@ -14,6 +14,7 @@ import redis
 import os
 
 from backend.app.core.errors import AuthenticationError, ErrorCodes
+from backend.app.core.user_cache import UserContextCache, user_ctx_key, decode_context
 
 
 # ============================================================================
@@ -42,6 +43,9 @@ except:
     print("⚠️  Redis not available - token blacklist disabled")
     redis_client = None
 
+# Cached user context (email_verified, role, is_active) keyed by user id
+user_context_cache = UserContextCache(redis_client)
+
 
 # ============================================================================
 # JWT TOKEN MANAGEMENT
@@ -105,6 +109,62 @@ def blacklist_token(token: str, expiry_seconds: int):
         print(f"Failed to blacklist token: {e}")
 
 
+def invalidate_user_context(user_id) -> None:
+    """
+    Drop cached user context.
+    
+    MUST be called after any write that changes email_verified, role or
+    is_active for a user.
+    """
+    user_context_cache.invalidate(str(user_id))
+
+
+async def _load_user_context(user_id: str) -> Optional[dict]:
+    """Read user context from the database (cache miss path)"""
+    from backend.app.database import AsyncSessionLocal
+    from database.schemas_v2 import User
+    
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, uuid.UUID(user_id))
+        if not user:
+            return None
+        return {
+            "email_verified": user.email_verified,
+            "is_active": user.is_active,
+            "role": getattr(user, "role", None),
+        }
+
+
+def _check_blacklist_and_cached_context(token: str, user_id: str) -> tuple[bool, Optional[dict]]:
+    """
+    Check token blacklist and read cached user context.
+    
+    L1 hit: one EXISTS. L1 miss: EXISTS + HGETALL pipelined in one round trip.
+    
+    Returns: (is_blacklisted, context_or_None)
+    """
+    context = user_context_cache.get_local(user_id)
+    
+    if not redis_client:
+        return False, context
+    
+    try:
+        if context is not None:
+            return redis_client.exists(f"blacklist:{token}") > 0, context
+        
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.exists(f"blacklist:{token}")
+        pipe.hgetall(user_ctx_key(user_id))
+        blacklisted, fields = pipe.execute()
+        
+        context = decode_context(fields)
+        if context is not None:
+            user_context_cache.set_local(user_id, context)
+        return blacklisted > 0, context
+    except Exception:
+        return False, context
+
+
 # ============================================================================
 # AUTHENTICATION MIDDLEWARE
 # ============================================================================
@@ -136,19 +196,8 @@ async def get_current_user(
     Raises:
         AuthenticationError: If token is missing, invalid, expired, or revoked
     """
-    from sqlalchemy.orm import Session
-    from backend.app.database import get_db
-    from database.schemas_v2 import User
-    
     token = credentials.credentials
     
-    # Check if token is blacklisted (INV-A001)
-    if is_token_blacklisted(token):
-        raise AuthenticationError(
-            error_code=ErrorCodes.AUTH_TOKEN_REVOKED,
-            message="Token has been revoked"
-        )
-    
     # Decode token
     try:
         payload = decode_token(token)
@@ -182,21 +231,29 @@ async def get_current_user(
             message="Invalid token payload"
         )
     
-    # Query database to get email_verified status (required for INV-A010)
-    # This adds a DB query but ensures email_verified is always current
+    # Check if token is blacklisted (INV-A001) and read cached user context
+    blacklisted, context = _check_blacklist_and_cached_context(token, user_id)
+    if blacklisted:
+        raise AuthenticationError(
+            error_code=ErrorCodes.AUTH_TOKEN_REVOKED,
+            message="Token has been revoked"
+        )
+    
+    # Resolve email_verified status (required for INV-A010)
+    # Cache miss falls back to the database and repopulates both tiers
+    if context is None:
+        try:
+            context = await _load_user_context(user_id)
+            if context is not None:
+                user_context_cache.store(user_id, context)
+        except Exception:
+            # If DB query fails, assume email not verified (fail-closed)
+            context = None
+    
     email_verified = False
-    try:
-        # Get DB from request state (set by dependency injection)
-        db_gen = get_db()
-        db = next(db_gen)
-        user = db.query(User).filter(User.id == user_id).first()
-        if user:
-            email_verified = user.email_verified
-            role = user.role  # Always use role from DB (not JWT)
-        db_gen.close()
-    except Exception:
-        # If DB query fails, assume email not verified (fail-closed)
-        pass
+    if context is not None:
+        email_verified = context["email_verified"]
+        role = context.get("role") or role  # Prefer role from DB (not JWT)
     
     # Create user context
     user = CurrentUser(
@@ -88,6 +88,7 @@ class ErrorCodes:
     FILE_UPLOAD_FAILED = "FILE_UPLOAD_FAILED"
     FILE_ENCRYPTION_FAILED = "FILE_ENCRYPTION_FAILED"
     FILE_DECRYPTION_FAILED = "FILE_DECRYPTION_FAILED"
+    FILE_RANGE_NOT_SATISFIABLE = "FILE_RANGE_NOT_SATISFIABLE"
     
     # Rate Limiting (RATE_*)
     RATE_LIMIT_EXCEEDED = "RATE_LIMIT_EXCEEDED"
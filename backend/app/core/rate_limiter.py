@@ -1,16 +1,23 @@
 """
 Rate Limiting for Tax-Ease API v2
 
-Redis-based rate limiting using token bucket algorithm.
+Redis-based sliding-window rate limiting.
 Enforces OTP-RL-001, OTP-RL-002, OTP-RL-003.
 
+Each check runs as a single server-side Lua script (one round trip, atomic
+under concurrency) over a shared module-level async connection pool.
+
 CRITICAL: Fail-closed behavior - if Redis unavailable, deny request.
 """
 
-import time
-from typing import Optional
-import redis
+import asyncio
+import hashlib
 import os
+import uuid
+from typing import Optional, List, Tuple
+
+import redis
+import redis.asyncio as aioredis
 from fastapi import Request, HTTPException, status
 
 from backend.app.core.errors import APIException, ErrorCodes
@@ -20,20 +27,110 @@ from backend.app.core.errors import APIException, ErrorCodes
 # REDIS CLIENT
 # ============================================================================
 
-def get_redis_client():
-    """Get Redis client for rate limiting"""
-    redis_host = os.getenv("REDIS_HOST", "localhost")
-    redis_port = int(os.getenv("REDIS_PORT", 6379))
-    redis_password = os.getenv("REDIS_PASSWORD", None)
-    
-    return redis.Redis(
-        host=redis_host,
-        port=redis_port,
-        password=redis_password,
-        decode_responses=True,
-        socket_connect_timeout=2,
-        socket_timeout=2
-    )
+_async_pool: Optional[aioredis.ConnectionPool] = None
+_async_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_async_redis_client() -> aioredis.Redis:
+    """
+    Get async Redis client for rate limiting.
+    
+    All clients share one module-level connection pool (created lazily on
+    the running event loop) instead of opening a new pool per request.
+    """
+    global _async_pool, _async_pool_loop
+    
+    loop = asyncio.get_running_loop()
+    if _async_pool is None or _async_pool_loop is not loop:
+        _async_pool = aioredis.ConnectionPool(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=int(os.getenv("REDIS_PORT", 6379)),
+            password=os.getenv("REDIS_PASSWORD", None),
+            decode_responses=True,
+            socket_connect_timeout=2,
+            socket_timeout=2,
+            max_connections=int(os.getenv("REDIS_RATE_LIMIT_MAX_CONNECTIONS", 50))
+        )
+        _async_pool_loop = loop
+    
+    return aioredis.Redis(connection_pool=_async_pool)
+
+
+# ============================================================================
+# LUA SCRIPTS
+# ============================================================================
+
+# Sliding-window log over a sorted set per key (score = server time in ms,
+# which stays within Lua's 14 significant digits when passed to ZADD).
+# Checks every key, and records the hit in all of them only if all allow it.
+#
+# KEYS[i]   rate limit key
+# ARGV[1]   unique request id (sorted set member)
+# ARGV[2i]  limit for KEYS[i]
+# ARGV[2i+1] window (seconds) for KEYS[i]
+#
+# Returns one value per key: 0 if allowed, otherwise seconds until a slot frees up
+SLIDING_WINDOW_CHECK_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local results = {}
+local all_allowed = true
+
+for i = 1, #KEYS do
+    local limit = tonumber(ARGV[2 * i])
+    local window = tonumber(ARGV[2 * i + 1]) * 1000
+    redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', now - window)
+    local count = redis.call('ZCARD', KEYS[i])
+    if count >= limit then
+        all_allowed = false
+        local wait = window
+        local oldest = redis.call('ZRANGE', KEYS[i], 0, 0, 'WITHSCORES')
+        if oldest[2] then
+            wait = tonumber(oldest[2]) + window - now
+        end
+        results[i] = math.max(1, math.ceil(wait / 1000))
+    else
+        results[i] = 0
+    end
+end
+
+if all_allowed then
+    for i = 1, #KEYS do
+        redis.call('ZADD', KEYS[i], now, ARGV[1])
+        redis.call('EXPIRE', KEYS[i], tonumber(ARGV[2 * i + 1]))
+    end
+end
+
+return results
+"""
+
+# Record a hit unconditionally (post-action tracking such as failed logins).
+#
+# KEYS[1]  rate limit key
+# ARGV[1]  unique request id
+# ARGV[2]  window (seconds)
+#
+# Returns the number of hits inside the window, including this one
+SLIDING_WINDOW_RECORD_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local window = tonumber(ARGV[2]) * 1000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+redis.call('ZADD', KEYS[1], now, ARGV[1])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+return redis.call('ZCARD', KEYS[1])
+"""
+
+_CHECK_SHA = hashlib.sha1(SLIDING_WINDOW_CHECK_LUA.encode()).hexdigest()
+_RECORD_SHA = hashlib.sha1(SLIDING_WINDOW_RECORD_LUA.encode()).hexdigest()
+
+
+async def _run_script(client: aioredis.Redis, script: str, sha: str, keys: list, args: list):
+    """EVALSHA with a one-time EVAL fallback when the script is not cached yet"""
+    try:
+        return await client.evalsha(sha, len(keys), *keys, *args)
+    except redis.exceptions.NoScriptError:
+        return await client.eval(script, len(keys), *keys, *args)
 
 
 # ============================================================================
@@ -86,23 +183,33 @@ RATE_LIMITS = {
 
 
 # ============================================================================
-# TOKEN BUCKET RATE LIMITER
+# SLIDING WINDOW RATE LIMITER
 # ============================================================================
 
+def _redis_key(key: str, identifier: str) -> str:
+    """Sorted-set key for a rule and identifier"""
+    return f"ratelimit:sw:{key}:{identifier}"
+
+
 class RateLimiter:
     """
-    Token bucket rate limiter using Redis.
+    Sliding-window rate limiter using Redis.
     
     Features:
-    - Sliding window counter
-    - Automatic expiry
+    - True sliding window (sorted set of hit timestamps)
+    - Check-and-count in one atomic Lua call
+    - Batched checks across several rules in one round trip
     - Fail-closed (deny if Redis unavailable)
     """
     
-    def __init__(self):
-        self.redis = get_redis_client()
+    def __init__(self, redis_client: Optional[aioredis.Redis] = None):
+        self._redis = redis_client
+    
+    @property
+    def redis(self) -> aioredis.Redis:
+        return self._redis or get_async_redis_client()
     
-    def check_rate_limit(
+    async def check_rate_limit(
         self,
         key: str,
         limit: int,
@@ -124,38 +231,46 @@ class RateLimiter:
         Raises:
             APIException: If Redis unavailable (fail-closed)
         """
+        results = await self.check_rate_limits([(key, limit, window, identifier)])
+        return results[0]
+    
+    async def check_rate_limits(
+        self,
+        checks: List[Tuple[str, int, int, str]]
+    ) -> List[tuple[bool, Optional[int]]]:
+        """
+        Check several rate limits in one round trip.
+        
+        The hit is counted against every rule only if all of them allow it,
+        so a request blocked by one rule does not consume the others.
+        
+        Args:
+            checks: List of (key, limit, window, identifier)
         
-        redis_key = f"ratelimit:{key}:{identifier}"
+        Returns:
+            One (is_allowed, remaining_seconds_if_blocked) per check, in order
+        
+        Raises:
+            APIException: If Redis unavailable (fail-closed)
+        """
+        keys = [_redis_key(key, identifier) for key, _, _, identifier in checks]
+        args = [uuid.uuid4().hex]
+        for _, limit, window, _ in checks:
+            args.extend([limit, window])
         
         try:
-            # Get current count
-            current = self.redis.get(redis_key)
-            
-            if current is None:
-                # First request - set counter and expiry
-                self.redis.setex(redis_key, window, 1)
-                return True, None
-            
-            current_count = int(current)
-            
-            if current_count >= limit:
-                # Rate limit exceeded - get TTL
-                ttl = self.redis.ttl(redis_key)
-                return False, ttl if ttl > 0 else window
-            
-            # Increment counter
-            self.redis.incr(redis_key)
-            return True, None
-            
-        except redis.RedisError as e:
+            waits = await _run_script(self.redis, SLIDING_WINDOW_CHECK_LUA, _CHECK_SHA, keys, args)
+        except redis.RedisError:
             # FAIL-CLOSED: If Redis unavailable, deny request
             raise APIException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 error_code=ErrorCodes.SERVER_INTERNAL_ERROR,
                 message="Service temporarily unavailable. Please try again later."
             )
+        
+        return [(True, None) if int(wait) == 0 else (False, int(wait)) for wait in waits]
     
-    def increment_counter(
+    async def increment_counter(
         self,
         key: str,
         identifier: str,
@@ -166,48 +281,44 @@ class RateLimiter:
         
         Returns: Current count
         """
-        redis_key = f"ratelimit:{key}:{identifier}"
-        
         try:
-            current = self.redis.get(redis_key)
-            
-            if current is None:
-                self.redis.setex(redis_key, window, 1)
-                return 1
-            
-            count = self.redis.incr(redis_key)
-            return count
-            
+            count = await _run_script(
+                self.redis,
+                SLIDING_WINDOW_RECORD_LUA,
+                _RECORD_SHA,
+                [_redis_key(key, identifier)],
+                [uuid.uuid4().hex, window]
+            )
+            return int(count)
         except redis.RedisError:
             # If Redis unavailable, we can't track - allow but log
             return 0
     
-    def reset_counter(self, key: str, identifier: str) -> None:
+    async def reset_counter(self, key: str, identifier: str) -> None:
         """Reset rate limit counter (e.g., after successful login)"""
-        redis_key = f"ratelimit:{key}:{identifier}"
         try:
-            self.redis.delete(redis_key)
+            await self.redis.delete(_redis_key(key, identifier))
         except redis.RedisError:
             pass  # Best effort
     
-    def get_remaining_count(
+    async def get_remaining_count(
         self,
         key: str,
         identifier: str,
         limit: int
     ) -> int:
         """Get remaining requests before rate limit"""
-        redis_key = f"ratelimit:{key}:{identifier}"
-        
         try:
-            current = self.redis.get(redis_key)
-            if current is None:
-                return limit
+            current = await self.redis.zcard(_redis_key(key, identifier))
             return max(0, limit - int(current))
         except redis.RedisError:
             return 0  # Assume exhausted if Redis unavailable
 
 
+# Shared limiter (connection pool is module-level, see get_async_redis_client)
+rate_limiter = RateLimiter()
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -223,7 +334,35 @@ def get_client_ip(request: Request) -> str:
     return request.client.host if request.client else "unknown"
 
 
-def check_otp_request_rate_limit(email: str, ip: str) -> None:
+def _raise_rate_limited(rule: str, wait: Optional[int]) -> None:
+    """Raise 429 for a RATE_LIMITS rule"""
+    raise APIException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        error_code=ErrorCodes.RATE_LIMIT_EXCEEDED,
+        message=RATE_LIMITS[rule]["error_message"].format(remaining=wait)
+    )
+
+
+async def _check_rules(rules: List[Tuple[str, str]]) -> None:
+    """
+    Check several RATE_LIMITS rules in one call.
+    
+    Args:
+        rules: List of (rule_name, identifier), in priority order
+    
+    Raises: APIException (429) for the first rule that is exceeded
+    """
+    results = await rate_limiter.check_rate_limits([
+        (rule, RATE_LIMITS[rule]["limit"], RATE_LIMITS[rule]["window"], identifier)
+        for rule, identifier in rules
+    ])
+    
+    for (rule, _), (allowed, wait) in zip(rules, results):
+        if not allowed:
+            _raise_rate_limited(rule, wait)
+
+
+async def check_otp_request_rate_limit(email: str, ip: str) -> None:
     """
     Check rate limits for OTP request.
     
@@ -237,42 +376,13 @@ def check_otp_request_rate_limit(email: str, ip: str) -> None:
     if os.getenv("ENVIRONMENT") == "development":
         return
     
-    limiter = RateLimiter()
-    
-    # Check email rate limit
-    email_allowed, email_wait = limiter.check_rate_limit(
-        key="otp_request_email",
-        limit=RATE_LIMITS["otp_request_email"]["limit"],
-        window=RATE_LIMITS["otp_request_email"]["window"],
-        identifier=email
-    )
-    
-    if not email_allowed:
-        raise APIException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            error_code=ErrorCodes.RATE_LIMIT_EXCEEDED,
-            message=RATE_LIMITS["otp_request_email"]["error_message"].format(
-                remaining=email_wait
-            )
-        )
-    
-    # Check IP rate limit
-    ip_allowed, ip_wait = limiter.check_rate_limit(
-        key="otp_global_ip",
-        limit=RATE_LIMITS["otp_global_ip"]["limit"],
-        window=RATE_LIMITS["otp_global_ip"]["window"],
-        identifier=ip
-    )
-    
-    if not ip_allowed:
-        raise APIException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            error_code=ErrorCodes.RATE_LIMIT_EXCEEDED,
-            message=RATE_LIMITS["otp_global_ip"]["error_message"]
-        )
+    await _check_rules([
+        ("otp_request_email", email),
+        ("otp_global_ip", ip),
+    ])
 
 
-def check_login_rate_limit(email: str, ip: str) -> None:
+async def check_login_rate_limit(email: str, ip: str) -> None:
     """
     Check rate limits for login attempts.
     
@@ -286,76 +396,44 @@ def check_login_rate_limit(email: str, ip: str) -> None:
     if os.getenv("ENVIRONMENT") == "development":
         return
     
-    limiter = RateLimiter()
-    
-    # Check email rate limit
-    email_allowed, email_wait = limiter.check_rate_limit(
-        key="login_email",
-        limit=RATE_LIMITS["login_email"]["limit"],
-        window=RATE_LIMITS["login_email"]["window"],
-        identifier=email
-    )
-    
-    if not email_allowed:
-        # Account lockout
-        raise APIException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            error_code=ErrorCodes.RATE_LIMIT_EXCEEDED,
-            message=RATE_LIMITS["login_email"]["error_message"]
-        )
-    
-    # Check IP rate limit
-    ip_allowed, ip_wait = limiter.check_rate_limit(
-        key="login_global_ip",
-        limit=RATE_LIMITS["login_global_ip"]["limit"],
-        window=RATE_LIMITS["login_global_ip"]["window"],
-        identifier=ip
-    )
-    
-    if not ip_allowed:
-        raise APIException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            error_code=ErrorCodes.RATE_LIMIT_EXCEEDED,
-            message=RATE_LIMITS["login_global_ip"]["error_message"]
-        )
+    await _check_rules([
+        ("login_email", email),
+        ("login_global_ip", ip),
+    ])
 
 
-def record_failed_login(email: str) -> int:
+async def record_failed_login(email: str) -> int:
     """
     Record failed login attempt.
     
     Returns: Number of failed attempts
     """
-    limiter = RateLimiter()
-    count = limiter.increment_counter(
+    return await rate_limiter.increment_counter(
         key="login_email",
         identifier=email,
         window=RATE_LIMITS["login_email"]["window"]
     )
-    return count
 
 
-def reset_login_attempts(email: str) -> None:
+async def reset_login_attempts(email: str) -> None:
     """Reset failed login counter after successful login"""
-    limiter = RateLimiter()
-    limiter.reset_counter("login_email", email)
+    await rate_limiter.reset_counter("login_email", email)
 
 
-def check_account_locked(user_id: str) -> bool:
+async def check_account_locked(user_id: str) -> bool:
     """
     Check if account is temporarily locked.
     
     Returns: True if locked
     """
     try:
-        client = get_redis_client()
-        return client.exists(f"account_locked:{user_id}") > 0
+        return await get_async_redis_client().exists(f"account_locked:{user_id}") > 0
     except redis.RedisError:
         # If Redis unavailable, assume not locked (fail-open for this check)
         return False
 
 
-def lock_account(user_id: str, duration: int = 1800) -> None:
+async def lock_account(user_id: str, duration: int = 1800) -> None:
     """
     Temporarily lock account.
     
@@ -364,8 +442,7 @@ def lock_account(user_id: str, duration: int = 1800) -> None:
         duration: Lock duration in seconds (default 30 min)
     """
     try:
-        client = get_redis_client()
-        client.setex(f"account_locked:{user_id}", duration, "1")
+        await get_async_redis_client().setex(f"account_locked:{user_id}", duration, "1")
     except redis.RedisError:
         pass  # Best effort
 
@@ -386,10 +463,8 @@ async def rate_limit_middleware(request: Request, call_next):
     ip = get_client_ip(request)
     
     # Global rate limit: 1000 requests per minute per IP
-    limiter = RateLimiter()
-    
     try:
-        allowed, wait = limiter.check_rate_limit(
+        allowed, wait = await rate_limiter.check_rate_limit(
             key="global_ip",
             limit=1000,
             window=60,
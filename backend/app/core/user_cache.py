@@ -0,0 +1,142 @@
+"""
+User Context Cache for Tax-Ease API v2
+
+Two-tier cache of the user fields resolved on every authenticated request
+(email_verified, is_active, role), keyed by user id:
+- L1: in-process TTL LRU (per worker, short TTL)
+- L2: Redis hash "user_ctx:<user_id>" (shared across workers)
+
+Writes that change any cached field (register, OTP verification, admin
+changes) MUST call invalidate() so the next request re-reads the database.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+
+USER_CTX_PREFIX = "user_ctx:"
+
+USER_CTX_L1_TTL = int(os.getenv("USER_CTX_L1_TTL", 15))  # seconds
+USER_CTX_L1_MAX_SIZE = int(os.getenv("USER_CTX_L1_MAX_SIZE", 10000))
+USER_CTX_L2_TTL = int(os.getenv("USER_CTX_L2_TTL", 300))  # seconds
+
+
+def user_ctx_key(user_id: str) -> str:
+    """Redis key holding the cached context for a user"""
+    return f"{USER_CTX_PREFIX}{user_id}"
+
+
+def encode_context(context: Dict[str, Any]) -> Dict[str, str]:
+    """Encode a context dict as Redis hash fields (strings only)"""
+    encoded = {
+        "email_verified": "1" if context.get("email_verified") else "0",
+        "is_active": "1" if context.get("is_active", True) else "0",
+    }
+    if context.get("role"):
+        encoded["role"] = context["role"]
+    return encoded
+
+
+def decode_context(fields: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """Decode Redis hash fields back into a context dict (None if empty)"""
+    if not fields:
+        return None
+    return {
+        "email_verified": fields.get("email_verified") == "1",
+        "is_active": fields.get("is_active", "1") == "1",
+        "role": fields.get("role"),
+    }
+
+
+class UserContextCache:
+    """
+    Two-tier user context cache.
+
+    L1 only holds verified users: an unverified context is always re-read
+    from Redis, so an OTP verification on one worker is visible on every
+    worker on the very next request.
+    """
+
+    def __init__(self, redis_client=None):
+        self.redis = redis_client
+        self._local: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # L1 (in-process)
+    # ------------------------------------------------------------------
+
+    def get_local(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Return the L1 entry if present and not expired"""
+        with self._lock:
+            entry = self._local.get(user_id)
+            if entry is None:
+                return None
+
+            expires_at, context = entry
+            if expires_at < time.monotonic():
+                del self._local[user_id]
+                return None
+
+            self._local.move_to_end(user_id)
+            return context
+
+    def set_local(self, user_id: str, context: Dict[str, Any]) -> None:
+        """Store a context in L1 (verified users only), evicting LRU entries"""
+        if not context.get("email_verified"):
+            return
+
+        with self._lock:
+            self._local[user_id] = (time.monotonic() + USER_CTX_L1_TTL, context)
+            self._local.move_to_end(user_id)
+            while len(self._local) > USER_CTX_L1_MAX_SIZE:
+                self._local.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # L2 (Redis)
+    # ------------------------------------------------------------------
+
+    def set_shared(self, user_id: str, context: Dict[str, Any]) -> None:
+        """Store a context in the Redis hash (best effort)"""
+        if not self.redis:
+            return
+
+        key = user_ctx_key(user_id)
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.hset(key, mapping=encode_context(context))
+            pipe.expire(key, USER_CTX_L2_TTL)
+            pipe.execute()
+        except Exception:
+            pass
+
+    def store(self, user_id: str, context: Dict[str, Any]) -> None:
+        """Populate both tiers after a database read"""
+        self.set_local(user_id, context)
+        self.set_shared(user_id, context)
+
+    # ------------------------------------------------------------------
+    # INVALIDATION
+    # ------------------------------------------------------------------
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's context from both tiers"""
+        user_id = str(user_id)
+        with self._lock:
+            self._local.pop(user_id, None)
+
+        if not self.redis:
+            return
+
+        try:
+            self.redis.delete(user_ctx_key(user_id))
+        except Exception:
+            pass
+
+    def clear_local(self) -> None:
+        """Drop every L1 entry (tests, admin tooling)"""
+        with self._lock:
+            self._local.clear()
@@ -16,6 +16,8 @@ initialize_validation_engine()
 # ============================================================================
 # FASTAPI IMPORTS
 # ============================================================================
+import os
+
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -92,6 +94,42 @@ app.include_router(t1_admin_v2.router)  # Already has /api/v1/admin prefix
 app.include_router(admin_auth.router, prefix="/api/v1")  # Admin authentication
 
 
+@app.on_event("startup")
+async def start_document_processing():
+    """Process direct-to-S3 uploads in the background (S3 storage only)."""
+    if os.getenv("USE_S3_STORAGE", "false").lower() == "true":
+        from backend.app.services.document_processing import document_processing_worker
+        document_processing_worker.start()
+
+
+@app.on_event("shutdown")
+async def stop_document_processing():
+    """Let in-flight document processing finish before pools close."""
+    from backend.app.services.document_processing import document_processing_worker
+    await document_processing_worker.stop()
+
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    """Close pooled asyncpg connections on worker shutdown."""
+    from backend.app.database import async_engine
+    await async_engine.dispose()
+
+
+@app.on_event("shutdown")
+async def shutdown_crypto_executor():
+    """Stop the crypto thread/process pools on worker shutdown."""
+    from backend.app.core.crypto_executor import crypto_executor
+    crypto_executor.shutdown()
+
+
+@app.on_event("shutdown")
+async def shutdown_storage_io():
+    """Stop the S3 storage I/O thread pool on worker shutdown."""
+    from backend.app.utils.s3_storage import shutdown_storage_service
+    shutdown_storage_service()
+
+
 @app.get("/")
 async def root():
     return {"status": "ok"}
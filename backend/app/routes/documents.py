@@ -14,7 +14,7 @@ from sqlalchemy.orm import Session
 
 from database import Client, Document
 from backend.app.database import get_db
-from backend.app.utils.encryption import encrypt_file_content, decrypt_file_content
+from backend.app.utils.encryption import encrypt_file_content_async, decrypt_file_content_async
 from backend.app.utils.s3_storage import get_storage_service
 
 # Load .env from project root
@@ -90,7 +90,7 @@ async def upload_document(
     
     # Encrypt file content
     try:
-        encrypted_content = encrypt_file_content(content)
+        encrypted_content = await encrypt_file_content_async(content)
         encryption_key_hash = hashlib.sha256(
             os.getenv("FILE_ENCRYPTION_KEY", "").encode()
         ).hexdigest()[:32]  # Store hash for audit, not the key itself
@@ -105,7 +105,7 @@ async def upload_document(
     # Upload to S3 or local storage
     try:
         storage_service = get_storage_service()
-        storage_path = storage_service.upload_file(
+        storage_path = await storage_service.upload_file_async(
             file_content=encrypted_content,
             file_key=file_key,
             content_type=file.content_type,
@@ -169,7 +169,7 @@ async def download_document(
     # Download from S3 or local storage
     try:
         storage_service = get_storage_service()
-        encrypted_content = storage_service.download_file(document.file_path)
+        encrypted_content = await storage_service.download_file_async(document.file_path)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
     except Exception as e:
@@ -178,7 +178,7 @@ async def download_document(
     # Decrypt file content
     try:
         if document.encrypted:
-            decrypted_content = decrypt_file_content(encrypted_content)
+            decrypted_content = await decrypt_file_content_async(encrypted_content)
         else:
             decrypted_content = encrypted_content  # Legacy unencrypted file
     except Exception as e:
@@ -14,20 +14,22 @@ Endpoints:
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
-from typing import Dict, Any, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, func, select
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from pydantic import BaseModel, Field
+import base64
 import uuid
 
 from backend.app.core.auth import CurrentUser, get_current_user
 from backend.app.services.t1_validation_engine import get_validation_engine
+from backend.app.services.t1_aggregate_loader import T1Aggregate, load_t1_aggregate, resolve_actors
 from database.schemas_v2 import (
-    T1Form, T1Answer, T1SectionProgress, Filing, User, Admin,
-    AuditLog, EmailThread, EmailMessage, Document
+    T1Form, T1Answer, T1SectionProgress, Filing, User,
+    AuditLog, EmailThread, EmailMessage
 )
-from backend.app.database import get_db
+from backend.app.database import get_async_db
 
 
 router = APIRouter(prefix="/api/v1/admin", tags=["T1 Forms (Admin)"])
@@ -113,6 +115,7 @@ class T1DashboardResponse(BaseModel):
     draft_count: int
     submitted_count: int
     filings: List[T1DashboardItem]
+    next_cursor: Optional[str] = None
 
 
 class T1DetailedSection(BaseModel):
@@ -157,9 +160,9 @@ def _check_admin_access(current_user: CurrentUser):
         )
 
 
-def _get_t1_form_admin(t1_form_id: uuid.UUID, db: Session) -> T1Form:
+async def _get_t1_form_admin(t1_form_id: uuid.UUID, db: AsyncSession) -> T1Form:
     """Get T1 form for admin (no ownership check)"""
-    t1_form = db.query(T1Form).filter(T1Form.id == t1_form_id).first()
+    t1_form = await db.scalar(select(T1Form).where(T1Form.id == t1_form_id))
     if not t1_form:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -168,6 +171,17 @@ def _get_t1_form_admin(t1_form_id: uuid.UUID, db: Session) -> T1Form:
     return t1_form
 
 
+async def _load_t1_aggregate_admin(t1_form_id: uuid.UUID, db: AsyncSession, **collections) -> T1Aggregate:
+    """Load T1 form aggregate for admin (no ownership check)"""
+    aggregate = await load_t1_aggregate(db, t1_form_id, **collections)
+    if not aggregate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"T1 form {t1_form_id} not found"
+        )
+    return aggregate
+
+
 def _deserialize_answer_value(answer: T1Answer) -> Any:
     """Extract actual value from T1Answer"""
     if answer.value_boolean is not None:
@@ -183,6 +197,24 @@ def _deserialize_answer_value(answer: T1Answer) -> Any:
     return None
 
 
+def _encode_dashboard_cursor(created_at: datetime, t1_form_id: uuid.UUID) -> str:
+    """Opaque keyset cursor for the last row of a dashboard page"""
+    raw = f"{created_at.isoformat()}|{t1_form_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_dashboard_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a dashboard cursor into (created_at, id)"""
+    try:
+        created_at, t1_form_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(t1_form_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
@@ -191,7 +223,7 @@ def _deserialize_answer_value(answer: T1Answer) -> Any:
 async def view_full_t1(
     t1_form_id: str,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     View full T1 form with all answers and structured sections.
@@ -201,18 +233,12 @@ async def view_full_t1(
     _check_admin_access(current_user)
     
     t1_uuid = uuid.UUID(t1_form_id)
-    t1_form = _get_t1_form_admin(t1_uuid, db)
     
-    # Get filing and user info
-    filing = db.query(Filing).filter(Filing.id == t1_form.filing_id).first()
-    user = db.query(User).filter(User.id == filing.user_id).first()
-    
-    # Get all answers
-    answers_db = db.query(T1Answer).filter(T1Answer.t1_form_id == t1_uuid).all()
-    answers_dict = {ans.field_key: _deserialize_answer_value(ans) for ans in answers_db}
-    
-    # Get sections progress
-    sections = db.query(T1SectionProgress).filter(T1SectionProgress.t1_form_id == t1_uuid).all()
+    # Form, filing, user, answers and sections progress (3 queries)
+    aggregate = await _load_t1_aggregate_admin(t1_uuid, db)
+    t1_form, filing, user = aggregate.t1_form, aggregate.filing, aggregate.user
+    answers_dict = {ans.field_key: _deserialize_answer_value(ans) for ans in aggregate.answers}
+    sections = aggregate.sections
     
     return {
         "id": str(t1_form.id),
@@ -244,7 +270,7 @@ async def unlock_t1_form(
     t1_form_id: str,
     request: UnlockT1Request,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Unlock submitted T1 form for corrections.
@@ -256,7 +282,7 @@ async def unlock_t1_form(
     _check_admin_access(current_user)
     
     t1_uuid = uuid.UUID(t1_form_id)
-    t1_form = _get_t1_form_admin(t1_uuid, db)
+    t1_form = await _get_t1_form_admin(t1_uuid, db)
     
     if not t1_form.is_locked:
         raise HTTPException(
@@ -284,7 +310,7 @@ async def unlock_t1_form(
     )
     db.add(audit_entry)
     
-    db.commit()
+    await db.commit()
     
     return UnlockT1Response(
         success=True,
@@ -298,7 +324,7 @@ async def request_additional_documents(
     t1_form_id: str,
     request: RequestDocumentsRequest,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Request additional documents from user.
@@ -309,15 +335,15 @@ async def request_additional_documents(
     _check_admin_access(current_user)
     
     t1_uuid = uuid.UUID(t1_form_id)
-    t1_form = _get_t1_form_admin(t1_uuid, db)
+    t1_form = await _get_t1_form_admin(t1_uuid, db)
     
     # Get filing and user
-    filing = db.query(Filing).filter(Filing.id == t1_form.filing_id).first()
-    user = db.query(User).filter(User.id == filing.user_id).first()
+    filing = await db.scalar(select(Filing).where(Filing.id == t1_form.filing_id))
+    user = await db.scalar(select(User).where(User.id == filing.user_id))
     
     # Create or get email thread
     thread_id = f"T1-{str(t1_form.id)[:8]}-docs-{datetime.utcnow().strftime('%Y%m%d')}"
-    thread = db.query(EmailThread).filter(EmailThread.thread_id == thread_id).first()
+    thread = await db.scalar(select(EmailThread).where(EmailThread.thread_id == thread_id))
     
     if not thread:
         thread = EmailThread(
@@ -356,7 +382,7 @@ async def request_additional_documents(
     )
     db.add(audit_entry)
     
-    db.commit()
+    await db.commit()
     
     # TODO: Send actual email via email service
     
@@ -376,7 +402,7 @@ async def mark_section_reviewed(
     section_id: str,
     request: MarkSectionReviewedRequest,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Mark a section as reviewed.
@@ -387,16 +413,18 @@ async def mark_section_reviewed(
     _check_admin_access(current_user)
     
     t1_uuid = uuid.UUID(t1_form_id)
-    t1_form = _get_t1_form_admin(t1_uuid, db)
+    t1_form = await _get_t1_form_admin(t1_uuid, db)
     
     # Get or create section progress
-    section_prog = db.query(T1SectionProgress).filter(
-        and_(
-            T1SectionProgress.t1_form_id == t1_uuid,
-            T1SectionProgress.step_id == step_id,
-            T1SectionProgress.section_id == section_id
+    section_prog = await db.scalar(
+        select(T1SectionProgress).where(
+            and_(
+                T1SectionProgress.t1_form_id == t1_uuid,
+                T1SectionProgress.step_id == step_id,
+                T1SectionProgress.section_id == section_id
+            )
         )
-    ).first()
+    )
     
     if not section_prog:
         section_prog = T1SectionProgress(
@@ -428,7 +456,7 @@ async def mark_section_reviewed(
     )
     db.add(audit_entry)
     
-    db.commit()
+    await db.commit()
     
     return MarkSectionReviewedResponse(
         success=True,
@@ -441,42 +469,47 @@ async def mark_section_reviewed(
 async def view_audit_trail(
     t1_form_id: str,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     View complete audit trail for T1 form.
     
     Shows all actions: submissions, unlocks, document requests, section reviews.
+    
+    Runs a constant number of queries: the form, the audit entries, and
+    one batched lookup each for user and admin actors.
     """
     _check_admin_access(current_user)
     
     t1_uuid = uuid.UUID(t1_form_id)
-    t1_form = _get_t1_form_admin(t1_uuid, db)
+    t1_form = await _get_t1_form_admin(t1_uuid, db)
     
     # Get all audit entries for this T1 form
-    audit_entries = db.query(AuditLog).filter(
-        or_(
-            and_(AuditLog.entity_type == 't1_forms', AuditLog.entity_id == str(t1_uuid)),
-            and_(AuditLog.entity_type == 't1_sections_progress', 
-                 AuditLog.details['t1_form_id'].astext == str(t1_uuid))
-        )
-    ).order_by(AuditLog.timestamp.desc()).all()
+    audit_entries = (await db.scalars(
+        select(AuditLog).where(
+            or_(
+                and_(AuditLog.entity_type == 't1_forms', AuditLog.entity_id == str(t1_uuid)),
+                and_(AuditLog.entity_type == 't1_sections_progress', 
+                     AuditLog.details['t1_form_id'].astext == str(t1_uuid))
+            )
+        ).order_by(AuditLog.timestamp.desc())
+    )).all()
+    
+    # An audit actor may be a user or an admin: resolve every id against both (users win)
+    actor_ids = [entry.user_id for entry in audit_entries]
+    actors = await resolve_actors(db, user_ids=actor_ids, admin_ids=actor_ids)
     
     # Format entries
     entries = []
     for entry in audit_entries:
-        # Get actor info
-        actor = db.query(User).filter(User.id == entry.user_id).first()
-        if not actor:
-            actor = db.query(Admin).filter(Admin.id == entry.user_id).first()
-        
+        actor = actors.get(str(entry.user_id))
         entries.append(AuditTrailEntry(
             id=str(entry.id),
             timestamp=entry.timestamp.isoformat(),
             action=entry.action,
             actor_id=str(entry.user_id),
-            actor_name=f"{actor.first_name} {actor.last_name}" if actor else "Unknown",
-            actor_role=actor.role if hasattr(actor, 'role') else "user",
+            actor_name=actor.name if actor else "Unknown",
+            actor_role=actor.role if actor else "user",
             details=entry.details or {}
         ))
     
@@ -490,8 +523,10 @@ async def view_audit_trail(
 @router.get("/dashboard/t1-filings", response_model=T1DashboardResponse)
 async def get_t1_dashboard(
     status_filter: Optional[str] = Query(None, description="Filter by status: draft, submitted"),
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Admin dashboard overview of all T1 filings.
@@ -499,47 +534,91 @@ async def get_t1_dashboard(
     Shows:
     - Total count
     - Status breakdown
-    - List of T1 forms with user info
+    - List of T1 forms with user info (keyset-paginated, newest first)
+    
+    Runs exactly two queries regardless of the number of forms: one
+    COUNT ... FILTER aggregate and one joined page query.
     """
     _check_admin_access(current_user)
     
-    # Build query
-    query = db.query(T1Form).join(Filing).join(User)
-    
+    # Forms joined to their filing and owner (inner joins, as listed)
+    joined = (
+        select(T1Form)
+        .join(Filing, Filing.id == T1Form.filing_id)
+        .join(User, User.id == Filing.user_id)
+    )
     if status_filter:
-        query = query.filter(T1Form.status == status_filter)
+        joined = joined.where(T1Form.status == status_filter)
+    
+    # Get counts (single aggregate)
+    counts = (await db.execute(
+        joined.with_only_columns(
+            func.count(T1Form.id),
+            func.count(T1Form.id).filter(T1Form.status == 'draft'),
+            func.count(T1Form.id).filter(T1Form.status == 'submitted')
+        )
+    )).one()
+    total_count, draft_count, submitted_count = counts
+    
+    # Get page (single joined query, keyset on created_at DESC, id DESC)
+    page_query = joined.with_only_columns(
+        T1Form.id,
+        T1Form.filing_id,
+        T1Form.status,
+        T1Form.is_locked,
+        T1Form.completion_percentage,
+        T1Form.submitted_at,
+        T1Form.created_at,
+        Filing.filing_year,
+        User.first_name,
+        User.last_name,
+        User.email
+    )
+    if cursor:
+        cursor_created_at, cursor_id = _decode_dashboard_cursor(cursor)
+        page_query = page_query.where(
+            or_(
+                T1Form.created_at < cursor_created_at,
+                and_(T1Form.created_at == cursor_created_at, T1Form.id < cursor_id)
+            )
+        )
     
-    t1_forms = query.order_by(T1Form.created_at.desc()).all()
+    rows = (await db.execute(
+        page_query
+        .order_by(T1Form.created_at.desc(), T1Form.id.desc())
+        .limit(limit + 1)
+    )).all()
     
-    # Get counts
-    total_count = len(t1_forms)
-    draft_count = len([f for f in t1_forms if f.status == 'draft'])
-    submitted_count = len([f for f in t1_forms if f.status == 'submitted'])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     
     # Format list
-    filings_list = []
-    for t1_form in t1_forms:
-        filing = db.query(Filing).filter(Filing.id == t1_form.filing_id).first()
-        user = db.query(User).filter(User.id == filing.user_id).first()
-        
-        filings_list.append(T1DashboardItem(
-            id=str(t1_form.id),
-            filing_id=str(t1_form.filing_id),
-            user_name=f"{user.first_name} {user.last_name}",
-            user_email=user.email,
-            filing_year=filing.filing_year,
-            status=t1_form.status,
-            is_locked=t1_form.is_locked,
-            completion_percentage=t1_form.completion_percentage,
-            submitted_at=t1_form.submitted_at.isoformat() if t1_form.submitted_at else None,
-            created_at=t1_form.created_at.isoformat()
-        ))
+    filings_list = [
+        T1DashboardItem(
+            id=str(row.id),
+            filing_id=str(row.filing_id),
+            user_name=f"{row.first_name} {row.last_name}",
+            user_email=row.email,
+            filing_year=row.filing_year,
+            status=row.status,
+            is_locked=row.is_locked,
+            completion_percentage=row.completion_percentage,
+            submitted_at=row.submitted_at.isoformat() if row.submitted_at else None,
+            created_at=row.created_at.isoformat()
+        )
+        for row in rows
+    ]
+    
+    next_cursor = None
+    if has_more:
+        next_cursor = _encode_dashboard_cursor(rows[-1].created_at, rows[-1].id)
     
     return T1DashboardResponse(
         total_count=total_count,
         draft_count=draft_count,
         submitted_count=submitted_count,
-        filings=filings_list
+        filings=filings_list,
+        next_cursor=next_cursor
     )
 
 
@@ -547,44 +626,38 @@ async def get_t1_dashboard(
 async def get_detailed_t1_view(
     t1_form_id: str,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get detailed T1 view with UI component hints for admin dashboard.
     
     Returns structured sections with review status and document checklist.
+    
+    Runs a constant number of queries: the form aggregate (form, filing,
+    user, answers, sections, documents) and one batched reviewer lookup.
     """
     _check_admin_access(current_user)
     
     t1_uuid = uuid.UUID(t1_form_id)
-    t1_form = _get_t1_form_admin(t1_uuid, db)
-    
-    # Get filing and user
-    filing = db.query(Filing).filter(Filing.id == t1_form.filing_id).first()
-    user = db.query(User).filter(User.id == filing.user_id).first()
-    
-    # Get all answers
-    answers_db = db.query(T1Answer).filter(T1Answer.t1_form_id == t1_uuid).all()
-    answers_dict = {ans.field_key: _deserialize_answer_value(ans) for ans in answers_db}
+    aggregate = await _load_t1_aggregate_admin(t1_uuid, db, documents=True)
+    t1_form, filing, user = aggregate.t1_form, aggregate.filing, aggregate.user
+    answers_dict = {ans.field_key: _deserialize_answer_value(ans) for ans in aggregate.answers}
     
     # Get validation engine
     validator = get_validation_engine()
     required_docs = validator.get_required_documents(answers_dict)
     
-    # Get uploaded documents
-    documents = db.query(Document).filter(Document.filing_id == t1_form.filing_id).all()
+    # Uploaded documents
+    documents = aggregate.documents
+    
+    # Resolve all section reviewers at once
+    reviewers = await resolve_actors(db, admin_ids=(sec.reviewed_by for sec in aggregate.sections))
     
     # Build sections (simplified - would iterate through T1Structure in production)
     sections = []
-    sections_progress = db.query(T1SectionProgress).filter(
-        T1SectionProgress.t1_form_id == t1_uuid
-    ).all()
-    
-    for sec_prog in sections_progress:
-        admin_reviewer = None
-        if sec_prog.reviewed_by:
-            admin = db.query(Admin).filter(Admin.id == sec_prog.reviewed_by).first()
-            admin_reviewer = f"{admin.first_name} {admin.last_name}" if admin else None
+    for sec_prog in aggregate.sections:
+        reviewer = reviewers.get(str(sec_prog.reviewed_by))
+        admin_reviewer = reviewer.name if reviewer else None
         
         sections.append(T1DetailedSection(
             step_id=sec_prog.step_id,
@@ -31,7 +31,7 @@ from backend.app.schemas.api_v2 import (
 from backend.app.core.auth import (
     create_access_token, create_refresh_token, blacklist_token,
     generate_otp, store_otp, verify_otp, get_current_user, CurrentUser,
-    JWT_ACCESS_EXPIRY, JWT_SECRET, redis_client
+    JWT_ACCESS_EXPIRY, JWT_SECRET, redis_client, invalidate_user_context
 )
 from backend.app.core.errors import (
     AuthenticationError, ValidationError, ResourceConflictError,
@@ -82,6 +82,7 @@ async def register(data: UserRegister, db: Session = Depends(get_db)):
     db.add(user)
     db.commit()
     db.refresh(user)
+    invalidate_user_context(user.id)
     
     # Generate tokens
     access_token = create_access_token(str(user.id), user.email, "user")
@@ -106,7 +107,7 @@ async def login(data: UserLogin, request: Request, db: Session = Depends(get_db)
     client_ip = get_client_ip(request)
     
     # RATE LIMITING - Enforces max 5 login attempts per 10 minutes
-    check_login_rate_limit(email=data.email, ip=client_ip)
+    await check_login_rate_limit(email=data.email, ip=client_ip)
     
     # Find user
     user = db.query(User).filter(User.email == data.email).first()
@@ -127,7 +128,7 @@ async def login(data: UserLogin, request: Request, db: Session = Depends(get_db)
     # Verify password
     if not verify_password(data.password, user.password_hash):
         # Record failed login attempt
-        count = record_failed_login(data.email)
+        count = await record_failed_login(data.email)
         
         # Log failed attempt
         log_authentication_failure(
@@ -165,7 +166,7 @@ async def login(data: UserLogin, request: Request, db: Session = Depends(get_db)
         )
     
     # SUCCESS - Reset failed login counter
-    reset_login_attempts(data.email)
+    await reset_login_attempts(data.email)
     
     # Generate tokens
     access_token = create_access_token(str(user.id), user.email, "user")
@@ -279,7 +280,7 @@ async def request_otp(data: OTPRequest, request: Request, db: Session = Depends(
     
     # RATE LIMITING - Enforces OTP-RL-001 and OTP-RL-003
     # Max 3 requests per 10 min per email, Max 10 requests per hour per IP
-    check_otp_request_rate_limit(email=data.email, ip=client_ip)
+    await check_otp_request_rate_limit(email=data.email, ip=client_ip)
     
     # Check if user exists (for password reset)
     if data.purpose == "password_reset":
@@ -330,6 +331,7 @@ async def verify_otp_endpoint(request: Request, data: OTPVerify, db: Session = D
         if user:
             user.email_verified = True
             db.commit()
+            invalidate_user_context(user.id)
     
     return SuccessResponse(message="OTP verified successfully")
 
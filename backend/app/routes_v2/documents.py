@@ -3,6 +3,8 @@ Document endpoints for API v2
 GET    /api/v1/documents
 GET    /api/v1/documents/{id}
 POST   /api/v1/documents/upload
+POST   /api/v1/documents/upload-url
+POST   /api/v1/documents/finalize
 GET    /api/v1/documents/{id}/download
 PATCH  /api/v1/documents/{id}
 DELETE /api/v1/documents/{id}
@@ -11,21 +13,23 @@ DELETE /api/v1/documents/{id}
 import sys
 from pathlib import Path
 from typing import Optional
-from fastapi import APIRouter, Depends, Query, UploadFile, File, status, Form
+from fastapi import APIRouter, Depends, Query, UploadFile, File, status, Form, Header
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-import io
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from backend.app.database import get_db
+from backend.app.database import get_async_db
 from backend.app.schemas.api_v2 import (
-    DocumentResponse, DocumentUploadResponse, DocumentUpdate, SuccessResponse
+    DocumentResponse, DocumentUploadResponse, DocumentUpdate, SuccessResponse,
+    DocumentUploadUrlRequest, DocumentUploadUrlResponse, DocumentFinalizeRequest
 )
 from backend.app.core.auth import get_current_user, CurrentUser
 from backend.app.services.document_service import DocumentService
+from backend.app.services.document_processing import document_processing_worker
 from backend.app.core.errors import AuthorizationError, ValidationError, ErrorCodes
 from backend.app.core.guards import require_email_verified, verify_document_access
 from database.schemas_v2 import Filing
@@ -38,20 +42,20 @@ async def list_documents(
     filing_id: Optional[str] = None,
     status: Optional[str] = None,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List documents (user: own documents, admin: assigned filing documents)"""
     
     service = DocumentService(db)
     
     if current_user.is_admin:
-        documents = service.get_admin_documents(
+        documents = await service.get_admin_documents(
             admin_id=current_user.id,
             is_superadmin=current_user.is_superadmin,
             filing_id=filing_id
         )
     else:
-        documents = service.get_user_documents(
+        documents = await service.get_user_documents(
             user_id=current_user.id,
             filing_id=filing_id,
             status=status
@@ -83,12 +87,12 @@ async def list_documents(
 async def get_document(
     document_id: str,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get document metadata"""
     
     service = DocumentService(db)
-    document = service.get_document_by_id(document_id)
+    document = await service.get_document_by_id(document_id)
     
     # Authorization check
     if not current_user.is_admin:
@@ -119,22 +123,19 @@ async def upload_document(
     filing_id: str = Form(...),
     category: str = Form("other"),
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Upload document with encryption"""
+    """Upload document with encryption (streamed from the spooled upload)"""
     
-    # Read file content
-    content = await file.read()
-    file_size = len(content)
-    file_type = file.filename.split('.')[-1].lower() if file.filename and '.' in file.filename else 'unknown'
+    file_type = DocumentService.file_type_from_name(file.filename)
     
     service = DocumentService(db)
-    document = service.upload_document(
+    document = await service.upload_document(
         filing_id=filing_id,
-        file_content=content,
+        file_obj=file.file,
         original_filename=file.filename or "unknown",
         file_type=file_type,
-        file_size=file_size,
+        file_size=file.size,
         document_type=category
     )
     
@@ -153,36 +154,108 @@ async def upload_document(
     }
 
 
+@router.post("/upload-url", response_model=DocumentUploadUrlResponse)
+async def create_document_upload_url(
+    data: DocumentUploadUrlRequest,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a presigned POST to upload a document straight to storage.
+    
+    POST the file to `url` with `fields` as multipart/form-data, then call
+    /documents/finalize with the returned upload_id.
+    """
+    
+    service = DocumentService(db)
+    return await service.create_upload_url(
+        user_id=current_user.id,
+        filing_id=data.filing_id,
+        filename=data.filename,
+        content_type=data.content_type,
+        file_size=data.file_size
+    )
+
+
+@router.post("/finalize", response_model=DocumentUploadResponse, status_code=status.HTTP_202_ACCEPTED)
+async def finalize_document_upload(
+    data: DocumentFinalizeRequest,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Record a direct upload; it is validated and encrypted in the background ("processing")"""
+    
+    service = DocumentService(db)
+    document = await service.finalize_upload(
+        user_id=current_user.id,
+        upload_id=data.upload_id,
+        filing_id=data.filing_id,
+        filename=data.filename,
+        document_type=data.category,
+        section_name=data.section_name
+    )
+    document_processing_worker.wake()
+    
+    return {
+        "id": str(document.id),
+        "filing_id": str(document.filing_id),
+        "name": document.name,
+        "original_filename": document.original_filename,
+        "file_type": document.file_type,
+        "file_size": document.file_size,
+        "section_name": document.section_name,
+        "document_type": document.document_type,
+        "status": document.status,
+        "uploaded_at": document.uploaded_at,
+        "created_at": document.created_at
+    }
+
+
 @router.get("/{document_id}/download")
 async def download_document(
     document_id: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Download document (decrypted)"""
+    """Download document (decrypted), honouring a single HTTP Range"""
     
     service = DocumentService(db)
-    document = service.get_document_by_id(document_id)
+    document = await service.get_document_by_id(document_id)
     
     # Authorization check: verify user owns the filing
     if not current_user.is_admin:
-        filing = db.query(Filing).filter(Filing.id == document.filing_id).first()
+        filing = await db.scalar(select(Filing).where(Filing.id == document.filing_id))
         if not filing or str(filing.user_id) != current_user.id:
             raise AuthorizationError(
                 error_code=ErrorCodes.AUTHZ_NOT_RESOURCE_OWNER,
                 message="You do not own this document"
             )
     
-    # Download and decrypt
-    file_bytes, filename, file_type = service.download_document(document_id)
+    # Open a decrypting stream (only the requested chunks are read)
+    chunks, filename, file_type, total_size, content_range = await service.download_document(
+        document_id,
+        byte_range=range_header
+    )
+    
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "Accept-Ranges": "bytes"
+    }
+    if content_range:
+        start, end = content_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{total_size}"
+        headers["Content-Length"] = str(end - start + 1)
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+    else:
+        headers["Content-Length"] = str(total_size)
+        status_code = status.HTTP_200_OK
     
-    # Return as streaming response
     return StreamingResponse(
-        io.BytesIO(file_bytes),
+        chunks,
+        status_code=status_code,
         media_type=f"application/{file_type}",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}"
-        }
+        headers=headers
     )
 
 
@@ -191,12 +264,12 @@ async def update_document_metadata(
     document_id: str,
     data: DocumentUpdate,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update document metadata (user) or status (admin)"""
     
     service = DocumentService(db)
-    document = service.get_document_by_id(document_id)
+    document = await service.get_document_by_id(document_id)
     
     # Authorization check
     if not current_user.is_admin:
@@ -209,13 +282,13 @@ async def update_document_metadata(
     # Users can update filename/notes, admins can update status
     if current_user.is_admin:
         if data.status:
-            document = service.update_document_status(
+            document = await service.update_document_status(
                 document_id, 
                 data.status, 
                 data.admin_notes
             )
     else:
-        document = service.update_document(document_id, data.filename, None)
+        document = await service.update_document(document_id, data.filename, None)
     
     return {
         "id": str(document.id),
@@ -236,12 +309,12 @@ async def update_document_metadata(
 async def delete_document_endpoint(
     document_id: str,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete document (physical file + DB record)"""
     
     service = DocumentService(db)
-    document = service.get_document_by_id(document_id)
+    document = await service.get_document_by_id(document_id)
     
     # Authorization check - only user can delete their own documents
     if str(document.user_id) != current_user.id:
@@ -250,6 +323,6 @@ async def delete_document_endpoint(
             message="You do not own this document"
         )
     
-    service.delete_document(document_id)
+    await service.delete_document(document_id)
     
     return SuccessResponse(message="Document deleted successfully")
@@ -11,13 +11,13 @@ import uuid
 from pathlib import Path
 from typing import Optional
 from fastapi import APIRouter, Depends, Query, status, Request, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from backend.app.database import get_db
+from backend.app.database import get_async_db
 from backend.app.schemas.api_v2 import (
     FilingResponse, FilingCreate, PaginatedResponse
 )
@@ -52,14 +52,14 @@ async def list_filings(
     year: Optional[int] = Query(None, ge=2020, le=2030),
     status: Optional[str] = None,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List filings (user: own filings, admin: assigned filings)"""
     
     service = FilingService(db)
     
     if current_user.is_admin:
-        filings, total = service.get_admin_filings(
+        filings, total = await service.get_admin_filings(
             admin_id=current_user.id,
             is_superadmin=current_user.is_superadmin,
             page=page,
@@ -68,7 +68,7 @@ async def list_filings(
             status=status
         )
     else:
-        filings, total = service.get_user_filings(
+        filings, total = await service.get_user_filings(
             user_id=current_user.id,
             page=page,
             page_size=page_size,
@@ -76,17 +76,17 @@ async def list_filings(
             status=status
         )
     
-    # Enrich with calculated fields
+    # Enrich with calculated fields (paid amounts come back with the page)
     filing_responses = []
-    for filing in filings:
+    for filing, paid_amount in filings:
         filing_dict = {
             "id": str(filing.id),
             "user_id": str(filing.user_id),
             "filing_year": filing.filing_year,
             "status": filing.status,
             "total_fee": filing.total_fee,
-            "paid_amount": service.calculate_paid_amount(filing.id),
-            "payment_status": service.calculate_payment_status(filing),
+            "paid_amount": paid_amount,
+            "payment_status": service.payment_status_for(filing, paid_amount),
             "email_thread_id": filing.email_thread_id,
             "created_at": filing.created_at,
             "updated_at": filing.updated_at,
@@ -109,7 +109,7 @@ async def list_filings(
 async def get_filing(
     filing_id: str,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get filing details"""
     
@@ -117,7 +117,7 @@ async def get_filing(
     _validate_uuid(filing_id)
     
     service = FilingService(db)
-    filing = service.get_filing_by_id(filing_id)
+    filing = await service.get_filing_by_id(filing_id)
     
     # Authorization check
     if not current_user.is_admin:
@@ -130,20 +130,22 @@ async def get_filing(
     else:
         # Admin must be assigned (unless superadmin)
         if not current_user.is_superadmin:
-            if not service.is_admin_assigned(filing_id, current_user.id):
+            if not await service.is_admin_assigned(filing_id, current_user.id):
                 raise AuthorizationError(
                     error_code=ErrorCodes.AUTHZ_NOT_ASSIGNED,
                     message="You are not assigned to this filing"
                 )
     
+    paid_amount = await service.calculate_paid_amount(filing.id)
+    
     return {
         "id": str(filing.id),
         "user_id": str(filing.user_id),
         "filing_year": filing.filing_year,
         "status": filing.status,
         "total_fee": filing.total_fee,
-        "paid_amount": service.calculate_paid_amount(filing.id),
-        "payment_status": service.calculate_payment_status(filing),
+        "paid_amount": paid_amount,
+        "payment_status": service.payment_status_for(filing, paid_amount),
         "email_thread_id": filing.email_thread_id,
         "created_at": filing.created_at,
         "updated_at": filing.updated_at,
@@ -155,7 +157,7 @@ async def get_filing(
 async def create_filing(
     data: FilingCreate,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create new filing.
@@ -172,7 +174,7 @@ async def create_filing(
         )
     
     service = FilingService(db)
-    filing = service.create_filing(current_user.id, data.filing_year)
+    filing = await service.create_filing(current_user.id, data.filing_year)
     
     return {
         "id": str(filing.id),
@@ -193,7 +195,7 @@ async def create_filing(
 async def get_filing_timeline(
     filing_id: str,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get filing timeline events"""
     
@@ -201,7 +203,7 @@ async def get_filing_timeline(
     _validate_uuid(filing_id)
     
     service = FilingService(db)
-    filing = service.get_filing_by_id(filing_id)
+    filing = await service.get_filing_by_id(filing_id)
     
     # Authorization check (same as get_filing)
     if not current_user.is_admin:
@@ -212,13 +214,13 @@ async def get_filing_timeline(
             )
     else:
         if not current_user.is_superadmin:
-            if not service.is_admin_assigned(filing_id, current_user.id):
+            if not await service.is_admin_assigned(filing_id, current_user.id):
                 raise AuthorizationError(
                     error_code=ErrorCodes.AUTHZ_NOT_ASSIGNED,
                     message="You are not assigned to this filing"
                 )
     
-    timeline = service.get_filing_timeline(filing_id)
+    timeline = await service.get_filing_timeline(filing_id)
     
     return {
         "data": [
@@ -1,6 +1,7 @@
 """
 Health check endpoint
 GET /api/v1/health
+GET /api/v1/health/crypto
 """
 
 import sys
@@ -16,6 +17,7 @@ sys.path.insert(0, str(project_root))
 
 from backend.app.database import get_db
 from backend.app.schemas.api_v2 import HealthResponse
+from backend.app.core.crypto_executor import crypto_executor
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
@@ -37,3 +39,9 @@ async def health_check(db: Session = Depends(get_db)):
         "version": "2.0.0",
         "timestamp": datetime.utcnow()
     }
+
+
+@router.get("/crypto")
+async def crypto_executor_metrics():
+    """Crypto executor queue depth and latency per pool"""
+    return crypto_executor.health()
@@ -11,9 +11,10 @@ Endpoints:
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import Dict, Any, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, null, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Dict, Any, List, Optional, Set
 from datetime import datetime
 from pydantic import BaseModel, Field
 import uuid
@@ -22,7 +23,7 @@ from backend.app.core.auth import CurrentUser, get_current_user
 from backend.app.core.guards import require_email_verified
 from backend.app.services.t1_validation_engine import get_validation_engine
 from database.schemas_v2 import T1Form, T1Answer, T1SectionProgress, Filing
-from backend.app.database import get_db
+from backend.app.database import get_async_db
 
 
 router = APIRouter(prefix="/api/v1/t1-forms", tags=["T1 Forms (User)"])
@@ -107,12 +108,14 @@ def _validate_filing_uuid(filing_id: str) -> uuid.UUID:
         )
 
 
-def _get_t1_form_or_create(filing_id: uuid.UUID, user_id: uuid.UUID, db: Session, auto_create: bool = False) -> T1Form:
-    """Get T1 form for filing, optionally create if not exists"""
+async def _get_t1_form_or_create(filing_id: uuid.UUID, user_id: uuid.UUID, db: AsyncSession, auto_create: bool = False, for_update: bool = False) -> T1Form:
+    """Get T1 form for filing, optionally create if not exists (for_update: lock the row)"""
     # Check if filing exists and belongs to user
-    filing = db.query(Filing).filter(
-        and_(Filing.id == filing_id, Filing.user_id == user_id)
-    ).first()
+    filing = await db.scalar(
+        select(Filing).where(
+            and_(Filing.id == filing_id, Filing.user_id == user_id)
+        )
+    )
     
     if not filing:
         raise HTTPException(
@@ -121,7 +124,10 @@ def _get_t1_form_or_create(filing_id: uuid.UUID, user_id: uuid.UUID, db: Session
         )
     
     # Get T1 form
-    t1_form = db.query(T1Form).filter(T1Form.filing_id == filing_id).first()
+    t1_query = select(T1Form).where(T1Form.filing_id == filing_id)
+    if for_update:
+        t1_query = t1_query.with_for_update()
+    t1_form = await db.scalar(t1_query)
     
     # Only create if explicitly requested
     if not t1_form and auto_create:
@@ -134,8 +140,8 @@ def _get_t1_form_or_create(filing_id: uuid.UUID, user_id: uuid.UUID, db: Session
             completion_percentage=0
         )
         db.add(t1_form)
-        db.commit()
-        db.refresh(t1_form)
+        await db.commit()
+        await db.refresh(t1_form)
     elif not t1_form:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -154,36 +160,33 @@ def _serialize_value(value: Any) -> Any:
     return value
 
 
+ANSWER_VALUE_COLUMNS = ('value_boolean', 'value_text', 'value_numeric', 'value_date', 'value_array')
+
+
+def _value_from_columns(columns: Dict[str, Any]) -> Any:
+    """Extract the actual value from polymorphic value columns"""
+    if columns['value_boolean'] is not None:
+        return columns['value_boolean']
+    elif columns['value_text'] is not None:
+        return columns['value_text']
+    elif columns['value_numeric'] is not None:
+        return columns['value_numeric']
+    elif columns['value_date'] is not None:
+        return columns['value_date'].isoformat()
+    elif columns['value_array'] is not None:
+        return columns['value_array']
+    return None
+
+
 def _deserialize_answer_value(answer: T1Answer) -> Any:
     """Extract the actual value from polymorphic T1Answer"""
-    if answer.value_boolean is not None:
-        return answer.value_boolean
-    elif answer.value_text is not None:
-        return answer.value_text
-    elif answer.value_numeric is not None:
-        return answer.value_numeric
-    elif answer.value_date is not None:
-        return answer.value_date.isoformat()
-    elif answer.value_array is not None:
-        return answer.value_array
-    return None
+    return _value_from_columns({column: getattr(answer, column) for column in ANSWER_VALUE_COLUMNS})
 
 
-def _save_answer(t1_form_id: uuid.UUID, field_key: str, value: Any, db: Session):
-    """Save or update a single answer (upsert)"""
-    # Get existing answer
-    existing = db.query(T1Answer).filter(
-        and_(T1Answer.t1_form_id == t1_form_id, T1Answer.field_key == field_key)
-    ).first()
-    
+def _answer_columns(value: Any) -> Dict[str, Any]:
+    """Map a submitted value onto the polymorphic value columns"""
     # Determine which column to use based on value type
-    answer_data = {
-        'value_boolean': None,
-        'value_text': None,
-        'value_numeric': None,
-        'value_date': None,
-        'value_array': None
-    }
+    answer_data = dict.fromkeys(ANSWER_VALUE_COLUMNS)
     
     if isinstance(value, bool):
         answer_data['value_boolean'] = value
@@ -199,20 +202,59 @@ def _save_answer(t1_form_id: uuid.UUID, field_key: str, value: Any, db: Session)
         # Try to convert to string
         answer_data['value_text'] = str(value)
     
-    if existing:
-        # Update existing answer
-        for key, val in answer_data.items():
-            setattr(existing, key, val)
-        existing.updated_at = datetime.utcnow()
-    else:
-        # Create new answer
-        new_answer = T1Answer(
-            id=uuid.uuid4(),
-            t1_form_id=t1_form_id,
-            field_key=field_key,
-            **answer_data
-        )
-        db.add(new_answer)
+    return answer_data
+
+
+async def _load_answers(t1_form_id: uuid.UUID, db: AsyncSession, keys: Optional[Set[str]] = None) -> Dict[str, Any]:
+    """Load a form's answers (all, or only keys) as a {field_key: value} dict (one query)"""
+    query = select(T1Answer.field_key, *[getattr(T1Answer, column) for column in ANSWER_VALUE_COLUMNS])\
+        .where(T1Answer.t1_form_id == t1_form_id)
+    if keys is not None:
+        query = query.where(T1Answer.field_key.in_(keys))
+    
+    rows = await db.execute(query)
+    return {
+        row.field_key: _value_from_columns(row._mapping)
+        for row in rows
+    }
+
+
+async def _upsert_answers(t1_form_id: uuid.UUID, answers: Dict[str, Any], db: AsyncSession) -> Dict[str, Any]:
+    """
+    Save or update many answers in one INSERT ... ON CONFLICT statement.
+    
+    Relies on the unique (t1_form_id, field_key) index on t1_answers.
+    Returns {field_key: value} as it reads back from the stored columns.
+    """
+    if not answers:
+        return {}
+    
+    rows = []
+    stored = {}
+    for field_key, value in answers.items():
+        columns = _answer_columns(value)
+        stored[field_key] = _value_from_columns(columns)
+        if columns['value_array'] is None:
+            # SQL NULL, not the JSON 'null' a bare None becomes in JSONB
+            columns['value_array'] = null()
+        rows.append({
+            'id': uuid.uuid4(),
+            't1_form_id': t1_form_id,
+            'field_key': field_key,
+            **columns
+        })
+    
+    stmt = pg_insert(T1Answer).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[T1Answer.t1_form_id, T1Answer.field_key],
+        set_={
+            **{column: stmt.excluded[column] for column in ANSWER_VALUE_COLUMNS},
+            'updated_at': func.now()
+        }
+    )
+    await db.execute(stmt)
+    
+    return stored
 
 
 # ============================================================================
@@ -224,7 +266,7 @@ async def save_draft_answers(
     filing_id: str,
     request: SaveDraftRequest,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Save draft T1 answers (partial validation, idempotent).
@@ -245,7 +287,9 @@ async def save_draft_answers(
     require_email_verified(current_user)
     
     filing_uuid = _validate_filing_uuid(filing_id)
-    t1_form = _get_t1_form_or_create(filing_uuid, current_user.user_id, db, auto_create=True)
+    # Row lock serialises concurrent autosaves of the same form (completion_state
+    # is read-modify-write)
+    t1_form = await _get_t1_form_or_create(filing_uuid, current_user.user_id, db, auto_create=True, for_update=True)
     
     # Check if form is locked
     if t1_form.is_locked:
@@ -264,19 +308,26 @@ async def save_draft_answers(
             detail={"message": "Validation failed", "errors": errors}
         )
     
-    # Save each answer
-    for field_key, value in request.answers.items():
-        _save_answer(t1_form.id, field_key, value, db)
+    # Save all submitted answers in one upsert
+    saved_answers = await _upsert_answers(t1_form.id, request.answers, db)
     
-    # Get all current answers for completion calculation
-    all_answers_db = db.query(T1Answer).filter(T1Answer.t1_form_id == t1_form.id).all()
-    all_answers_dict = {ans.field_key: _deserialize_answer_value(ans) for ans in all_answers_db}
+    # Update completion incrementally from the persisted bitsets; only the
+    # condition keys of affected required fields are read back. Without a
+    # usable state (new column, structure changed) recompute from all answers.
+    masks = validator.parse_completion_masks(t1_form.completion_state)
+    if masks is None:
+        masks = validator.compute_completion_masks(await _load_answers(t1_form.id, db))
+    else:
+        needed_keys = validator.completion_condition_keys(saved_answers)
+        answers_for_update = await _load_answers(t1_form.id, db, keys=needed_keys) if needed_keys else {}
+        answers_for_update.update(saved_answers)
+        masks = validator.update_completion_masks(masks, answers_for_update, saved_answers)
     
-    # Update completion percentage
-    t1_form.completion_percentage = validator.calculate_completion_percentage(all_answers_dict)
+    t1_form.completion_state = validator.serialize_completion_masks(masks)
+    t1_form.completion_percentage = validator.completion_percentage_from_masks(masks)
     t1_form.updated_at = datetime.utcnow()
     
-    db.commit()
+    await db.commit()
     
     return {
         "success": True,
@@ -290,7 +341,7 @@ async def save_draft_answers(
 async def get_t1_draft(
     filing_id: str,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Fetch current T1 draft with all saved answers.
@@ -308,9 +359,11 @@ async def get_t1_draft(
     filing_uuid = _validate_filing_uuid(filing_id)
     
     # Check if filing exists first
-    filing = db.query(Filing).filter(
-        and_(Filing.id == filing_uuid, Filing.user_id == current_user.user_id)
-    ).first()
+    filing = await db.scalar(
+        select(Filing).where(
+            and_(Filing.id == filing_uuid, Filing.user_id == current_user.user_id)
+        )
+    )
     
     if not filing:
         raise HTTPException(
@@ -319,7 +372,7 @@ async def get_t1_draft(
         )
     
     # Check if T1 form exists
-    t1_form = db.query(T1Form).filter(T1Form.filing_id == filing_uuid).first()
+    t1_form = await db.scalar(select(T1Form).where(T1Form.filing_id == filing_uuid))
     
     # If no T1 form yet, return virtual draft with empty answers
     if not t1_form:
@@ -337,7 +390,7 @@ async def get_t1_draft(
         )
     
     # Fetch all answers
-    answers_db = db.query(T1Answer).filter(T1Answer.t1_form_id == t1_form.id).all()
+    answers_db = (await db.scalars(select(T1Answer).where(T1Answer.t1_form_id == t1_form.id))).all()
     answers_dict = {ans.field_key: _deserialize_answer_value(ans) for ans in answers_db}
     
     return T1FormResponse(
@@ -358,7 +411,7 @@ async def get_t1_draft(
 async def submit_t1_form(
     filing_id: str,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Submit T1 form (one-way lock with complete validation).
@@ -373,9 +426,11 @@ async def submit_t1_form(
     filing_uuid = _validate_filing_uuid(filing_id)
     
     # Check if filing exists
-    filing = db.query(Filing).filter(
-        and_(Filing.id == filing_uuid, Filing.user_id == current_user.user_id)
-    ).first()
+    filing = await db.scalar(
+        select(Filing).where(
+            and_(Filing.id == filing_uuid, Filing.user_id == current_user.user_id)
+        )
+    )
     
     if not filing:
         raise HTTPException(
@@ -384,7 +439,7 @@ async def submit_t1_form(
         )
     
     # Get T1 form
-    t1_form = db.query(T1Form).filter(T1Form.filing_id == filing_uuid).first()
+    t1_form = await db.scalar(select(T1Form).where(T1Form.filing_id == filing_uuid))
     
     if not t1_form:
         raise HTTPException(
@@ -400,7 +455,7 @@ async def submit_t1_form(
         )
     
     # Get all answers
-    answers_db = db.query(T1Answer).filter(T1Answer.t1_form_id == t1_form.id).all()
+    answers_db = (await db.scalars(select(T1Answer).where(T1Answer.t1_form_id == t1_form.id))).all()
     answers_dict = {ans.field_key: _deserialize_answer_value(ans) for ans in answers_db}
     
     # Complete validation
@@ -425,7 +480,7 @@ async def submit_t1_form(
     t1_form.completion_percentage = 100
     
     # Commit changes (audit handled by middleware)
-    db.commit()
+    await db.commit()
     
     return SubmitT1Response(
         success=True,
@@ -439,7 +494,7 @@ async def submit_t1_form(
 async def get_required_documents(
     filing_id: str,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get list of required documents based on questionnaire answers.
@@ -454,9 +509,11 @@ async def get_required_documents(
     filing_uuid = _validate_filing_uuid(filing_id)
     
     # Check if filing exists
-    filing = db.query(Filing).filter(
-        and_(Filing.id == filing_uuid, Filing.user_id == current_user.user_id)
-    ).first()
+    filing = await db.scalar(
+        select(Filing).where(
+            and_(Filing.id == filing_uuid, Filing.user_id == current_user.user_id)
+        )
+    )
     
     if not filing:
         raise HTTPException(
@@ -465,11 +522,11 @@ async def get_required_documents(
         )
     
     # Get T1 form if exists
-    t1_form = db.query(T1Form).filter(T1Form.filing_id == filing_uuid).first()
+    t1_form = await db.scalar(select(T1Form).where(T1Form.filing_id == filing_uuid))
     
     # Get answers (empty dict if no T1 form yet)
     if t1_form:
-        answers_db = db.query(T1Answer).filter(T1Answer.t1_form_id == t1_form.id).all()
+        answers_db = (await db.scalars(select(T1Answer).where(T1Answer.t1_form_id == t1_form.id))).all()
         answers_dict = {ans.field_key: _deserialize_answer_value(ans) for ans in answers_db}
         t1_form_id = str(t1_form.id)
     else:
@@ -515,7 +572,7 @@ async def get_t1_structure():
 async def get_user_t1_forms(
     user_id: str,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all T1 forms (drafts and submitted) for a specific user.
@@ -538,14 +595,16 @@ async def get_user_t1_forms(
         )
     
     # Get all T1 forms for this user
-    t1_forms = db.query(T1Form).filter(
-        T1Form.user_id == current_user.user_id
-    ).order_by(T1Form.created_at.desc()).all()
+    t1_forms = (await db.scalars(
+        select(T1Form).where(
+            T1Form.user_id == current_user.user_id
+        ).order_by(T1Form.created_at.desc())
+    )).all()
     
     forms_list = []
     for form in t1_forms:
         # Get filing info
-        filing = db.query(Filing).filter(Filing.id == form.filing_id).first()
+        filing = await db.scalar(select(Filing).where(Filing.id == form.filing_id))
         
         forms_list.append({
             "id": str(form.id),
@@ -570,7 +629,7 @@ async def get_user_t1_forms(
 async def create_t1_form(
     filing_id: str,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new T1 form draft for a filing.
@@ -586,9 +645,11 @@ async def create_t1_form(
     filing_uuid = _validate_filing_uuid(filing_id)
     
     # Check if filing exists and belongs to user
-    filing = db.query(Filing).filter(
-        and_(Filing.id == filing_uuid, Filing.user_id == current_user.user_id)
-    ).first()
+    filing = await db.scalar(
+        select(Filing).where(
+            and_(Filing.id == filing_uuid, Filing.user_id == current_user.user_id)
+        )
+    )
     
     if not filing:
         raise HTTPException(
@@ -597,7 +658,7 @@ async def create_t1_form(
         )
     
     # Check if T1 form already exists
-    existing = db.query(T1Form).filter(T1Form.filing_id == filing_uuid).first()
+    existing = await db.scalar(select(T1Form).where(T1Form.filing_id == filing_uuid))
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -614,8 +675,8 @@ async def create_t1_form(
         completion_percentage=0
     )
     db.add(t1_form)
-    db.commit()
-    db.refresh(t1_form)
+    await db.commit()
+    await db.refresh(t1_form)
     
     return {
         "id": str(t1_form.id),
@@ -631,7 +692,7 @@ async def create_t1_form(
 async def delete_t1_form(
     t1_form_id: str,
     current_user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a T1 form draft (only if not submitted).
@@ -654,9 +715,11 @@ async def delete_t1_form(
         )
     
     # Get T1 form
-    t1_form = db.query(T1Form).filter(
-        and_(T1Form.id == form_uuid, T1Form.user_id == current_user.user_id)
-    ).first()
+    t1_form = await db.scalar(
+        select(T1Form).where(
+            and_(T1Form.id == form_uuid, T1Form.user_id == current_user.user_id)
+        )
+    )
     
     if not t1_form:
         raise HTTPException(
@@ -672,8 +735,8 @@ async def delete_t1_form(
         )
     
     # Delete the form (cascade will delete answers and progress)
-    db.delete(t1_form)
-    db.commit()
+    await db.delete(t1_form)
+    await db.commit()
     
     return {
         "success": True,
@@ -248,6 +248,29 @@ class DocumentUploadResponse(BaseModel):
         from_attributes = True
 
 
+class DocumentUploadUrlRequest(BaseModel):
+    filing_id: str
+    filename: str = Field(min_length=1, max_length=255)
+    content_type: Optional[str] = None
+    file_size: Optional[int] = Field(None, gt=0)
+
+
+class DocumentUploadUrlResponse(BaseModel):
+    upload_id: str
+    url: str
+    fields: Dict[str, str]
+    max_size: int
+    expires_in: int
+
+
+class DocumentFinalizeRequest(BaseModel):
+    upload_id: str
+    filing_id: str
+    filename: str = Field(min_length=1, max_length=255)
+    category: str = "other"
+    section_name: Optional[str] = None
+
+
 class DocumentResponse(DocumentUploadResponse):
     notes: Optional[str] = None
     updated_at: datetime
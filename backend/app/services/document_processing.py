@@ -0,0 +1,153 @@
+"""
+Background processing of direct-to-storage document uploads
+
+finalize_upload() records a staged upload as a Document with status
+"processing". DocumentProcessingWorker claims due rows one at a time with
+FOR UPDATE SKIP LOCKED, so several API workers can process concurrently,
+and hands each to DocumentService.process_staged_upload() for validation and
+encryption.
+
+A claim counts an attempt and moves next_attempt_at out by an exponential
+backoff before processing starts, so an upload that keeps failing (or whose
+worker crashed) is retried later instead of blocking newer uploads, and is
+rejected once DOCUMENT_PROCESSING_MAX_ATTEMPTS are used up. The backoff
+also leases the row: no other worker picks it up while it is processed,
+so the row only needs locking to record the outcome.
+"""
+
+import os
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import select, func
+
+from database.schemas_v2 import Document, DocumentStatus
+from backend.app.database import AsyncSessionLocal
+from backend.app.services.document_service import DocumentService
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_PROCESSING_CONCURRENCY = int(os.getenv("DOCUMENT_PROCESSING_CONCURRENCY", 2))
+DOCUMENT_PROCESSING_POLL_INTERVAL = float(os.getenv("DOCUMENT_PROCESSING_POLL_INTERVAL", 5.0))  # seconds
+DOCUMENT_PROCESSING_MAX_ATTEMPTS = int(os.getenv("DOCUMENT_PROCESSING_MAX_ATTEMPTS", 5))
+DOCUMENT_PROCESSING_RETRY_DELAY = 60  # seconds, doubled per attempt
+DOCUMENT_PROCESSING_MAX_RETRY_DELAY = 3600  # seconds
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff after the given number of attempts (also the processing lease)"""
+    return timedelta(seconds=min(DOCUMENT_PROCESSING_RETRY_DELAY * 2 ** (attempts - 1),
+                                 DOCUMENT_PROCESSING_MAX_RETRY_DELAY))
+
+
+async def _claim_next_upload(session) -> Optional[Document]:
+    """Lease the earliest due staged upload: count the attempt, schedule the retry"""
+    document = await session.scalar(
+        select(Document)
+        .where(
+            Document.status == DocumentStatus.PROCESSING.value,
+            Document.next_attempt_at <= func.now()
+        )
+        .order_by(Document.next_attempt_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    if document is None:
+        return None
+
+    document.processing_attempts += 1
+    document.next_attempt_at = datetime.now(timezone.utc) + retry_delay(document.processing_attempts)
+    await session.commit()
+    return document
+
+
+async def process_next_upload(session_factory=AsyncSessionLocal) -> bool:
+    """Process the earliest due staged upload; False if there was none"""
+    async with session_factory() as session:
+        document = await _claim_next_upload(session)
+        if document is None:
+            return False
+        document_id, attempts = document.id, document.processing_attempts
+        service = DocumentService(session)
+
+        if attempts > DOCUMENT_PROCESSING_MAX_ATTEMPTS:
+            # The final attempt died without recording an outcome (worker crash)
+            document = await service.lock_staged_upload(document_id)
+            if document is not None:
+                await service.reject_staged_upload(
+                    document, f"Processing failed after {DOCUMENT_PROCESSING_MAX_ATTEMPTS} attempts"
+                )
+            return True
+
+        # No lock or transaction is held while downloading and encrypting;
+        # the claim's lease keeps other workers off the row meanwhile
+        try:
+            await service.process_staged_upload(document)
+        except Exception as e:
+            await session.rollback()
+            if attempts < DOCUMENT_PROCESSING_MAX_ATTEMPTS:
+                raise
+            logger.error(f"Staged upload for document {document_id} failed its last attempt: {e}", exc_info=True)
+            document = await service.lock_staged_upload(document_id)
+            if document is not None:
+                await service.reject_staged_upload(document, f"Processing failed after {attempts} attempts: {e}")
+        return True
+
+
+class DocumentProcessingWorker:
+    """Background tasks draining "processing" documents"""
+
+    def __init__(self, session_factory=AsyncSessionLocal,
+                 concurrency: int = DOCUMENT_PROCESSING_CONCURRENCY,
+                 poll_interval: float = DOCUMENT_PROCESSING_POLL_INTERVAL):
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._stopping.clear()
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+        logger.info(f"Document processing worker started ({self.concurrency} tasks)")
+
+    async def stop(self) -> None:
+        if not self._tasks:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Document processing worker stopped")
+
+    def wake(self) -> None:
+        """Start on a newly finalized upload now rather than at the next poll"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = await process_next_upload(self.session_factory)
+            except Exception as e:
+                # Left "processing": retried once its backoff has passed
+                logger.error(f"Staged upload processing failed: {e}", exc_info=True)
+                processed = False
+
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            if not self._stopping.is_set():
+                self._wakeup.clear()
+
+
+document_processing_worker = DocumentProcessingWorker()
@@ -1,49 +1,99 @@
 """
 Service layer for Document operations
+
+Documents arrive either through the API (upload_document, encrypted while
+streaming from the request) or directly to S3 (two-phase upload):
+
+1. create_upload_url() issues a presigned POST for a staging key
+2. the client uploads to S3, then finalize_upload() records the Document
+   with status "processing"
+3. DocumentProcessingWorker (services/document_processing.py) calls
+   process_staged_upload() to validate and encrypt it off the request path
 """
 
-from typing import List, Optional, BinaryIO
+from typing import Dict, List, Optional, BinaryIO, Iterator, AsyncIterator
 import os
 import uuid
+import asyncio
+import logging
+import tempfile
 from pathlib import Path
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
-from database.schemas_v2 import Document, Filing
+from database.schemas_v2 import Document, DocumentStatus, Filing
 from backend.app.core.errors import (
+    AuthorizationError,
     ResourceNotFoundError,
     APIException,
     ErrorCodes
 )
+from backend.app.core.crypto_executor import crypto_executor
+from backend.app.utils.chunked_encryption import (
+    PlaintextTooLargeError,
+    decrypt_range,
+    encrypt_stream,
+    get_file_encryption_key,
+    is_chunked_file,
+    plaintext_size
+)
+from backend.app.utils.s3_storage import get_storage_service
+
+logger = logging.getLogger(__name__)
+
+
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+ALLOWED_FILE_TYPES = ['pdf', 'jpg', 'jpeg', 'png', 'doc', 'docx']
+
+# Leading bytes a staged upload must start with, by declared file type
+FILE_SIGNATURES = {
+    'pdf': (b'%PDF',),
+    'jpg': (b'\xff\xd8\xff',),
+    'jpeg': (b'\xff\xd8\xff',),
+    'png': (b'\x89PNG\r\n\x1a\n',),
+    'doc': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',),
+    'docx': (b'PK\x03\x04',),
+}
+SIGNATURE_SIZE = 8
+
+STAGING_PREFIX = os.getenv("DOCUMENT_STAGING_PREFIX", "staging")
+UPLOAD_URL_EXPIRES = int(os.getenv("DOCUMENT_UPLOAD_URL_EXPIRES", 900))  # seconds
+
+
+class StagedUploadRejected(Exception):
+    """A staged upload failed validation; the message is shown to the user"""
 
 
 class DocumentService:
     """Business logic for Document operations"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.storage_path = os.getenv("STORAGE_PATH", "/var/taxease/storage")
         Path(self.storage_path).mkdir(parents=True, exist_ok=True)
     
-    def get_user_documents(
+    async def get_user_documents(
         self,
         user_id: str,
         filing_id: Optional[str] = None,
         status: Optional[str] = None
     ) -> List[Document]:
         """Get all documents for a user"""
-        query = self.db.query(Document)\
+        query = select(Document)\
             .join(Filing)\
-            .filter(Filing.user_id == user_id)
+            .where(Filing.user_id == user_id)
         
         if filing_id:
-            query = query.filter(Document.filing_id == filing_id)
+            query = query.where(Document.filing_id == filing_id)
         if status:
-            query = query.filter(Document.status == status)
+            query = query.where(Document.status == status)
         
-        return query.order_by(Document.uploaded_at.desc()).all()
+        result = await self.db.execute(query.order_by(Document.uploaded_at.desc()))
+        return list(result.scalars().all())
     
-    def get_admin_documents(
+    async def get_admin_documents(
         self,
         admin_id: str,
         is_superadmin: bool,
@@ -51,64 +101,62 @@ class DocumentService:
     ) -> List[Document]:
         """Get documents for admin (assigned filings only, unless superadmin)"""
         # TODO: Filter by admin assignment
-        query = self.db.query(Document)
+        query = select(Document)
         
         if filing_id:
-            query = query.filter(Document.filing_id == filing_id)
+            query = query.where(Document.filing_id == filing_id)
         
-        return query.order_by(Document.uploaded_at.desc()).all()
+        result = await self.db.execute(query.order_by(Document.uploaded_at.desc()))
+        return list(result.scalars().all())
     
-    def get_document_by_id(self, document_id: str) -> Document:
+    async def get_document_by_id(self, document_id: str) -> Document:
         """Get document by ID"""
-        document = self.db.query(Document).filter(Document.id == document_id).first()
+        document = await self.db.scalar(select(Document).where(Document.id == document_id))
         if not document:
             raise ResourceNotFoundError("Document", document_id)
         return document
     
-    def upload_document(
+    async def upload_document(
         self,
         filing_id: str,
-        file_content: bytes,
+        file_obj: BinaryIO,
         original_filename: str,
         file_type: str,
-        file_size: int,
         document_type: str,
+        file_size: Optional[int] = None,
         section_name: Optional[str] = None,
         name: Optional[str] = None
     ) -> Document:
-        """Upload and encrypt document"""
+        """
+        Upload and encrypt document.
+        
+        file_obj is read and encrypted chunk by chunk (see
+        utils/chunked_encryption.py), so the plaintext is never held in memory
+        in full. file_size is the size reported by the client, if known; the
+        size limit is also enforced while streaming.
+        """
         
         # Verify filing exists
-        filing = self.db.query(Filing).filter(Filing.id == filing_id).first()
+        filing = await self.db.scalar(select(Filing).where(Filing.id == filing_id))
         if not filing:
             raise ResourceNotFoundError("Filing", filing_id)
         
         # Validate file size (10MB max)
-        if file_size > 10 * 1024 * 1024:
-            raise APIException(
-                status_code=413,
-                error_code=ErrorCodes.FILE_TOO_LARGE,
-                message="File exceeds maximum size of 10MB"
-            )
+        if file_size is not None and file_size > MAX_FILE_SIZE:
+            raise self._file_too_large()
         
         # Validate file type
-        allowed_types = ['pdf', 'jpg', 'jpeg', 'png', 'doc', 'docx']
-        if file_type.lower() not in allowed_types:
-            raise APIException(
-                status_code=422,
-                error_code=ErrorCodes.FILE_INVALID_TYPE,
-                message=f"File type not allowed. Allowed types: {', '.join(allowed_types)}"
-            )
+        self._check_file_type(file_type)
         
         # Generate unique filename
         file_id = str(uuid.uuid4())
         file_path = os.path.join(self.storage_path, f"{file_id}.enc")
         
-        # Encrypt and save file
+        # Encrypt and save file on the crypto executor (off the event loop)
         try:
-            encrypted_content = self._encrypt_file(file_content)
-            with open(file_path, 'wb') as f:
-                f.write(encrypted_content)
+            file_size = await crypto_executor.run(self._encrypt_to_path, file_obj, file_path)
+        except PlaintextTooLargeError:
+            raise self._file_too_large()
         except Exception as e:
             raise APIException(
                 status_code=500,
@@ -131,14 +179,222 @@ class DocumentService:
         )
         
         self.db.add(document)
-        self.db.commit()
-        self.db.refresh(document)
+        await self.db.commit()
+        await self.db.refresh(document)
+        
+        return document
+    
+    # ========================================================================
+    # DIRECT-TO-STORAGE UPLOADS
+    # ========================================================================
+    
+    async def create_upload_url(
+        self,
+        user_id: str,
+        filing_id: str,
+        filename: str,
+        content_type: Optional[str] = None,
+        file_size: Optional[int] = None
+    ) -> Dict:
+        """
+        Issue a presigned POST for uploading a document straight to S3.
+        
+        The object lands under a staging key scoped to the user; nothing is
+        recorded until finalize_upload().
+        """
+        await self._get_owned_filing(filing_id, user_id)
+        
+        if file_size is not None and file_size > MAX_FILE_SIZE:
+            raise self._file_too_large()
+        self._check_file_type(self.file_type_from_name(filename))
+        
+        storage = self._direct_upload_storage()
+        upload_id = str(uuid.uuid4())
+        presigned = storage.get_upload_url(
+            self._staging_key(user_id, upload_id),
+            max_size=MAX_FILE_SIZE,
+            content_type=content_type,
+            expires_in=UPLOAD_URL_EXPIRES
+        )
+        
+        return {
+            "upload_id": upload_id,
+            "url": presigned["url"],
+            "fields": presigned["fields"],
+            "max_size": MAX_FILE_SIZE,
+            "expires_in": UPLOAD_URL_EXPIRES
+        }
+    
+    async def finalize_upload(
+        self,
+        user_id: str,
+        upload_id: str,
+        filing_id: str,
+        filename: str,
+        document_type: str,
+        section_name: Optional[str] = None
+    ) -> Document:
+        """
+        Record a document uploaded through create_upload_url().
+        
+        The Document is created with status "processing" and points at the
+        staged object; process_staged_upload() validates and encrypts it.
+        """
+        try:
+            upload_id = str(uuid.UUID(upload_id))
+        except ValueError:
+            raise ResourceNotFoundError("Upload", upload_id)
+        
+        await self._get_owned_filing(filing_id, user_id)
+        file_type = self.file_type_from_name(filename)
+        self._check_file_type(file_type)
+        
+        storage = self._direct_upload_storage()
+        staging_key = self._staging_key(user_id, upload_id)
+        
+        existing = await self.db.scalar(
+            select(Document.id).where(
+                Document.file_path == staging_key,
+                Document.status == DocumentStatus.PROCESSING.value
+            )
+        )
+        if existing:
+            raise self._already_finalized()
+        
+        file_size = await storage.get_file_size_async(staging_key)
+        if file_size is None:
+            raise ResourceNotFoundError("Upload", upload_id)
+        if file_size > MAX_FILE_SIZE:
+            await storage.delete_file_async(staging_key)
+            raise self._file_too_large()
+        
+        document = Document(
+            filing_id=filing_id,
+            name=filename,
+            original_filename=filename,
+            file_type=file_type,
+            file_size=file_size,
+            file_path=staging_key,
+            encrypted=False,
+            document_type=document_type,
+            section_name=section_name,
+            status=DocumentStatus.PROCESSING.value,
+            next_attempt_at=func.now()
+        )
+        
+        self.db.add(document)
+        try:
+            await self.db.commit()
+        except IntegrityError:
+            # A concurrent finalize of the same upload won (idx_document_staged_upload)
+            await self.db.rollback()
+            raise self._already_finalized()
+        await self.db.refresh(document)
         
         return document
     
-    def download_document(self, document_id: str) -> tuple[bytes, str, str]:
-        """Download and decrypt document"""
-        document = self.get_document_by_id(document_id)
+    async def process_staged_upload(self, document: Document) -> None:
+        """
+        Validate and encrypt a staged upload into document storage.
+        
+        Called by the processing worker with the document claimed but not
+        locked: the staged object is downloaded on the storage I/O pool into
+        a temporary file and only the encryption runs on the crypto pool, with
+        no transaction open. The row is locked just to record the outcome; if
+        it is no longer "processing" by then (deleted, or finished by another
+        worker after the claim expired) the result is discarded.
+        
+        On success the document becomes "pending" like an API upload; an
+        upload that fails validation is rejected (reject_staged_upload).
+        Other errors propagate and the document stays "processing" to be
+        retried.
+        """
+        storage = get_storage_service()
+        staging_key = document.file_path
+        file_path = os.path.join(self.storage_path, f"{uuid.uuid4()}.enc")
+        
+        try:
+            with tempfile.TemporaryFile(dir=self.storage_path) as staged:
+                try:
+                    await storage.download_to_file_async(staging_key, staged)
+                except FileNotFoundError:
+                    raise StagedUploadRejected("Uploaded file not found")
+                file_size = await crypto_executor.run(self._encrypt_staged, staged, document.file_type, file_path)
+        except StagedUploadRejected as e:
+            document = await self.lock_staged_upload(document.id)
+            if document is not None:
+                await self.reject_staged_upload(document, str(e))
+            return
+        
+        document = await self.lock_staged_upload(document.id)
+        if document is None:
+            os.remove(file_path)
+            return
+        
+        document.file_path = file_path
+        document.file_size = file_size
+        document.encrypted = True
+        document.status = DocumentStatus.PENDING.value
+        document.uploaded_at = datetime.utcnow()
+        try:
+            await self.db.commit()
+        except Exception:
+            os.remove(file_path)
+            raise
+        
+        await storage.delete_file_async(staging_key)
+    
+    async def lock_staged_upload(self, document_id) -> Optional[Document]:
+        """Row-lock a document if it is still "processing" (it may have been deleted)"""
+        return await self.db.scalar(
+            select(Document)
+            .where(Document.id == document_id, Document.status == DocumentStatus.PROCESSING.value)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+    
+    async def reject_staged_upload(self, document: Document, reason: str) -> None:
+        """
+        Mark a staged upload "rejected" (reason in notes) and remove the
+        staged object. The document must be locked (lock_staged_upload).
+        """
+        staging_key = document.file_path
+        document.status = DocumentStatus.REJECTED.value
+        document.notes = reason
+        await self.db.commit()
+        logger.info(f"Rejected staged upload for document {document.id}: {reason}")
+        
+        try:
+            await get_storage_service().delete_file_async(staging_key)
+        except Exception as e:
+            logger.warning(f"Failed to delete staged upload {staging_key}: {e}")
+    
+    async def download_document(
+        self,
+        document_id: str,
+        byte_range: Optional[str] = None
+    ) -> tuple[AsyncIterator[bytes], str, str, int, Optional[tuple[int, int]]]:
+        """
+        Open a decrypting stream over a document.
+        
+        Args:
+            document_id: Document to download
+            byte_range: Value of the HTTP Range header, if any
+        
+        Returns:
+            (chunks, filename, file_type, total_size, content_range) where
+            chunks yields plaintext bytes (each chunk is decrypted on the
+            crypto executor) and content_range is the inclusive (start, end)
+            served, or None for the whole file
+        """
+        document = await self.get_document_by_id(document_id)
+        
+        if document.status in (DocumentStatus.PROCESSING.value, DocumentStatus.REJECTED.value):
+            raise APIException(
+                status_code=409,
+                error_code=ErrorCodes.RESOURCE_CONFLICT,
+                message=f"Document is not available for download (status: {document.status})"
+            )
         
         if not os.path.exists(document.file_path):
             raise APIException(
@@ -148,27 +404,40 @@ class DocumentService:
             )
         
         try:
-            with open(document.file_path, 'rb') as f:
-                encrypted_content = f.read()
-            
-            decrypted_content = self._decrypt_file(encrypted_content)
-            
-            return decrypted_content, document.original_filename, document.file_type
+            if await crypto_executor.run(is_chunked_file, document.file_path):
+                total_size = await crypto_executor.run(plaintext_size, document.file_path)
+                legacy_content = None
+            else:
+                # Legacy single-shot AES-CBC file: decrypted in memory
+                legacy_content = await crypto_executor.run(self._decrypt_legacy_path, document.file_path)
+                total_size = len(legacy_content)
         except Exception as e:
             raise APIException(
                 status_code=500,
                 error_code=ErrorCodes.FILE_DECRYPTION_FAILED,
                 message=f"Failed to decrypt file: {str(e)}"
             )
+        
+        content_range = self._parse_range(byte_range, total_size)
+        start, end = content_range or (0, total_size - 1)
+        
+        if legacy_content is not None:
+            chunks = self._iterate_on_executor(iter([legacy_content[start:end + 1]]))
+        else:
+            chunks = self._iterate_on_executor(
+                decrypt_range(document.file_path, get_file_encryption_key(), start, end)
+            )
+        
+        return chunks, document.original_filename, document.file_type, total_size, content_range
     
-    def update_document(
+    async def update_document(
         self,
         document_id: str,
         name: Optional[str] = None,
         notes: Optional[str] = None
     ) -> Document:
         """Update document metadata"""
-        document = self.get_document_by_id(document_id)
+        document = await self.get_document_by_id(document_id)
         
         if name:
             document.name = name
@@ -176,92 +445,208 @@ class DocumentService:
             document.notes = notes
         
         document.updated_at = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(document)
+        await self.db.commit()
+        await self.db.refresh(document)
         
         return document
     
-    def update_document_status(
+    async def update_document_status(
         self,
         document_id: str,
         status: str,
         notes: Optional[str] = None
     ) -> Document:
         """Update document status (admin only)"""
-        document = self.get_document_by_id(document_id)
+        document = await self.get_document_by_id(document_id)
         
         document.status = status
         if notes:
             document.notes = notes
         document.updated_at = datetime.utcnow()
         
-        self.db.commit()
-        self.db.refresh(document)
+        await self.db.commit()
+        await self.db.refresh(document)
         
         return document
     
-    def delete_document(self, document_id: str):
+    async def delete_document(self, document_id: str):
         """Delete document (admin only)"""
-        document = self.get_document_by_id(document_id)
+        document = await self.get_document_by_id(document_id)
         
-        # Delete file from disk
-        if os.path.exists(document.file_path):
+        # Delete file from disk (or the staged object of an unprocessed upload)
+        if document.status == DocumentStatus.PROCESSING.value:
+            await get_storage_service().delete_file_async(document.file_path)
+        elif os.path.exists(document.file_path):
             os.remove(document.file_path)
         
         # Delete database record
-        self.db.delete(document)
-        self.db.commit()
+        await self.db.delete(document)
+        await self.db.commit()
     
-    def _encrypt_file(self, content: bytes) -> bytes:
-        """Encrypt file content using AES-256"""
-        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-        from cryptography.hazmat.backends import default_backend
-        import os
-        
-        # Get encryption key from environment (32 bytes for AES-256)
-        key_str = os.getenv("ENCRYPTION_KEY") or os.getenv("FILE_ENCRYPTION_KEY")
-        if not key_str:
-            # Generate exactly 32 bytes default key
-            key_str = "12345678901234567890123456789012"  # 32 chars
-        key = key_str.encode()[:32]
-        if len(key) != 32:
-            # Pad to 32 bytes if needed
-            key = key.ljust(32, b'0')
-        iv = os.urandom(16)
-        
-        cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
-        encryptor = cipher.encryptor()
-        
-        # Pad content to multiple of 16 bytes
-        padding_length = 16 - (len(content) % 16)
-        padded_content = content + bytes([padding_length]) * padding_length
-        
-        encrypted = encryptor.update(padded_content) + encryptor.finalize()
-        
-        # Prepend IV to encrypted content
-        return iv + encrypted
+    @staticmethod
+    async def _iterate_on_executor(iterator: Iterator[bytes]) -> AsyncIterator[bytes]:
+        """Drain a blocking iterator, advancing it on the crypto executor"""
+        sentinel = object()
+        pending: Optional[asyncio.Future] = None
+        try:
+            while True:
+                # Shielded: if the consumer is cancelled, pending still tracks
+                # the next() call running in the worker thread
+                pending = asyncio.ensure_future(crypto_executor.run(next, iterator, sentinel))
+                chunk = await asyncio.shield(pending)
+                pending = None
+                if chunk is sentinel:
+                    return
+                yield chunk
+        finally:
+            # Client disconnects stop iteration early: release the file handle
+            close = getattr(iterator, "close", None)
+            if close:
+                if pending is None or pending.done():
+                    close()
+                else:
+                    # A generator cannot be closed while a thread is running it
+                    pending.add_done_callback(lambda done: DocumentService._close_after(done, close))
+    
+    @staticmethod
+    def _close_after(done: asyncio.Future, close) -> None:
+        """Close an iterator once its in-flight next() has returned"""
+        if not done.cancelled():
+            done.exception()  # mark retrieved: nobody is waiting for the chunk any more
+        close()
+    
+    @staticmethod
+    def file_type_from_name(filename: Optional[str]) -> str:
+        """Lower-cased extension of filename, or 'unknown'"""
+        return filename.split('.')[-1].lower() if filename and '.' in filename else 'unknown'
+    
+    @staticmethod
+    def _check_file_type(file_type: str) -> None:
+        if file_type.lower() not in ALLOWED_FILE_TYPES:
+            raise APIException(
+                status_code=422,
+                error_code=ErrorCodes.FILE_INVALID_TYPE,
+                message=f"File type not allowed. Allowed types: {', '.join(ALLOWED_FILE_TYPES)}"
+            )
     
-    def _decrypt_file(self, encrypted_content: bytes) -> bytes:
-        """Decrypt file content"""
+    async def _get_owned_filing(self, filing_id: str, user_id: str) -> Filing:
+        filing = await self.db.scalar(select(Filing).where(Filing.id == filing_id))
+        if not filing:
+            raise ResourceNotFoundError("Filing", filing_id)
+        if str(filing.user_id) != str(user_id):
+            raise AuthorizationError(
+                error_code=ErrorCodes.AUTHZ_NOT_RESOURCE_OWNER,
+                message="You do not own this filing"
+            )
+        return filing
+    
+    @staticmethod
+    def _direct_upload_storage():
+        storage = get_storage_service()
+        if not storage.use_s3:
+            raise APIException(
+                status_code=501,
+                error_code=ErrorCodes.FEATURE_NOT_IMPLEMENTED,
+                message="Direct uploads require S3 storage; use POST /documents/upload"
+            )
+        return storage
+    
+    @staticmethod
+    def _staging_key(user_id: str, upload_id: str) -> str:
+        return f"{STAGING_PREFIX}/{user_id}/{upload_id}"
+    
+    @staticmethod
+    def _already_finalized() -> APIException:
+        return APIException(
+            status_code=409,
+            error_code=ErrorCodes.RESOURCE_CONFLICT,
+            message="Upload has already been finalized"
+        )
+    
+    @staticmethod
+    def _file_too_large() -> APIException:
+        return APIException(
+            status_code=413,
+            error_code=ErrorCodes.FILE_TOO_LARGE,
+            message="File exceeds maximum size of 10MB"
+        )
+    
+    @staticmethod
+    def _parse_range(byte_range: Optional[str], total_size: int) -> Optional[tuple[int, int]]:
+        """
+        Parse a single-range "bytes=" header into an inclusive (start, end).
+        
+        Returns None when the whole file should be served (no header, or a
+        header this endpoint does not honour such as multiple ranges).
+        """
+        if not byte_range or not byte_range.startswith("bytes=") or "," in byte_range:
+            return None
+        
+        first, _, last = byte_range[len("bytes="):].strip().partition("-")
+        try:
+            if first:
+                start = int(first)
+                end = int(last) if last else total_size - 1
+            else:
+                # Suffix range: the final N bytes
+                start = max(total_size - int(last), 0)
+                end = total_size - 1
+        except ValueError:
+            return None
+        
+        if start > end or start >= total_size:
+            raise APIException(
+                status_code=416,
+                error_code=ErrorCodes.FILE_RANGE_NOT_SATISFIABLE,
+                message=f"Requested range not satisfiable (file size {total_size} bytes)"
+            )
+        return start, min(end, total_size - 1)
+    
+    def _encrypt_to_path(self, file_obj: BinaryIO, file_path: str) -> int:
+        """Encrypt file_obj into file_path, returning the plaintext size"""
+        partial_path = f"{file_path}.part"
+        try:
+            with open(partial_path, 'wb') as dst:
+                size = encrypt_stream(
+                    file_obj,
+                    dst,
+                    get_file_encryption_key(),
+                    max_size=MAX_FILE_SIZE
+                )
+            os.replace(partial_path, file_path)
+            return size
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+    
+    def _encrypt_staged(self, staged: BinaryIO, file_type: str, file_path: str) -> int:
+        """Check and encrypt a downloaded staged upload into file_path, returning the plaintext size"""
+        staged.seek(0)
+        head = staged.read(SIGNATURE_SIZE)
+        if not head:
+            raise StagedUploadRejected("Uploaded file is empty")
+        if not head.startswith(FILE_SIGNATURES.get(file_type.lower(), ())):
+            raise StagedUploadRejected(f"File content does not match type '{file_type}'")
+        
+        staged.seek(0)
+        try:
+            return self._encrypt_to_path(staged, file_path)
+        except PlaintextTooLargeError:
+            raise StagedUploadRejected("File exceeds maximum size of 10MB")
+    
+    def _decrypt_legacy_path(self, file_path: str) -> bytes:
+        """Decrypt a legacy AES-CBC file (IV + padded ciphertext)"""
         from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
         from cryptography.hazmat.backends import default_backend
-        import os
-        
-        # Get encryption key from environment (32 bytes for AES-256)
-        key_str = os.getenv("ENCRYPTION_KEY") or os.getenv("FILE_ENCRYPTION_KEY")
-        if not key_str:
-            # Generate exactly 32 bytes default key
-            key_str = "12345678901234567890123456789012"  # 32 chars
-        key = key_str.encode()[:32]
-        if len(key) != 32:
-            # Pad to 32 bytes if needed
-            key = key.ljust(32, b'0')
+        
+        with open(file_path, 'rb') as f:
+            encrypted_content = f.read()
         
         # Extract IV and encrypted content
         iv = encrypted_content[:16]
         encrypted = encrypted_content[16:]
         
-        cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
+        cipher = Cipher(algorithms.AES(get_file_encryption_key()), modes.CBC(iv), backend=default_backend())
         decryptor = cipher.decryptor()
         
         padded_content = decryptor.update(encrypted) + decryptor.finalize()
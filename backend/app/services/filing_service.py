@@ -3,8 +3,9 @@ Service layer for Filing operations
 """
 
 from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, true
+from sqlalchemy.orm import aliased
 from datetime import datetime
 
 from database.schemas_v2 import Filing, AdminFilingAssignment, Payment, FilingTimeline, User, Admin
@@ -19,35 +20,28 @@ from backend.app.core.errors import (
 class FilingService:
     """Business logic for Filing operations"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def get_user_filings(
+    async def get_user_filings(
         self,
         user_id: str,
         page: int = 1,
         page_size: int = 20,
         year: Optional[int] = None,
         status: Optional[str] = None
-    ) -> tuple[List[Filing], int]:
-        """Get all filings for a user"""
-        query = self.db.query(Filing).filter(Filing.user_id == user_id)
+    ) -> tuple[List[tuple[Filing, float]], int]:
+        """Get all filings for a user, each paired with its paid amount"""
+        query = select(Filing).where(Filing.user_id == user_id)
         
         if year:
-            query = query.filter(Filing.filing_year == year)
+            query = query.where(Filing.filing_year == year)
         if status:
-            query = query.filter(Filing.status == status)
+            query = query.where(Filing.status == status)
         
-        total = query.count()
-        
-        filings = query.order_by(Filing.created_at.desc())\
-            .offset((page - 1) * page_size)\
-            .limit(page_size)\
-            .all()
-        
-        return filings, total
+        return await self._paginate(query, page, page_size)
     
-    def get_admin_filings(
+    async def get_admin_filings(
         self,
         admin_id: str,
         is_superadmin: bool,
@@ -55,43 +49,85 @@ class FilingService:
         page_size: int = 20,
         year: Optional[int] = None,
         status: Optional[str] = None
-    ) -> tuple[List[Filing], int]:
-        """Get filings for admin (assigned only, unless superadmin)"""
-        query = self.db.query(Filing)
+    ) -> tuple[List[tuple[Filing, float]], int]:
+        """Get filings for admin (assigned only, unless superadmin), each paired with its paid amount"""
+        query = select(Filing)
         
         # Non-superadmin can only see assigned filings
         if not is_superadmin:
             query = query.join(AdminFilingAssignment)\
-                .filter(AdminFilingAssignment.admin_id == admin_id)
+                .where(AdminFilingAssignment.admin_id == admin_id)
         
         if year:
-            query = query.filter(Filing.filing_year == year)
+            query = query.where(Filing.filing_year == year)
         if status:
-            query = query.filter(Filing.status == status)
+            query = query.where(Filing.status == status)
         
-        total = query.count()
+        return await self._paginate(query, page, page_size)
+    
+    async def _paginate(
+        self,
+        query,
+        page: int,
+        page_size: int
+    ) -> tuple[List[tuple[Filing, float]], int]:
+        """
+        Return one page of (filing, paid_amount) pairs (newest first) plus the total count.
         
-        filings = query.order_by(Filing.created_at.desc())\
-            .offset((page - 1) * page_size)\
-            .limit(page_size)\
-            .all()
+        One round trip: the page subquery carries COUNT(*) OVER () for the
+        total, and paid amounts are summed through a LATERAL join evaluated
+        only for the rows on the page.
+        """
+        page_subquery = (
+            query.add_columns(func.count().over().label("total_count"))
+            .order_by(Filing.created_at.desc(), Filing.id.desc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+            .subquery("filing_page")
+        )
+        page_filing = aliased(Filing, page_subquery)
+        paid = (
+            select(func.coalesce(func.sum(Payment.amount), 0.0).label("paid_amount"))
+            .where(Payment.filing_id == page_subquery.c.id)
+            .lateral("paid")
+        )
         
-        return filings, total
+        result = await self.db.execute(
+            select(page_filing, paid.c.paid_amount, page_subquery.c.total_count)
+            .select_from(page_subquery)
+            .join(paid, true())
+            .order_by(page_subquery.c.created_at.desc(), page_subquery.c.id.desc())
+        )
+        rows = result.all()
+        
+        if rows:
+            total = rows[0].total_count
+        elif page > 1:
+            # Past the last page: the window count has no row to ride on
+            total = await self.db.scalar(
+                select(func.count()).select_from(query.order_by(None).subquery())
+            ) or 0
+        else:
+            total = 0
+        
+        return [(row[0], float(row.paid_amount)) for row in rows], total
     
-    def get_filing_by_id(self, filing_id: str) -> Filing:
+    async def get_filing_by_id(self, filing_id: str) -> Filing:
         """Get filing by ID"""
-        filing = self.db.query(Filing).filter(Filing.id == filing_id).first()
+        filing = await self.db.scalar(select(Filing).where(Filing.id == filing_id))
         if not filing:
             raise ResourceNotFoundError("Filing", filing_id)
         return filing
     
-    def create_filing(self, user_id: str, filing_year: int) -> Filing:
+    async def create_filing(self, user_id: str, filing_year: int) -> Filing:
         """Create new filing"""
         # Check for duplicate
-        existing = self.db.query(Filing).filter(
-            Filing.user_id == user_id,
-            Filing.filing_year == filing_year
-        ).first()
+        existing = await self.db.scalar(
+            select(Filing).where(
+                Filing.user_id == user_id,
+                Filing.filing_year == filing_year
+            )
+        )
         
         if existing:
             raise ResourceConflictError(
@@ -107,11 +143,11 @@ class FilingService:
             status="documents_pending"
         )
         self.db.add(filing)
-        self.db.commit()
-        self.db.refresh(filing)
+        await self.db.commit()
+        await self.db.refresh(filing)
         
         # Add timeline event
-        self._add_timeline_event(
+        await self._add_timeline_event(
             filing_id=filing.id,
             event_type="filing_created",
             description=f"Filing created for tax year {filing_year}",
@@ -121,7 +157,7 @@ class FilingService:
         
         return filing
     
-    def update_filing_status(
+    async def update_filing_status(
         self,
         filing_id: str,
         new_status: str,
@@ -129,18 +165,18 @@ class FilingService:
         admin_name: str
     ) -> Filing:
         """Update filing status"""
-        filing = self.get_filing_by_id(filing_id)
+        filing = await self.get_filing_by_id(filing_id)
         old_status = filing.status
         
         # TODO: Validate status transition
         
         filing.status = new_status
         filing.updated_at = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(filing)
+        await self.db.commit()
+        await self.db.refresh(filing)
         
         # Add timeline event
-        self._add_timeline_event(
+        await self._add_timeline_event(
             filing_id=filing.id,
             event_type="status_update",
             description=f"Status changed from {old_status} to {new_status}",
@@ -151,7 +187,7 @@ class FilingService:
         
         return filing
     
-    def update_filing_fee(
+    async def update_filing_fee(
         self,
         filing_id: str,
         total_fee: float,
@@ -159,15 +195,15 @@ class FilingService:
         admin_name: str
     ) -> Filing:
         """Update filing total fee"""
-        filing = self.get_filing_by_id(filing_id)
+        filing = await self.get_filing_by_id(filing_id)
         
         filing.total_fee = total_fee
         filing.updated_at = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(filing)
+        await self.db.commit()
+        await self.db.refresh(filing)
         
         # Add timeline event
-        self._add_timeline_event(
+        await self._add_timeline_event(
             filing_id=filing.id,
             event_type="fee_set",
             description=f"Filing fee set to ${total_fee:.2f}",
@@ -178,7 +214,7 @@ class FilingService:
         
         return filing
     
-    def assign_admin(
+    async def assign_admin(
         self,
         filing_id: str,
         admin_id: str,
@@ -186,18 +222,20 @@ class FilingService:
         assigned_by_name: str
     ) -> Filing:
         """Assign admin to filing"""
-        filing = self.get_filing_by_id(filing_id)
+        filing = await self.get_filing_by_id(filing_id)
         
         # Check if admin exists
-        admin = self.db.query(Admin).filter(Admin.id == admin_id).first()
+        admin = await self.db.scalar(select(Admin).where(Admin.id == admin_id))
         if not admin:
             raise ResourceNotFoundError("Admin", admin_id)
         
         # Check if already assigned
-        existing = self.db.query(AdminFilingAssignment).filter(
-            AdminFilingAssignment.admin_id == admin_id,
-            AdminFilingAssignment.filing_id == filing_id
-        ).first()
+        existing = await self.db.scalar(
+            select(AdminFilingAssignment).where(
+                AdminFilingAssignment.admin_id == admin_id,
+                AdminFilingAssignment.filing_id == filing_id
+            )
+        )
         
         if existing:
             raise ResourceConflictError(
@@ -211,10 +249,10 @@ class FilingService:
             filing_id=filing_id
         )
         self.db.add(assignment)
-        self.db.commit()
+        await self.db.commit()
         
         # Add timeline event
-        self._add_timeline_event(
+        await self._add_timeline_event(
             filing_id=filing.id,
             event_type="admin_assigned",
             description=f"Admin {admin.name} assigned to filing",
@@ -223,22 +261,31 @@ class FilingService:
             actor_name=assigned_by_name
         )
         
-        self.db.refresh(filing)
+        await self.db.refresh(filing)
         return filing
     
-    def calculate_paid_amount(self, filing_id: str) -> float:
+    async def calculate_paid_amount(self, filing_id: str) -> float:
         """Calculate total paid amount for filing"""
-        result = self.db.query(func.sum(Payment.amount))\
-            .filter(Payment.filing_id == filing_id)\
-            .scalar()
+        result = await self.db.scalar(
+            select(func.sum(Payment.amount)).where(Payment.filing_id == filing_id)
+        )
         return result or 0.0
     
-    def calculate_payment_status(self, filing: Filing) -> str:
+    async def calculate_payment_status(self, filing: Filing, paid_amount: Optional[float] = None) -> str:
         """Calculate payment status based on paid amount vs total fee"""
         if not filing.total_fee or filing.total_fee <= 0:
             return "pending"
         
-        paid_amount = self.calculate_paid_amount(filing.id)
+        if paid_amount is None:
+            paid_amount = await self.calculate_paid_amount(filing.id)
+        
+        return self.payment_status_for(filing, paid_amount)
+    
+    @staticmethod
+    def payment_status_for(filing: Filing, paid_amount: float) -> str:
+        """Payment status for a filing whose paid amount is already known"""
+        if not filing.total_fee or filing.total_fee <= 0:
+            return "pending"
         
         if paid_amount >= filing.total_fee:
             return "paid"
@@ -249,22 +296,26 @@ class FilingService:
         else:
             return "pending"
     
-    def get_filing_timeline(self, filing_id: str) -> List[FilingTimeline]:
+    async def get_filing_timeline(self, filing_id: str) -> List[FilingTimeline]:
         """Get timeline events for filing"""
-        return self.db.query(FilingTimeline)\
-            .filter(FilingTimeline.filing_id == filing_id)\
-            .order_by(FilingTimeline.created_at.desc())\
-            .all()
+        result = await self.db.execute(
+            select(FilingTimeline)
+            .where(FilingTimeline.filing_id == filing_id)
+            .order_by(FilingTimeline.created_at.desc())
+        )
+        return list(result.scalars().all())
     
-    def is_admin_assigned(self, filing_id: str, admin_id: str) -> bool:
+    async def is_admin_assigned(self, filing_id: str, admin_id: str) -> bool:
         """Check if admin is assigned to filing"""
-        assignment = self.db.query(AdminFilingAssignment).filter(
-            AdminFilingAssignment.filing_id == filing_id,
-            AdminFilingAssignment.admin_id == admin_id
-        ).first()
+        assignment = await self.db.scalar(
+            select(AdminFilingAssignment.id).where(
+                AdminFilingAssignment.filing_id == filing_id,
+                AdminFilingAssignment.admin_id == admin_id
+            )
+        )
         return assignment is not None
     
-    def _add_timeline_event(
+    async def _add_timeline_event(
         self,
         filing_id: str,
         event_type: str,
@@ -283,4 +334,4 @@ class FilingService:
             actor_name=actor_name
         )
         self.db.add(event)
-        self.db.commit()
+        await self.db.commit()
@@ -0,0 +1,117 @@
+"""
+T1 Aggregate Loader
+===================
+Loads a T1 form together with everything the admin views render from it
+(filing, owner, answers, section progress, filing documents) and resolves
+actor ids (audit entries, section reviewers) to display names.
+
+Query plan, independent of the number of answers, sections, documents or
+audit entries:
+- 1 query: t1_forms JOIN filings JOIN users
+- 1 query per requested collection (selectinload, WHERE ... IN (...))
+- 1 query per table resolve_actors() is given ids for (users, admins)
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from database.schemas_v2 import T1Form, T1Answer, T1SectionProgress, Filing, User, Admin, Document
+
+
+@dataclass
+class T1Aggregate:
+    """A T1 form and its eagerly loaded related rows"""
+    t1_form: T1Form
+    filing: Filing
+    user: User
+    answers: List[T1Answer] = field(default_factory=list)
+    sections: List[T1SectionProgress] = field(default_factory=list)
+    documents: List[Document] = field(default_factory=list)
+
+
+@dataclass
+class Actor:
+    """Display info for a user or admin referenced by id"""
+    id: uuid.UUID
+    name: str
+    role: str
+
+
+async def load_t1_aggregate(
+    db: AsyncSession,
+    t1_form_id: uuid.UUID,
+    answers: bool = True,
+    sections: bool = True,
+    documents: bool = False
+) -> Optional[T1Aggregate]:
+    """
+    Load a T1 form with its filing and owner, plus the requested collections.
+
+    Returns None if the form does not exist.
+    """
+    options = [joinedload(T1Form.filing).joinedload(Filing.user)]
+    if answers:
+        options.append(selectinload(T1Form.answers))
+    if sections:
+        options.append(selectinload(T1Form.sections_progress))
+    if documents:
+        options.append(joinedload(T1Form.filing).selectinload(Filing.documents))
+
+    t1_form = (await db.scalars(
+        select(T1Form).where(T1Form.id == t1_form_id).options(*options)
+    )).first()
+    if not t1_form:
+        return None
+
+    filing = t1_form.filing
+    return T1Aggregate(
+        t1_form=t1_form,
+        filing=filing,
+        user=filing.user,
+        answers=list(t1_form.answers) if answers else [],
+        sections=list(t1_form.sections_progress) if sections else [],
+        documents=list(filing.documents) if documents else []
+    )
+
+
+def _actor_uuids(ids: Iterable[Any]) -> Set[uuid.UUID]:
+    return {uuid.UUID(str(actor_id)) for actor_id in ids if actor_id is not None}
+
+
+async def resolve_actors(
+    db: AsyncSession,
+    user_ids: Iterable[Any] = (),
+    admin_ids: Iterable[Any] = ()
+) -> Dict[str, Actor]:
+    """
+    Resolve user/admin ids to display names with batched IN (...) lookups.
+
+    Pass each id as the kind its column references (e.g. section reviewers
+    are admins); a table is only queried if it was given ids. An id passed
+    as both (an actor that may be either) resolves to the user if one
+    exists. Ids may be UUIDs or strings; the result is keyed by str(id).
+    Unknown ids are absent from the result.
+    """
+    user_ids, admin_ids = _actor_uuids(user_ids), _actor_uuids(admin_ids)
+    actors: Dict[str, Actor] = {}
+
+    if admin_ids:
+        admins = (await db.execute(
+            select(Admin.id, Admin.name, Admin.role).where(Admin.id.in_(admin_ids))
+        )).all()
+        for row in admins:
+            actors[str(row.id)] = Actor(id=row.id, name=row.name, role=row.role)
+
+    if user_ids:
+        users = (await db.execute(
+            select(User.id, User.first_name, User.last_name).where(User.id.in_(user_ids))
+        )).all()
+        for row in users:
+            actors[str(row.id)] = Actor(id=row.id, name=f"{row.first_name} {row.last_name}", role="user")
+
+    return actors
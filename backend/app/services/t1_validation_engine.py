@@ -12,17 +12,45 @@ This service validates:
 - Repeatable subforms
 
 Single source of truth: backend/T1Structure (2).json
+
+The structure is compiled once at startup into a validation plan:
+- one validator closure per field (type, maxLength, select options)
+- one visibility predicate tuple per field (shownWhen/trigger conditions)
+- the ordered list of required fields
+- a reverse dependency index: watched key -> required fields it can show/hide
+
+Per-save work is then proportional to the submitted keys (and, for
+completion, their dependents) rather than to the whole structure.
+
+Completion is tracked per form as two bitsets over the required fields
+(visible, filled), persisted in T1Form.completion_state and updated with
+update_completion_masks() from the changed answers only.
 """
 
+import hashlib
 import json
 import os
 import re
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 from pathlib import Path
 
 
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+NON_DIGIT_PATTERN = re.compile(r'[^0-9]')
+ISO_DATE_PATTERN = re.compile(r'^(\d{4})-(\d{1,2})-(\d{1,2})$')
+
+# Condition attributes on a registry entry, in evaluation order
+CONDITION_ATTRIBUTES = ("section_condition", "condition", "trigger", "subform_condition")
+
+Predicate = Callable[[Dict[str, Any]], bool]
+Validator = Callable[[Any], List[str]]
+
+# (visible_mask, filled_mask) over the required fields, bit i = required_keys[i]
+CompletionMasks = Tuple[int, int]
+
+
 class T1ValidationEngine:
     """
     T1 Personal Tax Form validation engine.
@@ -45,6 +73,7 @@ class T1ValidationEngine:
         self.structure = self._load_structure()
         self.field_registry = self._build_field_registry()
         self.condition_registry = self._build_condition_registry()
+        self._compile_plan()
     
     def _load_structure(self) -> Dict[str, Any]:
         """Load and parse T1Structure.json"""
@@ -131,26 +160,231 @@ class T1ValidationEngine:
         registry = {}
         
         for field_key, field_def in self.field_registry.items():
-            # Check section-level conditions
-            section_condition = field_def.get("section_condition")
-            if section_condition:
-                watched_key = section_condition.get("key")
-                if watched_key:
-                    if watched_key not in registry:
-                        registry[watched_key] = []
-                    registry[watched_key].append(field_key)
-            
-            # Check field-level conditions
-            condition = field_def.get("condition") or field_def.get("trigger")
-            if condition and isinstance(condition, dict):
+            # Section, field, trigger and subform conditions all gate visibility
+            for attribute in CONDITION_ATTRIBUTES:
+                condition = field_def.get(attribute)
+                if not condition or not isinstance(condition, dict):
+                    continue
                 watched_key = condition.get("key")
                 if watched_key:
-                    if watched_key not in registry:
-                        registry[watched_key] = []
-                    registry[watched_key].append(field_key)
+                    dependents = registry.setdefault(watched_key, [])
+                    if field_key not in dependents:
+                        dependents.append(field_key)
         
         return registry
     
+    # ------------------------------------------------------------------
+    # PLAN COMPILATION
+    # ------------------------------------------------------------------
+    
+    def _compile_plan(self) -> None:
+        """Compile the registries into predicates, validators and indexes"""
+        self.visibility_predicates: Dict[str, Tuple[Predicate, ...]] = {}
+        self.field_validators: Dict[str, Validator] = {}
+        
+        for field_key, field_def in self.field_registry.items():
+            self.visibility_predicates[field_key] = tuple(
+                self._compile_condition(field_def[attribute])
+                for attribute in CONDITION_ATTRIBUTES
+                if field_def.get(attribute)
+            )
+            self.field_validators[field_key] = self._compile_validator(field_key, field_def)
+        
+        self.required_keys: Tuple[str, ...] = tuple(
+            field_key for field_key, field_def in self.field_registry.items()
+            if field_def.get("required", False)
+        )
+        
+        self.required_bits: Dict[str, int] = {
+            field_key: 1 << index for index, field_key in enumerate(self.required_keys)
+        }
+        self.required_condition_keys: Dict[str, FrozenSet[str]] = {
+            field_key: frozenset(
+                self.field_registry[field_key][attribute]["key"]
+                for attribute in CONDITION_ATTRIBUTES
+                if self.field_registry[field_key].get(attribute)
+                and self.field_registry[field_key][attribute].get("key")
+            )
+            for field_key in self.required_keys
+        }
+        
+        # Fingerprint of everything the completion bitsets depend on: bit order
+        # and the conditions gating each required field
+        plan_source = json.dumps(
+            [
+                [field_key] + [self.field_registry[field_key].get(attribute) for attribute in CONDITION_ATTRIBUTES]
+                for field_key in self.required_keys
+            ],
+            sort_keys=True,
+            default=str
+        )
+        self.completion_plan_id = hashlib.sha1(plan_source.encode()).hexdigest()[:12]
+        
+        required = set(self.required_keys)
+        self.required_dependents: Dict[str, FrozenSet[str]] = {
+            watched_key: frozenset(key for key in dependents if key in required)
+            for watched_key, dependents in self.condition_registry.items()
+        }
+        
+        self.document_plan: List[Tuple[str, Optional[Dict[str, Any]], Optional[Predicate]]] = [
+            (
+                doc_req.get("label"),
+                doc_req.get("shownWhen"),
+                self._compile_condition(doc_req["shownWhen"]) if doc_req.get("shownWhen") else None
+            )
+            for doc_req in self.structure.get("documentRequirements", [])
+        ]
+        
+        self.question_documents: List[Tuple[str, List[str]]] = [
+            (question.get("key"), question.get("documentsRequired", []))
+            for step in self.structure.get("steps", [])
+            if step.get("id") == "questionnaire"
+            for question in step.get("questions", [])
+            if question.get("documentsRequired")
+        ]
+    
+    @staticmethod
+    def _compile_condition(condition: Dict[str, Any]) -> Predicate:
+        """
+        Compile a shownWhen/trigger condition into a predicate over answers.
+        Same semantics as _evaluate_condition.
+        """
+        watched_key = condition.get("key")
+        operator = condition.get("operator", "equals")
+        expected_value = condition.get("value")
+        
+        if not watched_key:
+            return lambda answers: True  # No condition, always visible
+        
+        if operator == "equals":
+            return lambda answers: answers.get(watched_key) == expected_value
+        
+        if operator == "in":
+            if not isinstance(expected_value, list):
+                return lambda answers: False
+            return lambda answers: answers.get(watched_key) in expected_value
+        
+        if operator == "contains":
+            def contains(answers: Dict[str, Any]) -> bool:
+                actual_value = answers.get(watched_key)
+                if isinstance(actual_value, (list, str)):
+                    return expected_value in actual_value
+                return False
+            return contains
+        
+        # Unknown operator, fail-closed
+        return lambda answers: False
+    
+    def _compile_validator(self, field_key: str, field_def: Dict[str, Any]) -> Validator:
+        """
+        Compile the draft checks for one field (type, maxLength, select options).
+        The returned callable maps a non-empty value to its error messages.
+        """
+        type_check = self._compile_type_check(field_key, field_def)
+        max_length = field_def.get("maxLength")
+        options = field_def.get("options") if field_def.get("type") == "select" else None
+        
+        def validate(value: Any) -> List[str]:
+            errors = []
+            
+            type_error = type_check(value)
+            if type_error:
+                errors.append(type_error)
+            
+            if max_length is not None and isinstance(value, str) and len(value) > max_length:
+                errors.append(f"{field_key}: Exceeds max length of {max_length}")
+            
+            if options is not None and value not in options:
+                errors.append(f"{field_key}: Invalid option '{value}'. Must be one of {options}")
+            
+            return errors
+        
+        return validate
+    
+    @staticmethod
+    def _compile_type_check(field_key: str, field_def: Dict[str, Any]) -> Callable[[Any], Optional[str]]:
+        """Compile the type check for a field: value -> error message or None"""
+        field_type = field_def.get("type")
+        label = field_def.get("label", field_key)
+        
+        if field_type == "text" or field_type == "select":
+            def check(value):
+                if not isinstance(value, str):
+                    return f"{label}: Must be text"
+        
+        elif field_type == "number":
+            def check(value):
+                # Accept int, float, or numeric string
+                if isinstance(value, str):
+                    try:
+                        Decimal(value)
+                    except (InvalidOperation, ValueError):
+                        return f"{label}: Invalid number format"
+                elif not isinstance(value, (int, float, Decimal)):
+                    return f"{label}: Must be a number"
+        
+        elif field_type == "boolean":
+            def check(value):
+                if not isinstance(value, bool):
+                    return f"{label}: Must be true or false"
+        
+        elif field_type == "date":
+            def check(value):
+                if isinstance(value, str):
+                    # Validate ISO date format (YYYY-MM-DD)
+                    match = ISO_DATE_PATTERN.match(value)
+                    try:
+                        if not match:
+                            raise ValueError(value)
+                        date(int(match.group(1)), int(match.group(2)), int(match.group(3)))
+                    except ValueError:
+                        return f"{label}: Invalid date format (expected YYYY-MM-DD)"
+                elif not isinstance(value, datetime):
+                    return f"{label}: Must be a date"
+        
+        elif field_type == "email":
+            def check(value):
+                if not isinstance(value, str):
+                    return f"{label}: Must be text"
+                if not EMAIL_PATTERN.match(value):
+                    return f"{label}: Invalid email format"
+        
+        elif field_type == "phone":
+            def check(value):
+                if not isinstance(value, str):
+                    return f"{label}: Must be text"
+                # Universal phone validation - 10-15 digits (international standard)
+                phone_digits = NON_DIGIT_PATTERN.sub('', value)
+                if len(phone_digits) < 10 or len(phone_digits) > 15:
+                    return f"{label}: Invalid phone format (expected 10-15 digits)"
+                if value.startswith('+') and len(phone_digits) < 11:
+                    return f"{label}: International phone must have country code"
+        
+        else:
+            def check(value):
+                return None
+        
+        return check
+    
+    def affected_required_fields(self, changed_keys) -> Set[str]:
+        """
+        Required fields whose filled state or visibility can change when
+        changed_keys change: the required changed keys themselves plus every
+        required field gated by a condition on one of them.
+        """
+        affected = set()
+        required_dependents = self.required_dependents
+        field_registry = self.field_registry
+        
+        for key in changed_keys:
+            if field_registry.get(key, {}).get("required", False):
+                affected.add(key)
+            dependents = required_dependents.get(key)
+            if dependents:
+                affected.update(dependents)
+        
+        return affected
+    
     def validate_draft_save(self, answers: Dict[str, Any]) -> Tuple[bool, List[str]]:
         """
         Validate draft save (partial validation).
@@ -169,28 +403,15 @@ class T1ValidationEngine:
             if value is None or value == "":
                 continue
             
-            # Get field definition
-            field_def = self.field_registry.get(field_key)
-            if not field_def:
+            # Get compiled validator
+            validator = self.field_validators.get(field_key)
+            if not validator:
                 # In draft mode, allow unknown fields (store as JSONB)
                 # They may be custom fields from mobile app
-                # Only validate type for basic safety
                 continue
             
-            # Validate type
-            type_valid, type_error = self._validate_type(field_key, value, field_def)
-            if not type_valid:
-                errors.append(type_error)
-            
-            # Validate maxLength
-            if "maxLength" in field_def and isinstance(value, str):
-                if len(value) > field_def["maxLength"]:
-                    errors.append(f"{field_key}: Exceeds max length of {field_def['maxLength']}")
-            
-            # Validate select options
-            if field_def.get("type") == "select" and "options" in field_def:
-                if value not in field_def["options"]:
-                    errors.append(f"{field_key}: Invalid option '{value}'. Must be one of {field_def['options']}")
+            # Validate type, maxLength and select options
+            errors.extend(validator(value))
         
         return len(errors) == 0, errors
     
@@ -232,20 +453,12 @@ class T1ValidationEngine:
         Returns:
             Set of required field keys
         """
-        required = set()
-        
-        for field_key, field_def in self.field_registry.items():
-            # Check if field is required
-            if not field_def.get("required", False):
-                continue
-            
-            # Check if field is conditionally visible
-            if not self._is_field_visible(field_key, field_def, answers):
-                continue
-            
-            required.add(field_key)
+        visibility_predicates = self.visibility_predicates
         
-        return required
+        return {
+            field_key for field_key in self.required_keys
+            if all(predicate(answers) for predicate in visibility_predicates[field_key])
+        }
     
     def _is_field_visible(self, field_key: str, field_def: Dict[str, Any], answers: Dict[str, Any]) -> bool:
         """
@@ -259,31 +472,15 @@ class T1ValidationEngine:
         Returns:
             True if field should be visible
         """
-        # Check section-level condition
-        section_condition = field_def.get("section_condition")
-        if section_condition:
-            if not self._evaluate_condition(section_condition, answers):
-                return False
-        
-        # Check field-level condition
-        condition = field_def.get("condition")
-        if condition:
-            if not self._evaluate_condition(condition, answers):
-                return False
-        
-        # Check trigger condition (for detail steps)
-        trigger = field_def.get("trigger")
-        if trigger:
-            if not self._evaluate_condition(trigger, answers):
-                return False
-        
-        # Check subform condition
-        subform_condition = field_def.get("subform_condition")
-        if subform_condition:
-            if not self._evaluate_condition(subform_condition, answers):
-                return False
-        
-        return True
+        predicates = self.visibility_predicates.get(field_key)
+        if predicates is None:
+            predicates = tuple(
+                self._compile_condition(field_def[attribute])
+                for attribute in CONDITION_ATTRIBUTES
+                if field_def.get(attribute)
+            )
+        
+        return all(predicate(answers) for predicate in predicates)
     
     def _evaluate_condition(self, condition: Dict[str, Any], answers: Dict[str, Any]) -> bool:
         """
@@ -333,62 +530,9 @@ class T1ValidationEngine:
         Returns:
             (is_valid, error_message)
         """
-        field_type = field_def.get("type")
-        label = field_def.get("label", field_key)
-        
-        if field_type == "text":
-            if not isinstance(value, str):
-                return False, f"{label}: Must be text"
-        
-        elif field_type == "number":
-            try:
-                # Accept int, float, or numeric string
-                if isinstance(value, str):
-                    Decimal(value)
-                elif not isinstance(value, (int, float, Decimal)):
-                    return False, f"{label}: Must be a number"
-            except (InvalidOperation, ValueError):
-                return False, f"{label}: Invalid number format"
-        
-        elif field_type == "boolean":
-            if not isinstance(value, bool):
-                return False, f"{label}: Must be true or false"
-        
-        elif field_type == "date":
-            if isinstance(value, str):
-                # Validate ISO date format (YYYY-MM-DD)
-                try:
-                    datetime.strptime(value, "%Y-%m-%d")
-                except ValueError:
-                    return False, f"{label}: Invalid date format (expected YYYY-MM-DD)"
-            elif not isinstance(value, datetime):
-                return False, f"{label}: Must be a date"
-        
-        elif field_type == "email":
-            if not isinstance(value, str):
-                return False, f"{label}: Must be text"
-            # Basic email validation
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, value):
-                return False, f"{label}: Invalid email format"
-        
-        elif field_type == "phone":
-            if not isinstance(value, str):
-                return False, f"{label}: Must be text"
-            # Universal phone validation - accept international formats
-            # Allow: +1234567890, (123) 456-7890, 123-456-7890, 123.456.7890, etc.
-            # Length: 10-15 digits (international standard)
-            phone_digits = re.sub(r'[^0-9]', '', value)  # Extract only digits
-            if len(phone_digits) < 10 or len(phone_digits) > 15:
-                return False, f"{label}: Invalid phone format (expected 10-15 digits)"
-            # Optional: Validate starts with + for international format
-            if value.startswith('+') and len(phone_digits) < 11:
-                return False, f"{label}: International phone must have country code"
-        
-        elif field_type == "select":
-            if not isinstance(value, str):
-                return False, f"{label}: Must be text"
-        
+        error = self._compile_type_check(field_key, field_def)(value)
+        if error:
+            return False, error
         return True, ""
     
     def get_required_documents(self, answers: Dict[str, Any]) -> List[Dict[str, str]]:
@@ -403,21 +547,16 @@ class T1ValidationEngine:
         """
         required_docs = []
         
-        # Get document requirements from structure
-        doc_requirements = self.structure.get("documentRequirements", [])
-        
-        for doc_req in doc_requirements:
-            label = doc_req.get("label")
-            shown_when = doc_req.get("shownWhen")
-            
-            if not shown_when:
+        # Document requirements from structure (precompiled conditions)
+        for label, shown_when, predicate in self.document_plan:
+            if predicate is None:
                 # Always required
                 required_docs.append({
                     "label": label,
                     "question_key": None,
                     "shownWhen": None
                 })
-            elif self._evaluate_condition(shown_when, answers):
+            elif predicate(answers):
                 # Conditionally required
                 required_docs.append({
                     "label": label,
@@ -426,20 +565,15 @@ class T1ValidationEngine:
                 })
         
         # Also check questions with documentsRequired
-        for step in self.structure.get("steps", []):
-            if step.get("id") == "questionnaire":
-                for question in step.get("questions", []):
-                    question_key = question.get("key")
-                    docs_required = question.get("documentsRequired", [])
-                    
-                    # Check if question is answered "yes"
-                    if answers.get(question_key) == True:
-                        for doc_label in docs_required:
-                            required_docs.append({
-                                "label": doc_label,
-                                "question_key": question_key,
-                                "shownWhen": {"key": question_key, "operator": "equals", "value": True}
-                            })
+        for question_key, docs_required in self.question_documents:
+            # Check if question is answered "yes"
+            if answers.get(question_key) == True:
+                for doc_label in docs_required:
+                    required_docs.append({
+                        "label": doc_label,
+                        "question_key": question_key,
+                        "shownWhen": {"key": question_key, "operator": "equals", "value": True}
+                    })
         
         return required_docs
     
@@ -457,16 +591,98 @@ class T1ValidationEngine:
         Returns:
             Completion percentage (0-100)
         """
-        required_fields = self._get_required_fields(answers)
-        if not required_fields:
+        return self.completion_percentage_from_masks(self.compute_completion_masks(answers))
+    
+    # ------------------------------------------------------------------
+    # INCREMENTAL COMPLETION
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _is_filled(answers: Dict[str, Any], field_key: str) -> bool:
+        return field_key in answers and answers[field_key] not in [None, ""]
+    
+    def _field_bits(self, field_key: str, answers: Dict[str, Any]) -> CompletionMasks:
+        """(visible, filled) bits of one required field"""
+        bit = self.required_bits[field_key]
+        visible = all(predicate(answers) for predicate in self.visibility_predicates[field_key])
+        return (bit if visible else 0), (bit if self._is_filled(answers, field_key) else 0)
+    
+    def compute_completion_masks(self, answers: Dict[str, Any]) -> CompletionMasks:
+        """Full (visible, filled) bitsets over every required field"""
+        visible_mask = filled_mask = 0
+        for field_key in self.required_keys:
+            visible, filled = self._field_bits(field_key, answers)
+            visible_mask |= visible
+            filled_mask |= filled
+        return visible_mask, filled_mask
+    
+    def completion_condition_keys(self, changed_keys) -> Set[str]:
+        """
+        Answer keys update_completion_masks() needs besides changed_keys:
+        the watched keys of every affected required field.
+        """
+        needed = set()
+        for field_key in self.affected_required_fields(changed_keys):
+            needed.update(self.required_condition_keys[field_key])
+        return needed.difference(changed_keys)
+    
+    def update_completion_masks(
+        self,
+        masks: CompletionMasks,
+        answers: Dict[str, Any],
+        changed_keys
+    ) -> CompletionMasks:
+        """
+        Delta update of the completion bitsets after a save.
+        
+        Only required fields affected by changed_keys are re-evaluated, in
+        O(changed + dependents). answers must hold the new values of
+        changed_keys and of completion_condition_keys(changed_keys).
+        """
+        visible_mask, filled_mask = masks
+        changed = set(changed_keys)
+        
+        for field_key in self.affected_required_fields(changed):
+            bit = self.required_bits[field_key]
+            visible, filled = self._field_bits(field_key, answers)
+            visible_mask = (visible_mask & ~bit) | visible
+            if field_key in changed:
+                filled_mask = (filled_mask & ~bit) | filled
+        
+        return visible_mask, filled_mask
+    
+    @staticmethod
+    def completion_percentage_from_masks(masks: CompletionMasks) -> int:
+        """Percentage of visible required fields that are filled"""
+        visible_mask, filled_mask = masks
+        visible_count = bin(visible_mask).count("1")
+        if not visible_count:
             return 0
         
-        completed_fields = sum(
-            1 for field_key in required_fields
-            if field_key in answers and answers[field_key] not in [None, ""]
-        )
+        completed_count = bin(visible_mask & filled_mask).count("1")
+        return int((completed_count / visible_count) * 100)
+    
+    def serialize_completion_masks(self, masks: CompletionMasks) -> str:
+        """Encode bitsets for T1Form.completion_state"""
+        visible_mask, filled_mask = masks
+        return f"{self.completion_plan_id}:{visible_mask:x}:{filled_mask:x}"
+    
+    def parse_completion_masks(self, state: Optional[str]) -> Optional[CompletionMasks]:
+        """
+        Decode T1Form.completion_state.
+        Returns None when absent or built for a different structure (the
+        caller must then recompute with compute_completion_masks()).
+        """
+        if not state:
+            return None
         
-        return int((completed_fields / len(required_fields)) * 100)
+        try:
+            plan_id, visible_hex, filled_hex = state.split(":")
+            if plan_id != self.completion_plan_id:
+                return None
+            return int(visible_hex, 16), int(filled_hex, 16)
+        except ValueError:
+            return None
 
 
 # Global instance (initialized at application startup)
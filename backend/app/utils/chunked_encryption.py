@@ -0,0 +1,201 @@
+"""
+Chunked authenticated file encryption for document storage.
+
+Encrypted file layout ("TXEC" v1):
+
+    header  = MAGIC (4) | version (1) | chunk_size (4, BE) | nonce_prefix (7)
+    chunk_i = AES-256-GCM(plaintext[i*chunk_size:(i+1)*chunk_size]) | tag (16)
+
+Every chunk except the last holds exactly chunk_size plaintext bytes. Each
+chunk nonce is nonce_prefix | counter (4, BE) | last flag (1), and the header
+is bound to every chunk as associated data, so reordering, truncating or
+splicing chunks fails authentication.
+
+Because chunks have a fixed size, a plaintext byte range maps directly to a
+contiguous run of chunks on disk: downloads decrypt only what they send and
+never hold more than one chunk in memory.
+"""
+
+import os
+import struct
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+
+MAGIC = b"TXEC"
+VERSION = 1
+NONCE_PREFIX_SIZE = 7
+TAG_SIZE = 16
+HEADER_FORMAT = ">4sBI7s"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+DEFAULT_CHUNK_SIZE = int(os.getenv("FILE_ENCRYPTION_CHUNK_SIZE", 64 * 1024))
+
+
+class ChunkedEncryptionError(Exception):
+    """Raised when an encrypted file is malformed or fails authentication"""
+
+
+class PlaintextTooLargeError(ChunkedEncryptionError):
+    """Raised when the source stream exceeds the allowed plaintext size"""
+
+
+def get_file_encryption_key() -> bytes:
+    """Return the 32-byte AES-256 key used for document files"""
+    key_str = os.getenv("ENCRYPTION_KEY") or os.getenv("FILE_ENCRYPTION_KEY")
+    if not key_str:
+        key_str = "12345678901234567890123456789012"  # 32 chars (development only)
+    key = key_str.encode()[:32]
+    if len(key) != 32:
+        key = key.ljust(32, b'0')
+    return key
+
+
+def _nonce(prefix: bytes, index: int, last: bool) -> bytes:
+    return prefix + struct.pack(">IB", index, 1 if last else 0)
+
+
+def _read_exact(src: BinaryIO, size: int) -> bytes:
+    """Read up to size bytes, looping over short reads"""
+    parts = []
+    remaining = size
+    while remaining > 0:
+        data = src.read(remaining)
+        if not data:
+            break
+        parts.append(data)
+        remaining -= len(data)
+    return b"".join(parts)
+
+
+# ============================================================================
+# ENCRYPTION
+# ============================================================================
+
+def encrypt_stream(
+    src: BinaryIO,
+    dst: BinaryIO,
+    key: bytes,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_size: Optional[int] = None
+) -> int:
+    """
+    Encrypt src into dst chunk by chunk.
+
+    Reads one chunk ahead so the final chunk can be flagged; memory use is
+    bounded by two chunks regardless of the input size.
+
+    Returns:
+        Number of plaintext bytes encrypted
+
+    Raises:
+        PlaintextTooLargeError: src holds more than max_size bytes
+    """
+    aesgcm = AESGCM(key)
+    prefix = os.urandom(NONCE_PREFIX_SIZE)
+    header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, chunk_size, prefix)
+    dst.write(header)
+
+    total = 0
+    index = 0
+    current = _read_exact(src, chunk_size)
+    while True:
+        total += len(current)
+        if max_size is not None and total > max_size:
+            raise PlaintextTooLargeError(f"Plaintext exceeds {max_size} bytes")
+
+        following = _read_exact(src, chunk_size) if len(current) == chunk_size else b""
+        last = not following
+        dst.write(aesgcm.encrypt(_nonce(prefix, index, last), current, header))
+
+        if last:
+            return total
+        current = following
+        index += 1
+
+
+# ============================================================================
+# DECRYPTION
+# ============================================================================
+
+def is_chunked_file(path: str) -> bool:
+    """True if the file at path uses the chunked format (vs legacy AES-CBC)"""
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def read_header(f: BinaryIO) -> Tuple[bytes, int, bytes]:
+    """Read and validate the header, returning (header bytes, chunk_size, nonce_prefix)"""
+    header = f.read(HEADER_SIZE)
+    if len(header) != HEADER_SIZE:
+        raise ChunkedEncryptionError("Truncated header")
+
+    magic, version, chunk_size, prefix = struct.unpack(HEADER_FORMAT, header)
+    if magic != MAGIC or version != VERSION or chunk_size <= 0:
+        raise ChunkedEncryptionError("Unsupported encrypted file format")
+    return header, chunk_size, prefix
+
+
+def _layout(encrypted_size: int, chunk_size: int) -> Tuple[int, int]:
+    """Return (chunk count, plaintext size) for an encrypted file size"""
+    body = encrypted_size - HEADER_SIZE
+    stride = chunk_size + TAG_SIZE
+    full, remainder = divmod(body, stride)
+    if remainder and remainder < TAG_SIZE:
+        raise ChunkedEncryptionError("Truncated chunk")
+
+    chunk_count = full + (1 if remainder else 0)
+    if chunk_count == 0:
+        raise ChunkedEncryptionError("Missing final chunk")
+
+    plaintext_size = full * chunk_size + (remainder - TAG_SIZE if remainder else 0)
+    return chunk_count, plaintext_size
+
+
+def plaintext_size(path: str) -> int:
+    """Plaintext size of a chunked file, computed from its header and length"""
+    with open(path, 'rb') as f:
+        _, chunk_size, _ = read_header(f)
+        return _layout(os.fstat(f.fileno()).st_size, chunk_size)[1]
+
+
+def decrypt_range(
+    path: str,
+    key: bytes,
+    start: int = 0,
+    end: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Yield the decrypted plaintext bytes [start, end] (inclusive) of a file.
+
+    Only the chunks overlapping the range are read and authenticated.
+    """
+    aesgcm = AESGCM(key)
+    with open(path, 'rb') as f:
+        header, chunk_size, prefix = read_header(f)
+        chunk_count, size = _layout(os.fstat(f.fileno()).st_size, chunk_size)
+
+        if end is None or end >= size:
+            end = size - 1
+        if start > end:
+            return
+
+        stride = chunk_size + TAG_SIZE
+        first, last_index = start // chunk_size, end // chunk_size
+        f.seek(HEADER_SIZE + first * stride)
+
+        for index in range(first, last_index + 1):
+            ciphertext = f.read(stride)
+            try:
+                chunk = aesgcm.decrypt(
+                    _nonce(prefix, index, index == chunk_count - 1),
+                    ciphertext,
+                    header
+                )
+            except InvalidTag:
+                raise ChunkedEncryptionError(f"Chunk {index} failed authentication")
+
+            offset = index * chunk_size
+            yield chunk[max(start - offset, 0):end - offset + 1]
@@ -7,6 +7,8 @@ from pathlib import Path
 from cryptography.fernet import Fernet
 from dotenv import load_dotenv
 
+from backend.app.core.crypto_executor import crypto_executor
+
 # Load .env from project root
 project_root = Path(__file__).parent.parent.parent.parent
 env_path = project_root / ".env"
@@ -71,6 +73,23 @@ def decrypt_file_content(encrypted_content: bytes) -> bytes:
         raise ValueError(f"Decryption failed: {e}")
 
 
+async def encrypt_file_content_async(file_content: bytes) -> bytes:
+    """
+    Encrypt file content on the crypto executor.
+    
+    Use from async handlers: Fernet over a multi-MB file would otherwise
+    block the event loop.
+    """
+    return await crypto_executor.run(encrypt_file_content, file_content)
+
+
+async def decrypt_file_content_async(encrypted_content: bytes) -> bytes:
+    """
+    Decrypt file content on the crypto executor.
+    """
+    return await crypto_executor.run(decrypt_file_content, encrypted_content)
+
+
 def encrypt_file(file_path: str) -> bytes:
     """
     Read and encrypt a file from disk.
@@ -1,10 +1,33 @@
-"""AWS S3 Storage Integration for Document Management."""
+"""
+AWS S3 Storage Integration for Document Management.
+
+The boto3 client is blocking, so every operation has an ``*_async`` twin
+that runs it on a dedicated I/O thread pool (sized with the client's
+connection pool) instead of the event loop:
+
+- uploads and downloads go through the boto3 transfer manager, which
+  switches to parallel multipart upload / ranged GETs above
+  S3_MULTIPART_THRESHOLD_MB
+- stream_file() yields an object in chunks without buffering it
+- delete_files() removes keys with batched delete_objects calls
+
+S3_ENDPOINT_URL points the client at an S3-compatible stand-in (MinIO,
+moto server) for local development and tests.
+"""
+import io
 import os
+import shutil
+import asyncio
 import logging
-from typing import Optional, BinaryIO
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Optional, BinaryIO, Union
 from pathlib import Path
 
 import boto3
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 from dotenv import load_dotenv
 
@@ -15,6 +38,19 @@ load_dotenv(dotenv_path=env_path)
 
 logger = logging.getLogger(__name__)
 
+MB = 1024 * 1024
+
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", 50))
+S3_IO_WORKERS = int(os.getenv("S3_IO_WORKERS", S3_MAX_POOL_CONNECTIONS))
+S3_MULTIPART_THRESHOLD = int(os.getenv("S3_MULTIPART_THRESHOLD_MB", 8)) * MB
+S3_MULTIPART_CHUNKSIZE = int(os.getenv("S3_MULTIPART_CHUNKSIZE_MB", 8)) * MB
+S3_TRANSFER_CONCURRENCY = int(os.getenv("S3_TRANSFER_CONCURRENCY", 10))
+S3_STREAM_CHUNK_SIZE = 64 * 1024
+S3_DELETE_BATCH_SIZE = 1000  # delete_objects limit per request
+
+NOT_FOUND_CODES = {'404', 'NoSuchKey', 'NotFound'}
+
 
 class S3StorageService:
     """Service for handling file storage on AWS S3."""
@@ -25,16 +61,33 @@ class S3StorageService:
         self.bucket_name = os.getenv("S3_BUCKET_NAME", "taxease-prod-documents")
         self.region = os.getenv("AWS_REGION", "ca-central-1")
         
+        # Blocking storage calls made from async handlers run here
+        self._executor = ThreadPoolExecutor(max_workers=S3_IO_WORKERS, thread_name_prefix="s3-io")
+        
         if self.use_s3:
             try:
                 # Initialize S3 client
                 # If running on EC2 with IAM role, credentials are automatic
                 # Otherwise, uses AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY from env
+                # The client is thread-safe; its connection pool is shared by
+                # every I/O worker and multipart transfer thread
                 self.s3_client = boto3.client(
                     's3',
                     region_name=self.region,
+                    endpoint_url=S3_ENDPOINT_URL,
                     aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-                    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY")
+                    aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+                    config=Config(
+                        max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                        retries={'max_attempts': 5, 'mode': 'adaptive'},
+                        tcp_keepalive=True
+                    )
+                )
+                self.transfer_config = TransferConfig(
+                    multipart_threshold=S3_MULTIPART_THRESHOLD,
+                    multipart_chunksize=S3_MULTIPART_CHUNKSIZE,
+                    max_concurrency=S3_TRANSFER_CONCURRENCY,
+                    use_threads=True
                 )
                 
                 # Verify bucket exists
@@ -63,7 +116,7 @@ class S3StorageService:
     
     def upload_file(
         self, 
-        file_content: bytes, 
+        file_content: Union[bytes, BinaryIO], 
         file_key: str,
         content_type: Optional[str] = None,
         metadata: Optional[dict] = None
@@ -72,7 +125,7 @@ class S3StorageService:
         Upload a file to S3 or local storage.
         
         Args:
-            file_content: Binary content of the file
+            file_content: Binary content of the file, or a readable binary file object
             file_key: Unique key/path for the file (e.g., "documents/uuid.pdf.enc")
             content_type: MIME type of the file
             metadata: Additional metadata to store with the file
@@ -87,14 +140,14 @@ class S3StorageService:
     
     def _upload_to_s3(
         self, 
-        file_content: bytes, 
+        file_content: Union[bytes, BinaryIO], 
         file_key: str,
         content_type: Optional[str] = None,
         metadata: Optional[dict] = None
     ) -> str:
-        """Upload file to S3 bucket."""
+        """Upload file to S3 bucket (multipart above the transfer threshold)."""
         try:
-            extra_args = {}
+            extra_args = {'ServerSideEncryption': 'AES256'}  # Server-side encryption
             
             if content_type:
                 extra_args['ContentType'] = content_type
@@ -102,13 +155,16 @@ class S3StorageService:
             if metadata:
                 extra_args['Metadata'] = {k: str(v) for k, v in metadata.items()}
             
+            if isinstance(file_content, (bytes, bytearray, memoryview)):
+                file_content = io.BytesIO(file_content)
+            
             # Upload encrypted file
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=file_key,
-                Body=file_content,
-                ServerSideEncryption='AES256',  # Server-side encryption
-                **extra_args
+            self.s3_client.upload_fileobj(
+                file_content,
+                self.bucket_name,
+                file_key,
+                ExtraArgs=extra_args,
+                Config=self.transfer_config
             )
             
             logger.info(f"File uploaded to S3: s3://{self.bucket_name}/{file_key}")
@@ -116,17 +172,20 @@ class S3StorageService:
             
         except NoCredentialsError:
             raise Exception("AWS credentials not found")
-        except ClientError as e:
+        except (ClientError, S3UploadFailedError) as e:
             logger.error(f"S3 upload failed: {e}")
             raise Exception(f"Failed to upload file to S3: {e}")
     
-    def _upload_to_local(self, file_content: bytes, file_key: str) -> str:
+    def _upload_to_local(self, file_content: Union[bytes, BinaryIO], file_key: str) -> str:
         """Upload file to local storage."""
         file_path = os.path.join(self.local_storage_path, file_key)
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         
         with open(file_path, 'wb') as f:
-            f.write(file_content)
+            if isinstance(file_content, (bytes, bytearray, memoryview)):
+                f.write(file_content)
+            else:
+                shutil.copyfileobj(file_content, f, S3_STREAM_CHUNK_SIZE)
         
         logger.info(f"File uploaded to local storage: {file_path}")
         return file_path
@@ -147,27 +206,51 @@ class S3StorageService:
             return self._download_from_local(file_key)
     
     def _download_from_s3(self, file_key: str) -> bytes:
-        """Download file from S3 bucket."""
+        """Download file from S3 bucket (parallel ranged GETs for large objects)."""
+        buffer = io.BytesIO()
+        self._download_fileobj_from_s3(file_key, buffer)
+        return buffer.getvalue()
+    
+    def _download_fileobj_from_s3(self, file_key: str, fileobj: BinaryIO) -> None:
         try:
-            response = self.s3_client.get_object(
-                Bucket=self.bucket_name,
-                Key=file_key
+            self.s3_client.download_fileobj(
+                self.bucket_name,
+                file_key,
+                fileobj,
+                Config=self.transfer_config
             )
-            content = response['Body'].read()
             logger.info(f"File downloaded from S3: s3://{self.bucket_name}/{file_key}")
-            return content
             
         except ClientError as e:
             error_code = e.response.get('Error', {}).get('Code', '')
-            if error_code == 'NoSuchKey':
+            if error_code in NOT_FOUND_CODES:
                 raise FileNotFoundError(f"File not found in S3: {file_key}")
             else:
                 logger.error(f"S3 download failed: {e}")
                 raise Exception(f"Failed to download file from S3: {e}")
     
+    def download_to_file(self, file_key: str, fileobj: BinaryIO) -> None:
+        """
+        Download a file into a writable binary file object.
+        
+        Unlike download_file() the content is never held in memory whole.
+        """
+        if self.use_s3:
+            self._download_fileobj_from_s3(file_key, fileobj)
+            return
+        
+        file_path = self._local_path(file_key)
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        with open(file_path, 'rb') as f:
+            shutil.copyfileobj(f, fileobj)
+    
+    def _local_path(self, file_key: str) -> str:
+        return file_key if os.path.isabs(file_key) else os.path.join(self.local_storage_path, file_key)
+    
     def _download_from_local(self, file_key: str) -> bytes:
         """Download file from local storage."""
-        file_path = file_key if os.path.isabs(file_key) else os.path.join(self.local_storage_path, file_key)
+        file_path = self._local_path(file_key)
         
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
@@ -209,7 +292,7 @@ class S3StorageService:
     
     def _delete_from_local(self, file_key: str) -> bool:
         """Delete file from local storage."""
-        file_path = file_key if os.path.isabs(file_key) else os.path.join(self.local_storage_path, file_key)
+        file_path = self._local_path(file_key)
         
         try:
             if os.path.exists(file_path):
@@ -248,8 +331,64 @@ class S3StorageService:
     
     def _file_exists_locally(self, file_key: str) -> bool:
         """Check if file exists in local storage."""
-        file_path = file_key if os.path.isabs(file_key) else os.path.join(self.local_storage_path, file_key)
-        return os.path.exists(file_path)
+        return os.path.exists(self._local_path(file_key))
+    
+    def delete_files(self, file_keys: List[str]) -> List[str]:
+        """
+        Delete several files from S3 or local storage.
+        
+        On S3 keys are removed with one delete_objects request per
+        S3_DELETE_BATCH_SIZE keys instead of one request each.
+        
+        Args:
+            file_keys: The keys/paths of the files to delete
+        
+        Returns:
+            Keys that could not be deleted
+        """
+        if not self.use_s3:
+            return [key for key in file_keys if not self._delete_from_local(key)]
+        
+        failed = []
+        for i in range(0, len(file_keys), S3_DELETE_BATCH_SIZE):
+            batch = file_keys[i:i + S3_DELETE_BATCH_SIZE]
+            try:
+                response = self.s3_client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+                )
+            except ClientError as e:
+                logger.error(f"S3 batch deletion failed: {e}")
+                failed.extend(batch)
+                continue
+            for error in response.get('Errors', []):
+                logger.error(f"S3 deletion failed: {error.get('Key')}: {error.get('Message')}")
+                failed.append(error.get('Key'))
+        
+        logger.info(f"Deleted {len(file_keys) - len(failed)} of {len(file_keys)} files from storage")
+        return failed
+    
+    def open_stream(self, file_key: str) -> BinaryIO:
+        """
+        Open a file for chunked reading (caller closes it).
+        
+        On S3 this is the get_object body, so only what is read is fetched.
+        """
+        if not self.use_s3:
+            file_path = self._local_path(file_key)
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"File not found: {file_path}")
+            return open(file_path, 'rb')
+        
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=file_key)
+            return response['Body']
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', '')
+            if error_code in NOT_FOUND_CODES:
+                raise FileNotFoundError(f"File not found in S3: {file_key}")
+            logger.error(f"S3 download failed: {e}")
+            raise Exception(f"Failed to download file from S3: {e}")
     
     def get_file_url(self, file_key: str, expires_in: int = 3600) -> str:
         """
@@ -278,6 +417,135 @@ class S3StorageService:
         except ClientError as e:
             logger.error(f"Failed to generate presigned URL: {e}")
             raise Exception(f"Failed to generate file URL: {e}")
+    
+    def get_upload_url(
+        self,
+        file_key: str,
+        max_size: int,
+        content_type: Optional[str] = None,
+        expires_in: int = 900
+    ) -> dict:
+        """
+        Generate a presigned POST for uploading straight to S3 (S3 only).
+        
+        The policy pins the key, caps the body at max_size bytes and requires
+        server-side encryption, so the client cannot widen what it uploads.
+        
+        Args:
+            file_key: The key the object must be stored under
+            max_size: Largest accepted object in bytes
+            content_type: MIME type the upload must declare, if any
+            expires_in: URL expiration time in seconds (default: 15 minutes)
+        
+        Returns:
+            {"url": ..., "fields": {...}} to send as a multipart/form-data POST
+        """
+        if not self.use_s3:
+            raise NotImplementedError("Presigned uploads are only available for S3 storage")
+        
+        fields = {'x-amz-server-side-encryption': 'AES256'}
+        conditions = [
+            {'x-amz-server-side-encryption': 'AES256'},
+            ['content-length-range', 1, max_size],
+        ]
+        if content_type:
+            fields['Content-Type'] = content_type
+            conditions.append({'Content-Type': content_type})
+        
+        try:
+            return self.s3_client.generate_presigned_post(
+                Bucket=self.bucket_name,
+                Key=file_key,
+                Fields=fields,
+                Conditions=conditions,
+                ExpiresIn=expires_in
+            )
+        except ClientError as e:
+            logger.error(f"Failed to generate presigned upload: {e}")
+            raise Exception(f"Failed to generate upload URL: {e}")
+    
+    def get_file_size(self, file_key: str) -> Optional[int]:
+        """
+        Size in bytes of a stored file, or None if it does not exist.
+        """
+        if not self.use_s3:
+            file_path = self._local_path(file_key)
+            return os.path.getsize(file_path) if os.path.exists(file_path) else None
+        
+        try:
+            response = self.s3_client.head_object(Bucket=self.bucket_name, Key=file_key)
+            return response['ContentLength']
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', '')
+            if error_code in NOT_FOUND_CODES:
+                return None
+            raise Exception(f"Failed to stat file in S3: {e}")
+    
+    # ================================
+    # ASYNC API (I/O thread pool)
+    # ================================
+    
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+    
+    async def upload_file_async(
+        self,
+        file_content: Union[bytes, BinaryIO],
+        file_key: str,
+        content_type: Optional[str] = None,
+        metadata: Optional[dict] = None
+    ) -> str:
+        """upload_file() on the I/O thread pool."""
+        return await self._run(self.upload_file, file_content, file_key, content_type, metadata)
+    
+    async def download_file_async(self, file_key: str) -> bytes:
+        """download_file() on the I/O thread pool."""
+        return await self._run(self.download_file, file_key)
+    
+    async def download_to_file_async(self, file_key: str, fileobj: BinaryIO) -> None:
+        """download_to_file() on the I/O thread pool."""
+        await self._run(self.download_to_file, file_key, fileobj)
+    
+    async def delete_file_async(self, file_key: str) -> bool:
+        """delete_file() on the I/O thread pool."""
+        return await self._run(self.delete_file, file_key)
+    
+    async def delete_files_async(self, file_keys: List[str]) -> List[str]:
+        """delete_files() on the I/O thread pool."""
+        return await self._run(self.delete_files, file_keys)
+    
+    async def file_exists_async(self, file_key: str) -> bool:
+        """file_exists() on the I/O thread pool."""
+        return await self._run(self.file_exists, file_key)
+    
+    async def get_file_size_async(self, file_key: str) -> Optional[int]:
+        """get_file_size() on the I/O thread pool."""
+        return await self._run(self.get_file_size, file_key)
+    
+    async def stream_file(self, file_key: str, chunk_size: int = S3_STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """
+        Yield a file in chunks of at most chunk_size bytes.
+        
+        Raises FileNotFoundError (before the first chunk) if it does not exist.
+        """
+        body = await self._run(self.open_stream, file_key)
+        try:
+            while True:
+                chunk = await self._run(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+    
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Stop the I/O thread pool. In-flight calls still finish on their
+        threads; wait=True blocks until they have, so never pass it from
+        the event loop.
+        """
+        self._executor.shutdown(wait=wait)
 
 
 # Singleton instance
@@ -289,3 +557,14 @@ def get_storage_service() -> S3StorageService:
     if _storage_service is None:
         _storage_service = S3StorageService()
     return _storage_service
+
+
+def shutdown_storage_service() -> None:
+    """
+    Stop the singleton's I/O thread pool, if it was ever created, without
+    blocking; the next get_storage_service() builds a fresh instance.
+    """
+    global _storage_service
+    if _storage_service is not None:
+        _storage_service.shutdown()
+        _storage_service = None
@@ -0,0 +1,93 @@
+"""
+T1 Validation Engine Micro-benchmark
+====================================
+Times the compiled validation plan against the real T1 structure file
+(backend/T1Structure (2).json) for the operations on the autosave and
+submission paths.
+
+Usage:
+    python backend/benchmark_t1_validation.py [--iterations N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+from typing import Any, Dict
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.app.services.t1_validation_engine import T1ValidationEngine
+
+
+SAMPLE_VALUES = {
+    "text": "Sample text",
+    "number": 1250.5,
+    "boolean": True,
+    "date": "2024-03-15",
+    "email": "client@example.com",
+    "phone": "+1 416 555 0199",
+}
+
+
+def _sample_value(field_def: Dict[str, Any]) -> Any:
+    """A valid value for a field definition"""
+    if field_def.get("type") == "select" and field_def.get("options"):
+        return field_def["options"][0]
+    return SAMPLE_VALUES.get(field_def.get("type"), "value")
+
+
+def build_full_answers(engine: T1ValidationEngine) -> Dict[str, Any]:
+    """Answers that fill every field and satisfy every visibility condition"""
+    answers = {key: _sample_value(field_def) for key, field_def in engine.field_registry.items()}
+    for field_def in engine.field_registry.values():
+        for attribute in ("section_condition", "condition", "trigger", "subform_condition"):
+            condition = field_def.get(attribute)
+            if condition and condition.get("key"):
+                expected = condition.get("value")
+                answers[condition["key"]] = expected[0] if isinstance(expected, list) else expected
+    return answers
+
+
+def build_autosave(full_answers: Dict[str, Any], size: int, seed: int = 7) -> Dict[str, Any]:
+    """A typical mobile autosave payload: a few dozen changed fields"""
+    rng = random.Random(seed)
+    keys = rng.sample(sorted(full_answers), min(size, len(full_answers)))
+    return {key: full_answers[key] for key in keys}
+
+
+def run(iterations: int) -> None:
+    construct = timeit.timeit(T1ValidationEngine, number=max(iterations // 100, 5))
+    construct_ms = construct / max(iterations // 100, 5) * 1000
+
+    engine = T1ValidationEngine()
+    full = build_full_answers(engine)
+    autosave = build_autosave(full, 30)
+    changed_keys = list(autosave)
+
+    cases = [
+        ("validate_draft_save (30 fields)", lambda: engine.validate_draft_save(autosave)),
+        ("affected_required_fields (30 keys)", lambda: engine.affected_required_fields(changed_keys)),
+        ("calculate_completion_percentage", lambda: engine.calculate_completion_percentage(full)),
+        ("validate_submission (all fields)", lambda: engine.validate_submission(full)),
+        ("get_required_documents", lambda: engine.get_required_documents(full)),
+    ]
+
+    print(f"Structure: {engine.structure_path}")
+    print(f"Fields: {len(engine.field_registry)}  required: {len(engine.required_keys)}  "
+          f"watched keys: {len(engine.required_dependents)}")
+    print(f"Engine construction + plan compilation: {construct_ms:.3f} ms")
+    print()
+    print(f"{'operation':<40} {'per call (us)':>14}")
+    print("-" * 56)
+    for name, fn in cases:
+        seconds = min(timeit.repeat(fn, number=iterations, repeat=5))
+        print(f"{name:<40} {seconds / iterations * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000)
+    run(parser.parse_args().iterations)
@@ -49,7 +49,9 @@ CHECK (status IN (
     'complete',
     'missing',
     'approved',
-    'reupload_requested'
+    'reupload_requested',
+    'processing',
+    'rejected'
 ));
 
 -- ============================================================================
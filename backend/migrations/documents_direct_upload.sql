@@ -0,0 +1,48 @@
+-- ==============================================
+-- DOCUMENTS: DIRECT-TO-STORAGE UPLOADS
+-- ==============================================
+-- Presigned uploads are recorded with status 'processing' and file_path set
+-- to the staged S3 key until the processing worker validates and encrypts
+-- them ('pending') or rejects them ('rejected').
+--
+-- Hardened databases (database_constraints.sql) restrict documents.status;
+-- the constraint is recreated with the two new statuses.
+
+ALTER TABLE documents DROP CONSTRAINT IF EXISTS check_document_status_valid;
+ALTER TABLE documents
+ADD CONSTRAINT check_document_status_valid
+CHECK (status IN (
+    'pending',
+    'complete',
+    'missing',
+    'approved',
+    'reupload_requested',
+    'processing',
+    'rejected'
+));
+
+-- Each claim counts an attempt and pushes next_attempt_at out with
+-- exponential backoff, so a failing upload does not block newer ones and is
+-- rejected after DOCUMENT_PROCESSING_MAX_ATTEMPTS.
+
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS processing_attempts INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMP WITH TIME ZONE;
+
+UPDATE documents SET next_attempt_at = created_at
+WHERE status = 'processing' AND next_attempt_at IS NULL;
+
+-- The worker polls for the earliest due 'processing' row; this partial index
+-- keeps that lookup independent of the size of the documents table.
+
+DROP INDEX IF EXISTS idx_document_processing_queue;
+CREATE INDEX IF NOT EXISTS idx_document_processing_due
+    ON documents (next_attempt_at)
+    WHERE status = 'processing';
+
+-- At most one processing document per staged object: concurrent finalize
+-- calls for the same upload_id cannot both insert (the loser gets a 409).
+
+DROP INDEX IF EXISTS idx_document_file_path;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_document_staged_upload
+    ON documents (file_path)
+    WHERE status = 'processing';
@@ -0,0 +1,18 @@
+-- ==============================================
+-- T1 ANSWERS: UNIQUE (t1_form_id, field_key)
+-- ==============================================
+-- Draft saves upsert every submitted field in a single
+--   INSERT ... ON CONFLICT (t1_form_id, field_key) DO UPDATE
+-- which needs a unique index on these columns. t1_tables_v2.sql already
+-- declares UNIQUE(t1_form_id, field_key); databases created from the ORM
+-- models (create_all) did not get it. Run this on those databases.
+
+-- Keep only the most recently updated row per (t1_form_id, field_key)
+DELETE FROM t1_answers a
+USING t1_answers b
+WHERE a.t1_form_id = b.t1_form_id
+  AND a.field_key = b.field_key
+  AND (a.updated_at, a.id) < (b.updated_at, b.id);
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_t1_answers_form_field
+    ON t1_answers(t1_form_id, field_key);
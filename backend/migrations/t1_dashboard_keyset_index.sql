@@ -0,0 +1,10 @@
+-- ==============================================
+-- T1 ADMIN DASHBOARD KEYSET PAGINATION
+-- ==============================================
+-- GET /api/v1/admin/dashboard/t1-filings pages with
+--   ORDER BY created_at DESC, id DESC
+--   WHERE (created_at, id) < (:cursor_created_at, :cursor_id)
+-- This index serves both the ordering and the cursor seek.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_t1_forms_created_at_id
+    ON t1_forms(created_at DESC, id DESC);
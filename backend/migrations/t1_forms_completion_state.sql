@@ -0,0 +1,10 @@
+-- ==============================================
+-- T1 FORMS: INCREMENTAL COMPLETION STATE
+-- ==============================================
+-- Per-form bitsets over the required T1 fields, maintained on every draft
+-- save so completion_percentage is updated from the changed answers only:
+--   "<plan id>:<visible mask hex>:<filled mask hex>"
+-- NULL (existing rows) or a stale plan id triggers a one-off full
+-- recomputation on the next save.
+
+ALTER TABLE t1_forms ADD COLUMN IF NOT EXISTS completion_state VARCHAR(100);
@@ -0,0 +1,203 @@
+"""
+Regression tests for the chunked document encryption format
+
+GUARANTEE: Files round-trip through encrypt_stream()/decrypt_range() for
+any size (empty, partial and exact multiples of the chunk size), a byte
+range decrypts to exactly that slice of the plaintext, and tampered,
+truncated or extended files are rejected instead of returning wrong data.
+
+Also covers DocumentService._iterate_on_executor() releasing the file when
+a download is cancelled while a chunk is being decrypted.
+
+Run: pytest backend/tests/test_chunked_encryption.py -v
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from backend.app.utils.chunked_encryption import (
+    HEADER_SIZE,
+    TAG_SIZE,
+    ChunkedEncryptionError,
+    PlaintextTooLargeError,
+    decrypt_range,
+    encrypt_stream,
+    is_chunked_file,
+    plaintext_size,
+)
+
+
+KEY = b"k" * 32
+CHUNK_SIZE = 64
+
+
+# ============================================================================
+# TEST FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def encrypt(tmp_path):
+    """Encrypt bytes into a file and return its path"""
+    def _encrypt(data: bytes, chunk_size: int = CHUNK_SIZE) -> str:
+        path = str(tmp_path / f"{len(data)}.enc")
+        src = tmp_path / "plain"
+        src.write_bytes(data)
+        with open(src, "rb") as f_in, open(path, "wb") as f_out:
+            assert encrypt_stream(f_in, f_out, KEY, chunk_size=chunk_size) == len(data)
+        return path
+    return _encrypt
+
+
+def _decrypt(path: str, start: int = 0, end=None) -> bytes:
+    return b"".join(decrypt_range(path, KEY, start, end))
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("size", [1, CHUNK_SIZE - 1, CHUNK_SIZE + 1, 5 * CHUNK_SIZE + 17])
+def test_round_trip(encrypt, size):
+    data = os.urandom(size)
+    path = encrypt(data)
+
+    assert is_chunked_file(path)
+    assert plaintext_size(path) == size
+    assert _decrypt(path) == data
+
+
+def test_empty_file(encrypt):
+    path = encrypt(b"")
+
+    assert plaintext_size(path) == 0
+    assert _decrypt(path) == b""
+
+
+def test_exact_multiple_of_chunk_size(encrypt):
+    data = os.urandom(3 * CHUNK_SIZE)
+    path = encrypt(data)
+
+    # No empty trailing chunk: the third full chunk is flagged last
+    assert os.path.getsize(path) == HEADER_SIZE + 3 * (CHUNK_SIZE + TAG_SIZE)
+    assert _decrypt(path) == data
+
+
+@pytest.mark.parametrize("start,end", [
+    (0, 0),
+    (10, 20),
+    (CHUNK_SIZE - 1, CHUNK_SIZE),
+    (CHUNK_SIZE, 2 * CHUNK_SIZE - 1),
+    (30, 4 * CHUNK_SIZE + 5),
+    (200, 10_000),
+])
+def test_byte_range(encrypt, start, end):
+    data = os.urandom(5 * CHUNK_SIZE + 17)
+    path = encrypt(data)
+
+    assert _decrypt(path, start, end) == data[start:end + 1]
+
+
+def test_max_size_enforced(tmp_path):
+    src = tmp_path / "plain"
+    src.write_bytes(b"x" * 100)
+    with open(src, "rb") as f_in, open(tmp_path / "out.enc", "wb") as f_out:
+        with pytest.raises(PlaintextTooLargeError):
+            encrypt_stream(f_in, f_out, KEY, chunk_size=CHUNK_SIZE, max_size=99)
+
+
+def test_tampered_chunk_rejected(encrypt):
+    path = encrypt(os.urandom(3 * CHUNK_SIZE))
+    with open(path, "r+b") as f:
+        f.seek(HEADER_SIZE + CHUNK_SIZE + TAG_SIZE + 5)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 1]))
+
+    with pytest.raises(ChunkedEncryptionError):
+        _decrypt(path)
+    # Ranges that do not touch the tampered chunk still decrypt
+    assert len(_decrypt(path, 0, CHUNK_SIZE - 1)) == CHUNK_SIZE
+
+
+def test_tampered_header_rejected(encrypt):
+    path = encrypt(os.urandom(CHUNK_SIZE))
+    with open(path, "r+b") as f:
+        f.seek(HEADER_SIZE - 1)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 1]))
+
+    with pytest.raises(ChunkedEncryptionError):
+        _decrypt(path)
+
+
+def test_truncated_at_chunk_boundary_rejected(encrypt):
+    path = encrypt(os.urandom(3 * CHUNK_SIZE))
+    with open(path, "r+b") as f:
+        f.truncate(HEADER_SIZE + 2 * (CHUNK_SIZE + TAG_SIZE))
+
+    # The new final chunk was not encrypted as the last one
+    with pytest.raises(ChunkedEncryptionError):
+        _decrypt(path)
+
+
+def test_truncated_mid_chunk_rejected(encrypt):
+    path = encrypt(os.urandom(3 * CHUNK_SIZE))
+    with open(path, "r+b") as f:
+        f.truncate(HEADER_SIZE + 2 * (CHUNK_SIZE + TAG_SIZE) + TAG_SIZE - 1)
+
+    with pytest.raises(ChunkedEncryptionError):
+        plaintext_size(path)
+
+
+def test_appended_chunk_rejected(encrypt):
+    path = encrypt(os.urandom(2 * CHUNK_SIZE))
+    with open(path, "rb") as f:
+        content = f.read()
+    with open(path, "ab") as f:
+        f.write(content[HEADER_SIZE:HEADER_SIZE + CHUNK_SIZE + TAG_SIZE])
+
+    with pytest.raises(ChunkedEncryptionError):
+        _decrypt(path)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_download_closes_iterator_after_pending_chunk():
+    from backend.app.services.document_service import DocumentService
+
+    entered, release = threading.Event(), threading.Event()
+    closed = []
+
+    def chunks():
+        try:
+            entered.set()
+            release.wait(5)
+            yield b"chunk"
+            yield b"never sent"
+        finally:
+            closed.append(True)
+
+    async def consume():
+        async for _ in DocumentService._iterate_on_executor(chunks()):
+            pass
+
+    task = asyncio.create_task(consume())
+    await asyncio.to_thread(entered.wait, 5)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert closed == []  # next() is still running in the worker thread
+
+    release.set()
+    for _ in range(100):
+        if closed:
+            break
+        await asyncio.sleep(0.01)
+    assert closed == [True]
@@ -0,0 +1,27 @@
+"""
+Regression tests for the crypto executor copies
+
+GUARANTEE: backend/app/core/crypto_executor.py and its client-api copy
+(services/client-api/shared/crypto_executor.py) differ only in their
+docstring and configuration lines, so a fix to one is not lost in the other.
+
+Run: pytest backend/tests/test_crypto_executor.py -v
+"""
+
+import os
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+BACKEND_COPY = os.path.join(ROOT, "backend", "app", "core", "crypto_executor.py")
+CLIENT_API_COPY = os.path.join(ROOT, "services", "client-api", "shared", "crypto_executor.py")
+
+
+def _implementation(path: str) -> str:
+    """Source from the first definition on (after imports and configuration)"""
+    with open(path) as f:
+        source = f.read()
+    return source[source.index("\ndef _timed_call"):]
+
+
+def test_client_api_copy_matches_backend():
+    assert _implementation(CLIENT_API_COPY) == _implementation(BACKEND_COPY)
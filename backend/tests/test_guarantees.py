@@ -515,7 +515,8 @@ def test_state_machines_complete():
 # RATE LIMITING
 # ============================================================================
 
-def test_otp_rate_limit_enforced():
+@pytest.mark.asyncio
+async def test_otp_rate_limit_enforced():
     """
     GUARANTEE: OTP requests are rate-limited.
     
@@ -528,12 +529,12 @@ def test_otp_rate_limit_enforced():
     test_ip = "192.168.1.1"
     
     # Reset counter
-    limiter.reset_counter("otp_request_email", test_email)
-    limiter.reset_counter("otp_global_ip", test_ip)
+    await limiter.reset_counter("otp_request_email", test_email)
+    await limiter.reset_counter("otp_global_ip", test_ip)
     
     # First 3 requests should succeed
     for i in range(3):
-        allowed, _ = limiter.check_rate_limit(
+        allowed, _ = await limiter.check_rate_limit(
             key="otp_request_email",
             limit=3,
             window=600,
@@ -542,7 +543,7 @@ def test_otp_rate_limit_enforced():
         assert allowed, f"Request {i+1} should be allowed"
     
     # 4th request should be blocked
-    allowed, wait = limiter.check_rate_limit(
+    allowed, wait = await limiter.check_rate_limit(
         key="otp_request_email",
         limit=3,
         window=600,
@@ -553,7 +554,8 @@ def test_otp_rate_limit_enforced():
     assert wait is not None and wait > 0
 
 
-def test_login_rate_limit_locks_account():
+@pytest.mark.asyncio
+async def test_login_rate_limit_locks_account():
     """
     GUARANTEE: Failed logins trigger account lockout.
     
@@ -565,11 +567,11 @@ def test_login_rate_limit_locks_account():
     test_email = "logintest@example.com"
     
     # Reset counter
-    limiter.reset_counter("login_email", test_email)
+    await limiter.reset_counter("login_email", test_email)
     
     # 5 failed attempts
     for i in range(5):
-        allowed, _ = limiter.check_rate_limit(
+        allowed, _ = await limiter.check_rate_limit(
             key="login_email",
             limit=5,
             window=600,
@@ -577,7 +579,7 @@ def test_login_rate_limit_locks_account():
         )
     
     # 6th attempt should be blocked
-    allowed, wait = limiter.check_rate_limit(
+    allowed, wait = await limiter.check_rate_limit(
         key="login_email",
         limit=5,
         window=600,
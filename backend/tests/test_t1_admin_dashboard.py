@@ -0,0 +1,160 @@
+"""
+Regression tests for the admin T1 dashboard query plan
+
+GUARANTEE: GET /api/v1/admin/dashboard/t1-filings issues a constant number
+of queries regardless of how many T1 forms exist (no per-row lookups).
+
+Requires PostgreSQL (COUNT ... FILTER). Set TEST_ASYNC_DATABASE_URL or the
+tests are skipped.
+
+Run: pytest backend/tests/test_t1_admin_dashboard.py -v
+"""
+
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from backend.app.core.auth import CurrentUser
+from backend.app.routes_v2.admin.t1_admin import get_t1_dashboard
+from database.schemas_v2 import Base, Admin, User, Filing, T1Form
+
+
+TEST_DB_URL = os.getenv(
+    "TEST_ASYNC_DATABASE_URL",
+    "postgresql+asyncpg://localhost/CA_Project_test"
+)
+
+
+# ============================================================================
+# TEST FIXTURES
+# ============================================================================
+
+@pytest_asyncio.fixture
+async def db_session():
+    """Session inside an outer transaction that is rolled back after the test"""
+    engine = create_async_engine(TEST_DB_URL)
+    try:
+        conn = await engine.connect()
+    except Exception as e:
+        await engine.dispose()
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+    await conn.run_sync(
+        Base.metadata.create_all,
+        tables=[Admin.__table__, User.__table__, Filing.__table__, T1Form.__table__]
+    )
+    trans = await conn.begin()
+    session = AsyncSession(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint")
+
+    yield session
+
+    await session.close()
+    await trans.rollback()
+    await conn.close()
+    await engine.dispose()
+
+
+@pytest.fixture
+def admin_user():
+    return CurrentUser(user_id=str(uuid.uuid4()), email="admin@example.com", role="admin")
+
+
+async def _seed_forms(session: AsyncSession, count: int) -> None:
+    """Create count users, each with one filing and one T1 form"""
+    base_time = datetime.now(timezone.utc)
+    for i in range(count):
+        user = User(
+            email=f"dash-{uuid.uuid4()}@example.com",
+            first_name="Dash",
+            last_name=f"User{i}",
+            password_hash="x"
+        )
+        session.add(user)
+        await session.flush()
+
+        filing = Filing(user_id=user.id, filing_year=2024)
+        session.add(filing)
+        await session.flush()
+
+        session.add(T1Form(
+            filing_id=filing.id,
+            user_id=user.id,
+            status="submitted" if i % 2 else "draft",
+            created_at=base_time - timedelta(seconds=i)
+        ))
+    await session.flush()
+
+
+async def _count_dashboard_queries(session: AsyncSession, admin_user: CurrentUser, **params):
+    """Call the dashboard endpoint and return (response, statements executed)"""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sync_engine = session.bind.engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        response = await get_t1_dashboard(
+            status_filter=params.get("status_filter"),
+            limit=params.get("limit", 50),
+            cursor=params.get("cursor"),
+            current_user=admin_user,
+            db=session
+        )
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _record)
+
+    return response, len(statements)
+
+
+# ============================================================================
+# QUERY COUNT
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_dashboard_query_count_is_constant(db_session, admin_user):
+    """
+    GUARANTEE: Dashboard query count does not grow with the number of forms.
+    """
+    await _seed_forms(db_session, 1)
+    small, small_queries = await _count_dashboard_queries(db_session, admin_user)
+
+    await _seed_forms(db_session, 30)
+    large, large_queries = await _count_dashboard_queries(db_session, admin_user)
+
+    assert large.total_count - small.total_count == 30
+    assert large_queries == small_queries
+    assert large_queries <= 2
+
+
+@pytest.mark.asyncio
+async def test_dashboard_keyset_pagination(db_session, admin_user):
+    """
+    GUARANTEE: Walking next_cursor visits every form exactly once, newest first.
+    """
+    await _seed_forms(db_session, 7)
+
+    first, _ = await _count_dashboard_queries(db_session, admin_user, limit=5)
+    assert len(first.filings) == 5
+    assert first.next_cursor is not None
+
+    seen = [item.id for item in first.filings]
+    cursor = first.next_cursor
+    while cursor:
+        page, queries = await _count_dashboard_queries(db_session, admin_user, limit=5, cursor=cursor)
+        assert queries <= 2
+        seen.extend(item.id for item in page.filings)
+        cursor = page.next_cursor
+
+    assert len(seen) == len(set(seen)) == first.total_count
+    assert first.draft_count + first.submitted_count <= first.total_count
@@ -0,0 +1,148 @@
+"""
+Regression tests for the T1 aggregate loader
+
+GUARANTEE: Loading a T1 form with its filing, user, answers, sections and
+documents, and resolving its actors, issues a constant number of queries
+regardless of how many related rows exist.
+
+Requires PostgreSQL (UUID/JSONB columns). Set TEST_ASYNC_DATABASE_URL or
+the tests are skipped.
+
+Run: pytest backend/tests/test_t1_aggregate_loader.py -v
+"""
+
+import os
+import sys
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from backend.app.services.t1_aggregate_loader import load_t1_aggregate, resolve_actors
+from database.schemas_v2 import Base, Admin, User, Filing, Document, T1Form, T1Answer, T1SectionProgress
+
+
+TEST_DB_URL = os.getenv(
+    "TEST_ASYNC_DATABASE_URL",
+    "postgresql+asyncpg://localhost/CA_Project_test"
+)
+
+
+# ============================================================================
+# TEST FIXTURES
+# ============================================================================
+
+@pytest_asyncio.fixture
+async def db_session():
+    """Session inside an outer transaction that is rolled back after the test"""
+    engine = create_async_engine(TEST_DB_URL)
+    try:
+        conn = await engine.connect()
+    except Exception as e:
+        await engine.dispose()
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+    await conn.run_sync(
+        Base.metadata.create_all,
+        tables=[
+            Admin.__table__, User.__table__, Filing.__table__, Document.__table__,
+            T1Form.__table__, T1Answer.__table__, T1SectionProgress.__table__
+        ]
+    )
+    trans = await conn.begin()
+    session = AsyncSession(bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint")
+
+    yield session
+
+    await session.close()
+    await trans.rollback()
+    await conn.close()
+    await engine.dispose()
+
+
+async def _seed_form(session: AsyncSession, related: int) -> T1Form:
+    """One form with `related` answers, reviewed sections (one admin each) and documents"""
+    user = User(email=f"agg-{uuid.uuid4()}@example.com", first_name="Agg", last_name="User", password_hash="x")
+    session.add(user)
+    await session.flush()
+
+    filing = Filing(user_id=user.id, filing_year=2024)
+    session.add(filing)
+    await session.flush()
+
+    t1_form = T1Form(filing_id=filing.id, user_id=user.id)
+    session.add(t1_form)
+    await session.flush()
+
+    for i in range(related):
+        admin = Admin(email=f"agg-admin-{uuid.uuid4()}@example.com", name=f"Admin {i}", password_hash="x")
+        session.add(admin)
+        await session.flush()
+
+        session.add(T1Answer(t1_form_id=t1_form.id, field_key=f"field.{i}", value_text=str(i)))
+        session.add(T1SectionProgress(
+            t1_form_id=t1_form.id, step_id="step", section_id=f"section_{i}",
+            is_reviewed=True, reviewed_by=admin.id
+        ))
+        session.add(Document(
+            filing_id=filing.id, name=f"doc {i}", original_filename=f"doc{i}.pdf",
+            file_type="application/pdf", file_size=1, file_path=f"/tmp/doc{i}.pdf", document_type="other"
+        ))
+    await session.flush()
+    session.expunge_all()
+    return t1_form
+
+
+async def _load_and_count(session: AsyncSession, t1_form_id: uuid.UUID):
+    """Load the full aggregate plus reviewers; return (aggregate, reviewers, statements executed)"""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    sync_engine = session.bind.engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _record)
+    try:
+        aggregate = await load_t1_aggregate(session, t1_form_id, documents=True)
+        reviewers = await resolve_actors(session, admin_ids=(sec.reviewed_by for sec in aggregate.sections))
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", _record)
+
+    return aggregate, reviewers, len(statements)
+
+
+# ============================================================================
+# QUERY COUNT
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_aggregate_query_count_is_constant(db_session):
+    """
+    GUARANTEE: Query count does not grow with answers, sections or documents.
+    """
+    small_form = await _seed_form(db_session, 1)
+    small, small_reviewers, small_queries = await _load_and_count(db_session, small_form.id)
+
+    large_form = await _seed_form(db_session, 20)
+    large, large_reviewers, large_queries = await _load_and_count(db_session, large_form.id)
+
+    assert len(small.answers) == len(small.sections) == len(small.documents) == 1
+    assert len(large.answers) == len(large.sections) == len(large.documents) == 20
+    assert len(large_reviewers) == 20
+    assert all(actor.role == "admin" for actor in large_reviewers.values())
+    assert large.user.first_name == "Agg"
+    assert large_queries == small_queries
+
+
+@pytest.mark.asyncio
+async def test_missing_form_returns_none(db_session):
+    """
+    GUARANTEE: Unknown form ids load as None (the admin routes turn this into a 404).
+    """
+    assert await load_t1_aggregate(db_session, uuid.uuid4()) is None
+    assert await resolve_actors(db_session, user_ids=[None], admin_ids=[None]) == {}
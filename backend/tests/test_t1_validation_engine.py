@@ -0,0 +1,157 @@
+"""
+Regression tests for the compiled T1 validation engine
+
+GUARANTEE: The compiled validation plan returns the same results as the
+interpreted engine it replaced. tests/data/t1_validation_golden.json holds
+a digest of that engine's output (draft and submission errors, completion
+percentage, required documents) for each of a seeded set of random forms
+over the real structure file; every form must still produce it.
+
+GUARANTEE: Chained update_completion_masks() delta updates equal a full
+compute_completion_masks() after every save.
+
+Run: pytest backend/tests/test_t1_validation_engine.py -v
+"""
+
+import hashlib
+import json
+import os
+import random
+import sys
+from typing import Any, Dict, List
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from backend.app.services.t1_validation_engine import T1ValidationEngine
+
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "data", "t1_validation_golden.json")
+SEED = 20241
+
+VALID_RATES = (0.5, 0.9, 1.0)  # share of valid values, picked per form
+
+# Per field type: a valid value first, then invalid ones and edge cases
+VALUES = {
+    "text": ["Sample text", "", "x" * 300, 42, None],
+    "number": [1250.5, 0, "1e5", " 12 ", "12,000", "abc", True, [1]],
+    "boolean": [True, False, "true", 1, None],
+    "date": ["2024-03-15", "2024-2-5", "2024-02-30", "2024-13-01", "24-01-01",
+             "2024-01-01T00:00", " 2024-01-01", "٢٠٢٤-01-01", 20240101],
+    "email": ["client@example.com", "client@example", "a b@example.com", 5, ""],
+    "phone": ["+1 416 555 0199", "416-555-0199", "+4165550199", "555-0199", "1" * 16, 4165550199],
+}
+
+
+def _random_value(rng: random.Random, field_def: Dict[str, Any], valid_rate: float) -> Any:
+    options = field_def.get("options")
+    if field_def.get("type") == "select" and options:
+        valid, invalid = list(options), ["not an option", 7, ""]
+    else:
+        valid, *invalid = VALUES.get(field_def.get("type"), ["value", 3, None])
+        valid = [valid]
+    return rng.choice(valid if rng.random() < valid_rate else invalid)
+
+
+def generate_forms(engine: T1ValidationEngine, count: int, seed: int = SEED) -> List[Dict[str, Any]]:
+    """
+    Random answer sets: every field or a random subset of them, with valid
+    or invalid values, and condition keys set to a matching value about
+    half the time
+    """
+    rng = random.Random(seed)
+    field_keys = sorted(engine.field_registry)
+    conditions = sorted(
+        ({"key": condition["key"], "value": condition.get("value")}
+         for field_def in engine.field_registry.values()
+         for attribute in ("section_condition", "condition", "trigger", "subform_condition")
+         for condition in [field_def.get(attribute)]
+         if condition and condition.get("key")),
+        key=lambda condition: json.dumps(condition, sort_keys=True, default=str)
+    )
+
+    forms = []
+    for _ in range(count):
+        answers = {}
+        valid_rate = rng.choice(VALID_RATES)
+        size = len(field_keys) if rng.random() < 0.25 else rng.randint(0, len(field_keys))
+        for key in rng.sample(field_keys, size):
+            answers[key] = _random_value(rng, engine.field_registry[key], valid_rate)
+        for condition in conditions:
+            if rng.random() < 0.5:
+                expected = condition["value"]
+                answers[condition["key"]] = rng.choice(expected) if isinstance(expected, list) and expected else expected
+        if rng.random() < 0.2:
+            answers["custom_mobile_field"] = "kept as-is"
+        forms.append(answers)
+    return forms
+
+
+def engine_results(engine, answers: Dict[str, Any]) -> Dict[str, Any]:
+    """Engine outputs for one form; error lists sorted (required fields come from a set)"""
+    draft_valid, draft_errors = engine.validate_draft_save(answers)
+    submission_valid, submission_errors = engine.validate_submission(answers)
+    return {
+        "draft": [draft_valid, sorted(draft_errors)],
+        "submission": [submission_valid, sorted(submission_errors)],
+        "completion": engine.calculate_completion_percentage(answers),
+        "documents": engine.get_required_documents(answers),
+    }
+
+
+def results_digest(results: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(results, sort_keys=True).encode()).hexdigest()
+
+
+# ============================================================================
+# TEST FIXTURES
+# ============================================================================
+
+@pytest.fixture(scope="module")
+def engine():
+    return T1ValidationEngine()
+
+
+@pytest.fixture(scope="module")
+def golden():
+    with open(GOLDEN_PATH) as f:
+        return json.load(f)
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+
+def test_matches_golden_output(engine, golden):
+    forms = generate_forms(engine, len(golden["digests"]), golden["seed"])
+
+    assert golden["structure_fields"] == len(engine.field_registry)
+    for index, (answers, expected) in enumerate(zip(forms, golden["digests"])):
+        results = engine_results(engine, answers)
+        assert results_digest(results) == expected, f"form {index} differs: {results}"
+
+
+def test_delta_completion_matches_full_recompute(engine):
+    rng = random.Random(SEED)
+    forms = generate_forms(engine, 40)
+
+    for start, target in zip(forms, forms[1:]):
+        answers = dict(start)
+        masks = engine.compute_completion_masks(answers)
+        # Move from one form to the next a few keys per save, removing some
+        keys = sorted(set(start) | set(target))
+        rng.shuffle(keys)
+        while keys:
+            size = rng.randint(1, 15)
+            changed, keys = keys[:size], keys[size:]
+            for key in changed:
+                if key in target:
+                    answers[key] = target[key]
+                else:
+                    answers.pop(key, None)
+            masks = engine.update_completion_masks(masks, answers, changed)
+            assert masks == engine.compute_completion_masks(answers)
+
+        assert engine.completion_percentage_from_masks(masks) == engine.calculate_completion_percentage(target)
@@ -55,6 +55,8 @@ class DocumentStatus(str, enum.Enum):
     MISSING = "missing"
     APPROVED = "approved"
     REUPLOAD_REQUESTED = "reupload_requested"
+    PROCESSING = "processing"  # presigned upload awaiting validation/encryption
+    REJECTED = "rejected"  # presigned upload failed validation
 
 
 # T1FormStatus enum moved to line 360+ to avoid duplication
@@ -207,6 +209,10 @@ class Document(Base):
     status = Column(String(20), nullable=False, default=DocumentStatus.PENDING.value, index=True)
     notes = Column(Text, nullable=True)
     
+    # Direct uploads: processing attempts so far and when the next may start
+    processing_attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)
+    
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -393,6 +399,7 @@ class T1Form(Base):
     status = Column(String(20), nullable=False, default='draft')
     is_locked = Column(Boolean, nullable=False, default=False)
     completion_percentage = Column(Integer, nullable=False, default=0)
+    completion_state = Column(String(100), nullable=True)  # "<plan>:<visible hex>:<filled hex>" required-field bitsets
     last_saved_step_id = Column(String(50), nullable=True)
     submitted_at = Column(DateTime(timezone=True), nullable=True)
     reviewed_by = Column(UUID(as_uuid=True), ForeignKey('admins.id'), nullable=True)
@@ -410,6 +417,7 @@ class T1Form(Base):
         Index('idx_t1_forms_filing_id', 'filing_id'),
         Index('idx_t1_forms_user_id', 'user_id'),
         Index('idx_t1_forms_status', 'status'),
+        Index('idx_t1_forms_created_at_id', created_at.desc(), id.desc()),
         {'extend_existing': True}
     )
 
@@ -437,6 +445,7 @@ class T1Answer(Base):
 
     __table_args__ = (
         Index('idx_t1_answers_form_id', 't1_form_id'),
+        Index('uq_t1_answers_form_field', 't1_form_id', 'field_key', unique=True),
         Index('idx_t1_answers_field_key', 'field_key'),
         Index('idx_t1_answers_array_gin', 'value_array', postgresql_using='gin'),
         {'extend_existing': True}
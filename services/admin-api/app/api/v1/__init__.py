@@ -14,6 +14,7 @@ from .t1_forms import router as t1_forms_router
 from .files import router as files_router
 from .chat import router as chat_router
 from .notifications import router as notifications_router
+from .search import router as search_router
 
 api_router = APIRouter()
 
@@ -29,5 +30,6 @@ api_router.include_router(t1_forms_router)  # Router already has /t1-forms prefi
 api_router.include_router(files_router)  # Router already has /files prefix
 api_router.include_router(chat_router)  # Router already has /chat prefix
 api_router.include_router(notifications_router)  # Router already has /notifications prefix
+api_router.include_router(search_router)  # Router already has /search prefix
 
 
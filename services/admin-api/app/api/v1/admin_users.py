@@ -9,6 +9,7 @@ from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.analytics_rollup import analytics_cache
 from app.core.dependencies import get_current_admin, get_current_superadmin
 from app.core.auth import get_password_hash
 from app.core.utils import create_audit_log
@@ -82,6 +83,7 @@ async def create_admin_user(
     db.add(admin)
     await db.commit()
     await db.refresh(admin)
+    await analytics_cache.invalidate()
     
     # Create audit log
     await create_audit_log(
@@ -123,6 +125,7 @@ async def update_admin_user(
     
     await db.commit()
     await db.refresh(admin)
+    await analytics_cache.invalidate()
     
     # Create audit log
     await create_audit_log(
@@ -154,6 +157,7 @@ async def delete_admin_user(
     admin_name = admin.name
     await db.delete(admin)
     await db.commit()
+    await analytics_cache.invalidate()
     
     # Create audit log
     await create_audit_log(
@@ -9,7 +9,7 @@ from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_admin
-from app.core.utils import calculate_pagination
+from app.core.utils import calculate_pagination, paginate, count_rows, count_cache_key
 from app.models.audit_log import AuditLog
 from app.models.admin_user import AdminUser
 from app.schemas.audit_log import AuditLogResponse, AuditLogListResponse
@@ -23,6 +23,7 @@ async def get_audit_logs(
     page_size: int = Query(50, ge=1, le=100),
     entity_type: Optional[str] = None,
     action: Optional[str] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (overrides page)"),
     db: AsyncSession = Depends(get_db),
     current_admin = Depends(get_current_admin)
 ):
@@ -42,15 +43,17 @@ async def get_audit_logs(
     count_query = select(func.count()).select_from(AuditLog)
     if conditions:
         count_query = count_query.where(and_(*conditions))
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    total = await count_rows(
+        db, count_query,
+        table=None if conditions else "audit_logs",
+        cache_key=count_cache_key("audit_logs", entity_type=entity_type, action=action)
+    )
     
     # Apply pagination
-    query = query.order_by(AuditLog.timestamp.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
-    
-    result = await db.execute(query)
-    logs = result.scalars().all()
+    logs, next_cursor = await paginate(
+        db, query, AuditLog.timestamp, AuditLog.id, page_size,
+        cursor=cursor, offset=(page - 1) * page_size
+    )
     
     # Format response
     log_responses = []
@@ -64,6 +67,7 @@ async def get_audit_logs(
     
     return AuditLogListResponse(
         logs=log_responses,
+        next_cursor=next_cursor,
         **pagination
     )
 
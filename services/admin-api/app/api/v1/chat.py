@@ -18,6 +18,7 @@ import uuid as uuidlib
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_admin
+from app.core.utils import keyset_sql, split_page
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
@@ -35,6 +36,7 @@ class AdminChatMessage(BaseModel):
 class AdminChatListResponse(BaseModel):
     messages: List[AdminChatMessage]
     total: int
+    next_cursor: Optional[str] = None  # older messages
 
 
 class AdminChatSendRequest(BaseModel):
@@ -47,21 +49,26 @@ async def get_chat_messages(
     client_id: UUID = Query(...),
     limit: int = Query(100, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
     current_admin=Depends(get_current_admin),
 ):
     try:
+        params = {"uid": str(client_id), "limit": limit + 1, "offset": offset}
+        where = "WHERE user_id = :uid"
+        if cursor:
+            where += " AND " + keyset_sql(cursor, "created_at", "id", params)
+            params["offset"] = 0
         sql = (
             "SELECT id::text, user_id::text, sender_role, message, created_at, read_by_client, read_by_admin "
-            "FROM chat_messages "
-            "WHERE user_id = :uid "
-            "ORDER BY created_at DESC "
+            f"FROM chat_messages {where} "
+            "ORDER BY created_at DESC, id DESC "
             "LIMIT :limit OFFSET :offset"
         )
-        res = await db.execute(text(sql), {"uid": str(client_id), "limit": limit, "offset": offset})
-        rows = res.fetchall()
+        res = await db.execute(text(sql), params)
+        rows, next_cursor = split_page(res.fetchall(), limit, lambda r: (r[4], r[0]))
         # reverse to ascending for UI
-        rows = list(rows)[::-1]
+        rows = rows[::-1]
         msgs = [
             AdminChatMessage(
                 id=r[0],
@@ -74,7 +81,9 @@ async def get_chat_messages(
             )
             for r in rows
         ]
-        return AdminChatListResponse(messages=msgs, total=len(msgs))
+        return AdminChatListResponse(messages=msgs, total=len(msgs), next_cursor=next_cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
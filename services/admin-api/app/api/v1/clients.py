@@ -5,13 +5,15 @@ from typing import Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.analytics_rollup import analytics_cache
 from app.core.dependencies import get_current_admin, require_permission
-from app.core.utils import create_audit_log, calculate_pagination
+from app.core.utils import create_audit_log, calculate_pagination, paginate, count_rows
 from app.core.permissions import PERMISSIONS
+from app.core.search import client_search_condition, invalidate_search
 from app.models.client import Client
 from app.models.admin_user import AdminUser
 from app.schemas.client import (
@@ -29,6 +31,7 @@ async def get_clients(
     year_filter: Optional[int] = Query(None, alias="year"),
     search: Optional[str] = None,
     email: Optional[str] = Query(None),  # Direct email search for sync
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (overrides page)"),
     db: AsyncSession = Depends(get_db),
     current_admin = Depends(get_current_admin)
 ):
@@ -45,12 +48,7 @@ async def get_clients(
         # Exact email match for sync service
         conditions.append(Client.email == email)
     elif search:
-        conditions.append(
-            or_(
-                Client.name.ilike(f"%{search}%"),
-                Client.email.ilike(f"%{search}%")
-            )
-        )
+        conditions.append(client_search_condition(Client, search))
     
     if conditions:
         query = query.where(and_(*conditions))
@@ -59,15 +57,13 @@ async def get_clients(
     count_query = select(func.count()).select_from(Client)
     if conditions:
         count_query = count_query.where(and_(*conditions))
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    total = await count_rows(db, count_query, table=None if conditions else "clients")
     
     # Apply pagination
-    query = query.order_by(Client.created_at.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
-    
-    result = await db.execute(query)
-    clients = result.scalars().all()
+    clients, next_cursor = await paginate(
+        db, query, Client.created_at, Client.id, page_size,
+        cursor=cursor, offset=(page - 1) * page_size
+    )
     
     # Format response
     client_responses = []
@@ -81,6 +77,7 @@ async def get_clients(
     
     return ClientListResponse(
         clients=client_responses,
+        next_cursor=next_cursor,
         **pagination
     )
 
@@ -126,6 +123,8 @@ async def create_client(
     db.add(client)
     await db.commit()
     await db.refresh(client)
+    await invalidate_search("clients")
+    await analytics_cache.invalidate()
     
     # Create audit log
     await create_audit_log(
@@ -162,6 +161,8 @@ async def update_client(
     
     await db.commit()
     await db.refresh(client)
+    await invalidate_search("clients")
+    await analytics_cache.invalidate()
     
     # Create audit log
     await create_audit_log(
@@ -190,6 +191,8 @@ async def delete_client(
     client_name = client.name
     await db.delete(client)
     await db.commit()
+    await invalidate_search("clients")
+    await analytics_cache.invalidate()
     
     # Create audit log
     await create_audit_log(
@@ -5,12 +5,14 @@ from typing import Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
 
 from app.core.database import get_db
+from app.core.analytics_rollup import analytics_cache
 from app.core.dependencies import get_current_admin
-from app.core.utils import create_audit_log
+from app.core.utils import create_audit_log, paginate, count_rows
+from app.core.search import document_search_condition, invalidate_search
 from app.models.document import Document
 from app.models.client import Client
 from app.schemas.document import DocumentCreate, DocumentUpdate, DocumentResponse, DocumentListResponse
@@ -24,6 +26,9 @@ async def get_documents(
     search: Optional[str] = None,
     client_id: Optional[UUID] = Query(None),
     filing_id: Optional[UUID] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (all documents if omitted)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    offset: int = Query(0, ge=0, description="Ignored when cursor is given"),
     db: AsyncSession = Depends(get_db),
     current_admin = Depends(get_current_admin)
 ):
@@ -53,25 +58,24 @@ async def get_documents(
         conditions.append(Document.filing_id == filing_id)
     
     if search:
-        conditions.append(
-            or_(
-                Document.name.ilike(f"%{search}%"),
-            )
-        )
+        conditions.append(document_search_condition(Document, search))
     
     if conditions:
         query = query.where(and_(*conditions))
     
-    query = query.order_by(Document.created_at.desc())
-    result = await db.execute(query)
-    documents = result.scalars().all()
+    documents, next_cursor = await paginate(
+        db, query, Document.created_at, Document.id, limit,
+        cursor=cursor, offset=offset
+    )
     
-    # Count total
-    count_query = select(func.count()).select_from(Document)
-    if conditions:
-        count_query = count_query.where(and_(*conditions))
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    # Count total (an unpaged listing already holds every matching row)
+    if limit is None and not cursor and not offset:
+        total = len(documents)
+    else:
+        count_query = select(func.count()).select_from(Document)
+        if conditions:
+            count_query = count_query.where(and_(*conditions))
+        total = await count_rows(db, count_query, table=None if conditions else "documents")
     
     # Format response
     doc_responses = []
@@ -92,7 +96,7 @@ async def get_documents(
         }
         doc_responses.append(DocumentResponse(**doc_dict))
     
-    return DocumentListResponse(documents=doc_responses, total=total)
+    return DocumentListResponse(documents=doc_responses, total=total, next_cursor=next_cursor)
 
 
 @router.post("", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
@@ -112,6 +116,8 @@ async def create_document(
     db.add(document)
     await db.commit()
     await db.refresh(document)
+    await invalidate_search("documents")
+    await analytics_cache.invalidate()
     
     # Create audit log
     await create_audit_log(
@@ -139,6 +145,8 @@ async def delete_document(
     doc_name = document.name
     await db.delete(document)
     await db.commit()
+    await invalidate_search("documents")
+    await analytics_cache.invalidate()
     
     # Create audit log
     await create_audit_log(
@@ -10,6 +10,7 @@ import uuid
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_admin
+from app.core.utils import keyset_sql, split_page, count_rows, count_cache_key
 from pydantic import BaseModel
 import logging
 
@@ -35,6 +36,7 @@ class FileListResponse(BaseModel):
     total: int
     offset: int
     limit: int
+    next_cursor: Optional[str] = None
 
 
 @router.get("", response_model=FileListResponse)
@@ -43,7 +45,8 @@ async def get_files(
     client_email: Optional[str] = Query(None, description="Filter by client email"),
     status_filter: Optional[str] = Query(None, description="Filter by upload status"),
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Ignored when cursor is given"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
     current_admin = Depends(get_current_admin)
 ):
@@ -68,10 +71,10 @@ async def get_files(
             "LEFT JOIN users u ON f.user_id = u.id"
         ]
         
+        # The users join only matters to the count when filtering by email
         count_query_parts = [
             "SELECT COUNT(*) as total",
             "FROM files f",
-            "LEFT JOIN users u ON f.user_id = u.id"
         ]
         
         # Add filters
@@ -89,6 +92,7 @@ async def get_files(
         if client_email:
             conditions.append("(LOWER(u.email) = LOWER(:client_email))")
             params["client_email"] = client_email
+            count_query_parts.append("LEFT JOIN users u ON f.user_id = u.id")
         
         if status_filter:
             conditions.append("f.upload_status = :status")
@@ -96,24 +100,31 @@ async def get_files(
         
         # Apply filters
         if conditions:
-            where_clause = " WHERE " + " AND ".join(conditions)
-            query_parts.append(where_clause)
-            count_query_parts.append(where_clause)
+            count_query_parts.append(" WHERE " + " AND ".join(conditions))
+        
+        count_params = dict(params)
+        if cursor:
+            conditions.append(keyset_sql(cursor, "f.created_at", "f.id", params))
+            offset = 0
+        if conditions:
+            query_parts.append(" WHERE " + " AND ".join(conditions))
         
         # Build final queries
-        base_query_sql = " ".join(query_parts) + " ORDER BY f.created_at DESC LIMIT :limit OFFSET :offset"
+        base_query_sql = " ".join(query_parts) + " ORDER BY f.created_at DESC, f.id DESC LIMIT :limit OFFSET :offset"
         count_query_sql = " ".join(count_query_parts)
         
-        params["limit"] = limit
+        params["limit"] = limit + 1
         params["offset"] = offset
         
         # Execute queries
         result = await db.execute(text(base_query_sql), params)
-        rows = result.fetchall()
+        rows, next_cursor = split_page(result.fetchall(), limit, lambda row: (row[7], row[0]))
         
-        count_params = {k: v for k, v in params.items() if k != "limit" and k != "offset"}
-        count_result = await db.execute(text(count_query_sql), count_params)
-        total = count_result.scalar()
+        total = await count_rows(
+            db, text(count_query_sql), count_params,
+            table=None if count_params else "files",
+            cache_key=count_cache_key("files", **count_params)
+        )
         
         # Format response
         files = []
@@ -136,9 +147,12 @@ async def get_files(
             "files": files,
             "total": total,
             "offset": offset,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
                 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching files: {e}", exc_info=True)
         raise HTTPException(
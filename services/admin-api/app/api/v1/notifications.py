@@ -14,6 +14,7 @@ import uuid as uuidlib
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_admin
+from app.core.utils import keyset_sql, split_page
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
@@ -32,6 +33,7 @@ class AdminNotification(BaseModel):
 class AdminNotificationListResponse(BaseModel):
     notifications: List[AdminNotification]
     total: int
+    next_cursor: Optional[str] = None
 
 
 class AdminSendNotificationRequest(BaseModel):
@@ -47,20 +49,25 @@ async def list_notifications(
     unread_only: bool = False,
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db),
     current_admin=Depends(get_current_admin),
 ):
     try:
+        params = {"uid": str(client_id), "limit": limit + 1, "offset": offset}
         where = "WHERE user_id = :uid"
         if unread_only:
             where += " AND is_read = false"
+        if cursor:
+            where += " AND " + keyset_sql(cursor, "created_at", "id", params)
+            params["offset"] = 0
         sql = (
             "SELECT id::text, user_id::text, type, title, message, is_read, created_by, created_at "
             f"FROM notifications {where} "
-            "ORDER BY created_at DESC LIMIT :limit OFFSET :offset"
+            "ORDER BY created_at DESC, id DESC LIMIT :limit OFFSET :offset"
         )
-        res = await db.execute(text(sql), {"uid": str(client_id), "limit": limit, "offset": offset})
-        rows = res.fetchall()
+        res = await db.execute(text(sql), params)
+        rows, next_cursor = split_page(res.fetchall(), limit, lambda r: (r[7], r[0]))
         notifs = [
             AdminNotification(
                 id=r[0],
@@ -74,7 +81,9 @@ async def list_notifications(
             )
             for r in rows
         ]
-        return AdminNotificationListResponse(notifications=notifs, total=len(notifs))
+        return AdminNotificationListResponse(notifications=notifs, total=len(notifs), next_cursor=next_cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
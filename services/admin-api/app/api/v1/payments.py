@@ -3,16 +3,17 @@ Payment routes
 """
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, text
 from sqlalchemy.orm import selectinload
 import uuid
 
 from app.core.database import get_db
+from app.core.analytics_rollup import analytics_cache
 from app.core.dependencies import get_current_admin, require_permission
 from app.core.permissions import PERMISSIONS
-from app.core.utils import create_audit_log
+from app.core.utils import create_audit_log, paginate
 from app.models.payment import Payment
 from app.models.client import Client
 from app.schemas.payment import PaymentCreate, PaymentUpdate, PaymentResponse, PaymentListResponse
@@ -23,22 +24,29 @@ router = APIRouter()
 @router.get("", response_model=PaymentListResponse)
 async def get_payments(
     client_id: Optional[UUID] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (all payments if omitted)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    offset: int = Query(0, ge=0, description="Ignored when cursor is given"),
     db: AsyncSession = Depends(get_db),
     current_admin = Depends(get_current_admin)
 ):
     """Get all payments"""
     query = select(Payment).options(selectinload(Payment.client), selectinload(Payment.created_by_admin))
+    totals_query = select(func.count(), func.coalesce(func.sum(Payment.amount), 0)).select_from(Payment)
     
     if client_id:
         query = query.where(Payment.client_id == client_id)
+        totals_query = totals_query.where(Payment.client_id == client_id)
     
-    query = query.order_by(Payment.created_at.desc())
-    result = await db.execute(query)
-    payments = result.scalars().all()
+    payments, next_cursor = await paginate(
+        db, query, Payment.created_at, Payment.id, limit,
+        cursor=cursor, offset=offset
+    )
     
-    # Calculate totals
-    total_revenue = sum(p.amount for p in payments)
-    avg_payment = total_revenue / len(payments) if payments else 0
+    # Calculate totals over every matching payment, not just this page
+    total, total_revenue = (await db.execute(totals_query)).one()
+    total_revenue = float(total_revenue)
+    avg_payment = total_revenue / total if total else 0
     
     # Format response
     payment_responses = []
@@ -52,9 +60,10 @@ async def get_payments(
     
     return PaymentListResponse(
         payments=payment_responses,
-        total=len(payments),
+        total=total,
         total_revenue=total_revenue,
-        avg_payment=avg_payment
+        avg_payment=avg_payment,
+        next_cursor=next_cursor
     )
 
 
@@ -89,6 +98,7 @@ async def create_payment(
     await db.commit()
     await db.refresh(payment)
     await db.refresh(client)
+    await analytics_cache.invalidate()
 
     # Notify client (stored in shared Postgres notifications table)
     try:
@@ -173,6 +183,7 @@ async def update_payment(
     await db.commit()
     await db.refresh(payment)
     await db.refresh(client)
+    await analytics_cache.invalidate()
 
     # Notify client if amount/method/note changed
     try:
@@ -260,6 +271,7 @@ async def delete_payment(
     # Delete payment
     await db.delete(payment)
     await db.commit()
+    await analytics_cache.invalidate()
     
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
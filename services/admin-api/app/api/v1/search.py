@@ -0,0 +1,62 @@
+"""
+Search endpoint - typeahead search over clients and documents
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from pydantic import BaseModel
+
+from app.core.database import get_db
+from app.core.dependencies import get_current_admin
+from app.core.search import MIN_QUERY_LENGTH, SEARCHERS, cached_search
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+class ClientSearchHit(BaseModel):
+    id: str
+    name: str
+    email: str
+    phone: Optional[str] = None
+    status: str
+    rank: float
+
+
+class DocumentSearchHit(BaseModel):
+    id: str
+    name: str
+    filing_id: Optional[str] = None
+    document_type: Optional[str] = None
+    status: str
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    query: str
+    clients: List[ClientSearchHit] = []
+    documents: List[DocumentSearchHit] = []
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=MIN_QUERY_LENGTH, max_length=100, description="Search text"),
+    types: str = Query("clients,documents", description="Comma-separated: clients, documents"),
+    limit: int = Query(10, ge=1, le=50, description="Results per type"),
+    db: AsyncSession = Depends(get_db),
+    current_admin = Depends(get_current_admin)
+):
+    """
+    Ranked search over client name/email/phone and document names
+
+    Safe to call on every keystroke: results are cached briefly per query,
+    and a query extending an already-empty one skips the database.
+    """
+    kinds = [kind.strip() for kind in types.split(",") if kind.strip()]
+    unknown = [kind for kind in kinds if kind not in SEARCHERS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown search type(s): {', '.join(unknown)}")
+
+    response = {"query": q}
+    for kind in kinds:
+        response[kind] = await cached_search(db, kind, q, limit)
+    return response
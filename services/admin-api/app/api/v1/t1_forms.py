@@ -14,6 +14,7 @@ import uuid
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_admin
+from app.core.utils import keyset_sql, split_page, count_rows, count_cache_key
 from app.models.client import Client
 try:
     from app.schemas.t1_form import T1FormListResponse, T1FormResponse
@@ -39,6 +40,7 @@ except ImportError:
         total: int
         offset: int
         limit: int
+        next_cursor: Optional[str] = None
 import logging
 
 logger = logging.getLogger(__name__)
@@ -48,6 +50,11 @@ router = APIRouter(prefix="/t1-forms", tags=["T1 Forms"])
 # Client backend URL (for fallback if needed)
 CLIENT_BACKEND_URL = os.getenv("CLIENT_BACKEND_URL", "http://localhost:8001/api/v1")
 
+T1_FORM_INDEX_COLUMNS = (
+    "id, user_id, tax_year, status, first_name, last_name, client_email, "
+    "created_at, updated_at, submitted_at"
+)
+
 
 @router.get("", response_model=T1FormListResponse)
 async def get_t1_forms(
@@ -55,87 +62,21 @@ async def get_t1_forms(
     client_email: Optional[str] = Query(None, description="Filter by client email"),
     status_filter: Optional[str] = Query(None, description="Filter by status"),
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Ignored when cursor is given"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
     current_admin = Depends(get_current_admin)
 ):
     """
     Get T1 forms from client backend
     Admin can view all T1 forms or filter by client
+    
+    Reads t1_form_index, which the client-api migrations keep in sync with
+    both T1 schemas (legacy t1_personal_forms and t1_forms_main +
+    t1_personal_info). Pages are ordered by (created_at, id) descending;
+    pass next_cursor back as cursor for the following page.
     """
     try:
-        # Since both backends use the same database, query directly.
-        # We support BOTH:
-        # - legacy/encrypted: t1_personal_forms
-        # - new business schema: t1_forms_main + t1_personal_info
-        union_query_parts = [
-            "SELECT * FROM (",
-            "  SELECT",
-            "    t1.id::text as id,",
-            "    t1.user_id::text as user_id,",
-            "    t1.tax_year::int as tax_year,",
-            "    t1.status as status,",
-            "    t1.first_name as first_name,",
-            "    t1.last_name as last_name,",
-            "    COALESCE(t1.email, u.email) as client_email,",
-            "    t1.created_at as created_at,",
-            "    t1.updated_at as updated_at,",
-            "    t1.submitted_at as submitted_at",
-            "  FROM t1_personal_forms t1",
-            "  LEFT JOIN users u ON t1.user_id = u.id",
-            "",
-            "  UNION ALL",
-            "",
-            "  SELECT",
-            "    tm.id::text as id,",
-            "    tm.user_id::text as user_id,",
-            "    EXTRACT(YEAR FROM tm.created_at)::int as tax_year,",
-            "    tm.status as status,",
-            "    pi.first_name as first_name,",
-            "    pi.last_name as last_name,",
-            "    COALESCE(pi.email, u.email) as client_email,",
-            "    tm.created_at as created_at,",
-            "    tm.updated_at as updated_at,",
-            "    CASE WHEN tm.status = 'submitted' THEN tm.updated_at ELSE NULL END as submitted_at",
-            "  FROM t1_forms_main tm",
-            "  LEFT JOIN t1_personal_info pi ON pi.form_id = tm.id",
-            "  LEFT JOIN users u ON tm.user_id = u.id",
-            ") forms"
-        ]
-
-        count_query_parts = [
-            "SELECT COUNT(*) as total FROM (",
-            "  SELECT",
-            "    t1.id::text as id,",
-            "    t1.user_id::text as user_id,",
-            "    t1.tax_year::int as tax_year,",
-            "    t1.status as status,",
-            "    t1.first_name as first_name,",
-            "    t1.last_name as last_name,",
-            "    COALESCE(t1.email, u.email) as client_email,",
-            "    t1.created_at as created_at,",
-            "    t1.updated_at as updated_at,",
-            "    t1.submitted_at as submitted_at",
-            "  FROM t1_personal_forms t1",
-            "  LEFT JOIN users u ON t1.user_id = u.id",
-            "  UNION ALL",
-            "  SELECT",
-            "    tm.id::text as id,",
-            "    tm.user_id::text as user_id,",
-            "    EXTRACT(YEAR FROM tm.created_at)::int as tax_year,",
-            "    tm.status as status,",
-            "    pi.first_name as first_name,",
-            "    pi.last_name as last_name,",
-            "    COALESCE(pi.email, u.email) as client_email,",
-            "    tm.created_at as created_at,",
-            "    tm.updated_at as updated_at,",
-            "    CASE WHEN tm.status = 'submitted' THEN tm.updated_at ELSE NULL END as submitted_at",
-            "  FROM t1_forms_main tm",
-            "  LEFT JOIN t1_personal_info pi ON pi.form_id = tm.id",
-            "  LEFT JOIN users u ON tm.user_id = u.id",
-            ") forms"
-        ]
-        
         # Add filters
         conditions = []
         params = {}
@@ -143,54 +84,56 @@ async def get_t1_forms(
         if client_id:
             try:
                 user_uuid = uuid.UUID(client_id)
-                conditions.append("forms.user_id = :user_id")
-                params["user_id"] = str(user_uuid)
+                conditions.append("user_id = :user_id")
+                params["user_id"] = user_uuid
             except ValueError:
                 raise HTTPException(status_code=400, detail="Invalid client_id format")
         
         if client_email:
-            conditions.append("LOWER(forms.client_email) = LOWER(:client_email)")
+            conditions.append("LOWER(client_email) = LOWER(:client_email)")
             params["client_email"] = client_email
         
         if status_filter:
-            conditions.append("forms.status = :status")
+            conditions.append("status = :status")
             params["status"] = status_filter
         
-        # Apply filters
-        if conditions:
-            where_clause = " WHERE " + " AND ".join(conditions)
-            union_query_parts.append(where_clause)
-            count_query_parts.append(where_clause)
-        
-        # Build final queries
-        base_query_sql = " ".join(union_query_parts) + " ORDER BY forms.created_at DESC LIMIT :limit OFFSET :offset"
-        count_query_sql = " ".join(count_query_parts)
-        
-        params["limit"] = limit
-        params["offset"] = offset
+        where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
+        total = await count_rows(
+            db, text(f"SELECT COUNT(*) FROM t1_form_index{where_clause}"), params,
+            table=None if conditions else "t1_form_index",
+            cache_key=count_cache_key("t1_forms", **params)
+        )
         
-        # Execute queries
-        result = await db.execute(text(base_query_sql), params)
-        rows = result.fetchall()
+        page_conditions = list(conditions)
+        page_params = dict(params, limit=limit + 1)
+        if cursor:
+            page_conditions.append(keyset_sql(cursor, "created_at", "id", page_params, id_type=str))
+            offset = 0
         
-        count_params = {k: v for k, v in params.items() if k != "limit" and k != "offset"}
-        count_result = await db.execute(text(count_query_sql), count_params)
-        total = count_result.scalar()
+        where_clause = " WHERE " + " AND ".join(page_conditions) if page_conditions else ""
+        result = await db.execute(
+            text(
+                f"SELECT {T1_FORM_INDEX_COLUMNS} FROM t1_form_index{where_clause}"
+                " ORDER BY created_at DESC, id DESC LIMIT :limit OFFSET :offset"
+            ),
+            dict(page_params, offset=offset)
+        )
+        rows, next_cursor = split_page(result.fetchall(), limit, lambda row: (row.created_at, row.id))
         
         # Format response
         forms = []
         for row in rows:
             forms.append({
-                "id": row[0],
-                "user_id": str(row[1]) if row[1] else None,
-                "tax_year": int(row[2]) if row[2] else datetime.utcnow().year,
-                "status": row[3],
-                "first_name": row[4],
-                "last_name": row[5],
-                "client_email": row[6],
-                "created_at": row[7].isoformat() if row[7] else None,
-                "updated_at": row[8].isoformat() if row[8] else None,
-                "submitted_at": row[9].isoformat() if row[9] else None,
+                "id": row.id,
+                "user_id": str(row.user_id) if row.user_id else None,
+                "tax_year": int(row.tax_year) if row.tax_year else datetime.utcnow().year,
+                "status": row.status,
+                "first_name": row.first_name,
+                "last_name": row.last_name,
+                "client_email": row.client_email,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+                "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+                "submitted_at": row.submitted_at.isoformat() if row.submitted_at else None,
             })
         
         logger.info(f"✅ Retrieved {len(forms)} T1 forms from database (total: {total})")
@@ -199,9 +142,12 @@ async def get_t1_forms(
             "forms": forms,
             "total": total,
             "offset": offset,
-            "limit": limit
+            "limit": limit,
+            "next_cursor": next_cursor
         }
                 
+    except HTTPException:
+        raise
     except httpx.RequestError as e:
         logger.error(f"Error connecting to client backend: {e}")
         raise HTTPException(
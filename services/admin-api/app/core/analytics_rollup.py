@@ -0,0 +1,296 @@
+"""
+Dashboard analytics rollups
+
+The dashboard aggregates (client counts by status, pending documents and
+payments, revenue by month, admin workload) are kept incrementally in the
+daily_metrics table instead of being recomputed from the base tables:
+
+- Row triggers on clients, documents and payments add +/- deltas to
+  (day, metric, dimension) rows. Revenue is booked on the payment's day;
+  count metrics on the day the change happened.
+- rebuild_daily_metrics() recomputes the table from scratch under a SHARE
+  lock; setup_database.py runs it when installing the triggers and it can
+  be re-run at any time to reconcile.
+
+Reading the dashboard touches only daily_metrics and admin_users, so its
+cost grows with calendar days and dimensions, not with rows. The
+assembled response is cached on top of that (see AnalyticsCache).
+"""
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.redis_cache import cache
+
+
+ANALYTICS_CACHE_KEY = "analytics:dashboard"
+ANALYTICS_VERSION_KEY = "analytics:version"
+ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", 60))  # seconds (Redis)
+ANALYTICS_LOCAL_TTL = int(os.getenv("ANALYTICS_LOCAL_TTL", 5))  # seconds (per worker)
+
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+COMPLETED_STATUSES = ("completed", "filed")
+
+
+# ============================================================================
+# TRIGGERS
+# ============================================================================
+
+ROLLUP_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION bump_daily_metric(p_day date, p_metric varchar, p_dimension varchar, p_delta double precision)
+    RETURNS void AS $$
+    BEGIN
+        INSERT INTO daily_metrics (day, metric, dimension, value)
+        VALUES (p_day, p_metric, COALESCE(p_dimension, ''), p_delta)
+        ON CONFLICT (day, metric, dimension) DO UPDATE SET value = daily_metrics.value + EXCLUDED.value;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION clients_daily_metrics_trigger() RETURNS trigger AS $$
+    DECLARE
+        today date := (now() AT TIME ZONE 'UTC')::date;
+        old_count int := 0;
+        new_count int := 0;
+        old_status varchar;
+        new_status varchar;
+        old_pending boolean := false;
+        new_pending boolean := false;
+        old_admin varchar;
+        new_admin varchar;
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            old_count := 1;
+            old_status := OLD.status;
+            old_pending := COALESCE(OLD.payment_status IN ('pending', 'partial'), false);
+            old_admin := OLD.assigned_admin_id::text;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            new_count := 1;
+            new_status := NEW.status;
+            new_pending := COALESCE(NEW.payment_status IN ('pending', 'partial'), false);
+            new_admin := NEW.assigned_admin_id::text;
+        END IF;
+
+        IF old_count <> new_count THEN
+            PERFORM bump_daily_metric(today, 'clients', '', new_count - old_count);
+        END IF;
+        IF old_status IS DISTINCT FROM new_status THEN
+            IF old_status IS NOT NULL THEN
+                PERFORM bump_daily_metric(today, 'clients_by_status', old_status, -1);
+            END IF;
+            IF new_status IS NOT NULL THEN
+                PERFORM bump_daily_metric(today, 'clients_by_status', new_status, 1);
+            END IF;
+        END IF;
+        IF old_pending <> new_pending THEN
+            PERFORM bump_daily_metric(today, 'clients_pending_payment', '', CASE WHEN new_pending THEN 1 ELSE -1 END);
+        END IF;
+        IF old_admin IS DISTINCT FROM new_admin THEN
+            IF old_admin IS NOT NULL THEN
+                PERFORM bump_daily_metric(today, 'clients_by_admin', old_admin, -1);
+            END IF;
+            IF new_admin IS NOT NULL THEN
+                PERFORM bump_daily_metric(today, 'clients_by_admin', new_admin, 1);
+            END IF;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION documents_daily_metrics_trigger() RETURNS trigger AS $$
+    DECLARE
+        old_pending boolean := false;
+        new_pending boolean := false;
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            old_pending := COALESCE(OLD.status IN ('pending', 'missing'), false);
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            new_pending := COALESCE(NEW.status IN ('pending', 'missing'), false);
+        END IF;
+        IF old_pending <> new_pending THEN
+            PERFORM bump_daily_metric(
+                (now() AT TIME ZONE 'UTC')::date, 'documents_pending', '',
+                CASE WHEN new_pending THEN 1 ELSE -1 END
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE OR REPLACE FUNCTION payments_daily_metrics_trigger() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM bump_daily_metric((OLD.created_at AT TIME ZONE 'UTC')::date, 'revenue', '', -OLD.amount);
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM bump_daily_metric((NEW.created_at AT TIME ZONE 'UTC')::date, 'revenue', '', NEW.amount);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    "DROP TRIGGER IF EXISTS trg_clients_daily_metrics ON clients",
+    """
+    CREATE TRIGGER trg_clients_daily_metrics
+    AFTER INSERT OR DELETE OR UPDATE OF status, payment_status, assigned_admin_id ON clients
+    FOR EACH ROW EXECUTE FUNCTION clients_daily_metrics_trigger()
+    """,
+    "DROP TRIGGER IF EXISTS trg_documents_daily_metrics ON documents",
+    """
+    CREATE TRIGGER trg_documents_daily_metrics
+    AFTER INSERT OR DELETE OR UPDATE OF status ON documents
+    FOR EACH ROW EXECUTE FUNCTION documents_daily_metrics_trigger()
+    """,
+    "DROP TRIGGER IF EXISTS trg_payments_daily_metrics ON payments",
+    """
+    CREATE TRIGGER trg_payments_daily_metrics
+    AFTER INSERT OR DELETE OR UPDATE OF amount, created_at ON payments
+    FOR EACH ROW EXECUTE FUNCTION payments_daily_metrics_trigger()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION rebuild_daily_metrics() RETURNS void AS $$
+    BEGIN
+        LOCK TABLE clients, documents, payments IN SHARE MODE;
+        DELETE FROM daily_metrics;
+        INSERT INTO daily_metrics (day, metric, dimension, value)
+        SELECT (created_at AT TIME ZONE 'UTC')::date, 'clients', '', count(*)
+        FROM clients GROUP BY 1
+        UNION ALL
+        SELECT (created_at AT TIME ZONE 'UTC')::date, 'clients_by_status', status, count(*)
+        FROM clients GROUP BY 1, 3
+        UNION ALL
+        SELECT (created_at AT TIME ZONE 'UTC')::date, 'clients_pending_payment', '', count(*)
+        FROM clients WHERE payment_status IN ('pending', 'partial') GROUP BY 1
+        UNION ALL
+        SELECT (created_at AT TIME ZONE 'UTC')::date, 'clients_by_admin', assigned_admin_id::text, count(*)
+        FROM clients WHERE assigned_admin_id IS NOT NULL GROUP BY 1, 3
+        UNION ALL
+        SELECT (created_at AT TIME ZONE 'UTC')::date, 'documents_pending', '', count(*)
+        FROM documents WHERE status IN ('pending', 'missing') GROUP BY 1
+        UNION ALL
+        SELECT (created_at AT TIME ZONE 'UTC')::date, 'revenue', '', sum(amount)
+        FROM payments GROUP BY 1;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+]
+
+
+async def install_rollups(conn) -> None:
+    """Create the rollup functions and triggers, then rebuild daily_metrics"""
+    for statement in ROLLUP_SQL:
+        await conn.execute(text(statement))
+    await conn.execute(text("SELECT rebuild_daily_metrics()"))
+
+
+# ============================================================================
+# DASHBOARD
+# ============================================================================
+
+async def load_analytics(db: AsyncSession) -> Dict[str, Any]:
+    """Assemble the AnalyticsResponse fields from daily_metrics"""
+    totals: Dict[Tuple[str, str], float] = {}
+    result = await db.execute(text("""
+        SELECT metric, dimension, SUM(value) AS value
+        FROM daily_metrics
+        WHERE metric <> 'revenue'
+        GROUP BY metric, dimension
+        HAVING SUM(value) <> 0
+    """))
+    for row in result:
+        totals[(row.metric, row.dimension)] = row.value
+
+    six_months_ago = (datetime.utcnow() - timedelta(days=180)).date()
+    result = await db.execute(
+        text("""
+            SELECT
+                date_trunc('month', day)::date AS month,
+                SUM(value) AS revenue
+            FROM daily_metrics
+            WHERE metric = 'revenue' AND day >= :since
+            GROUP BY 1
+            ORDER BY 1
+        """),
+        {"since": six_months_ago}
+    )
+    monthly_revenue = [
+        {"month": MONTH_NAMES[row.month.month - 1], "revenue": float(row.revenue or 0)}
+        for row in result
+    ]
+    total_revenue = await db.execute(
+        text("SELECT COALESCE(SUM(value), 0) FROM daily_metrics WHERE metric = 'revenue'")
+    )
+
+    admins = (await db.execute(
+        text("SELECT id::text AS id, name FROM admin_users WHERE is_active = true")
+    )).all()
+
+    clients_by_status = [
+        {"status": dimension, "count": int(value)}
+        for (metric, dimension), value in totals.items()
+        if metric == "clients_by_status"
+    ]
+
+    return {
+        "total_clients": int(totals.get(("clients", ""), 0)),
+        "total_admins": len(admins),
+        "pending_documents": int(totals.get(("documents_pending", ""), 0)),
+        "pending_payments": int(totals.get(("clients_pending_payment", ""), 0)),
+        "completed_filings": sum(
+            item["count"] for item in clients_by_status if item["status"] in COMPLETED_STATUSES
+        ),
+        "total_revenue": float(total_revenue.scalar() or 0),
+        "monthly_revenue": monthly_revenue,
+        "clients_by_status": clients_by_status,
+        "admin_workload": [
+            {"name": admin.name, "clients": int(totals.get(("clients_by_admin", admin.id), 0))}
+            for admin in admins
+        ],
+    }
+
+
+class AnalyticsCache:
+    """
+    Two-tier cache of the assembled dashboard payload
+
+    Writes to clients, documents, payments or admins call invalidate(),
+    which bumps a version counter in Redis; every worker compares its local
+    copy against that version, so an invalidation on one worker is seen by
+    all of them on their next request. client-api's writes to clients are
+    picked up through change_listener.py. Without Redis the local copy
+    simply expires after ANALYTICS_LOCAL_TTL.
+    """
+
+    def __init__(self):
+        self._local: Optional[Tuple[float, Any, Dict[str, Any]]] = None
+
+    async def get(self, db: AsyncSession) -> Dict[str, Any]:
+        version = await cache.get(ANALYTICS_VERSION_KEY)
+        local = self._local
+        if local and local[0] > time.monotonic() and local[1] == version:
+            return local[2]
+
+        key = f"{ANALYTICS_CACHE_KEY}:{version or 0}"
+        payload = await cache.get(key)
+        if payload is None:
+            payload = await load_analytics(db)
+            await cache.set(key, payload, ANALYTICS_CACHE_TTL)
+
+        self._local = (time.monotonic() + ANALYTICS_LOCAL_TTL, version, payload)
+        return payload
+
+    async def invalidate(self) -> None:
+        self._local = None
+        await cache.increment(ANALYTICS_VERSION_KEY)
+
+
+analytics_cache = AnalyticsCache()
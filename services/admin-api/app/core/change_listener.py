@@ -0,0 +1,97 @@
+"""
+Cache invalidation for writes made outside admin-api
+
+The client-api outbox worker (services/client-api/shared/sync_to_admin.py)
+creates and updates clients in the shared database without going through
+the admin-api routes that invalidate the dashboard caches. It sends
+pg_notify('admin_data_changed', <table>) inside the same transaction, so a
+notification is delivered exactly when the change commits.
+
+ChangeListener keeps one asyncpg connection LISTENing on that channel and
+runs the invalidators registered for the table. Notifications sent while
+it is disconnected are lost, so every (re)connect invalidates everything
+once.
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.analytics_rollup import analytics_cache
+from app.core.search import invalidate_search
+
+logger = logging.getLogger(__name__)
+
+ADMIN_CHANGES_CHANNEL = "admin_data_changed"
+RECONNECT_DELAY = 5  # seconds
+
+# table named in the notification -> caches to drop
+INVALIDATORS: Dict[str, List[Callable[[], Awaitable[None]]]] = {
+    "clients": [analytics_cache.invalidate, lambda: invalidate_search("clients")],
+}
+
+
+def _listener_dsn() -> str:
+    """settings.DATABASE_URL as a plain asyncpg DSN"""
+    return make_url(settings.DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class ChangeListener:
+    """Background LISTEN on ADMIN_CHANGES_CHANNEL"""
+
+    def __init__(self, dsn: Optional[str] = None):
+        self.dsn = dsn
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, *self._pending, return_exceptions=True)
+        self._task = None
+
+    async def invalidate(self, table: str) -> None:
+        for invalidator in INVALIDATORS.get(table, []):
+            try:
+                await invalidator()
+            except Exception as e:
+                logger.warning(f"Cache invalidation for {table} failed: {e}")
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        task = asyncio.create_task(self.invalidate(payload))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _run(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn or _listener_dsn())
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(ADMIN_CHANGES_CHANNEL, self._on_notification)
+                logger.info(f"Listening for {ADMIN_CHANGES_CHANNEL} notifications")
+
+                for table in INVALIDATORS:
+                    await self.invalidate(table)
+                await closed.wait()
+                logger.warning("Change listener connection closed; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Change listener failed: {e}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+
+change_listener = ChangeListener()
@@ -0,0 +1,216 @@
+"""
+Client and document search
+
+Typeahead search for the admin dashboard, backed by two kinds of index:
+- pg_trgm GIN indexes on the searched columns, so substring ILIKE filters
+  no longer scan the whole table
+- GIN indexes on a 'simple' tsvector per table, for ranked word-prefix
+  matching ("john sm" finds "Smith, John")
+
+The tsvector expressions below are the exact expressions indexed by
+setup_database.py; queries must use them verbatim for the planner to pick
+the index.
+
+Once a query has word characters, matching is monotonic in it: appending
+characters can only narrow the result set. The /search endpoint relies on
+this to answer a keystroke from the cached result of the previous one when
+that was already empty. A query without word characters (e.g. "+(") runs
+only its ILIKE branch, so appending a word character can widen the result
+and its empty result is never reused that way.
+
+Cached results are dropped on writes made through admin-api and, for
+clients written by the client-api outbox, by change_listener.py.
+"""
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import or_, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.redis_cache import cache
+
+
+MIN_QUERY_LENGTH = 2
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", 30))  # seconds
+
+CLIENT_SEARCH_VECTOR = (
+    "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(email, '') || ' ' || coalesce(phone, ''))"
+)
+DOCUMENT_SEARCH_VECTOR = "to_tsvector('simple', coalesce(name, ''))"
+
+# (index name, CREATE INDEX statement); pg_trgm must be installed first
+SEARCH_INDEXES = [
+    ("idx_clients_name_trgm", "CREATE INDEX IF NOT EXISTS idx_clients_name_trgm ON clients USING gin (name gin_trgm_ops)"),
+    ("idx_clients_email_trgm", "CREATE INDEX IF NOT EXISTS idx_clients_email_trgm ON clients USING gin (email gin_trgm_ops)"),
+    ("idx_clients_phone_trgm", "CREATE INDEX IF NOT EXISTS idx_clients_phone_trgm ON clients USING gin (phone gin_trgm_ops)"),
+    ("idx_clients_search_vector", f"CREATE INDEX IF NOT EXISTS idx_clients_search_vector ON clients USING gin (({CLIENT_SEARCH_VECTOR}))"),
+    ("idx_documents_name_trgm", "CREATE INDEX IF NOT EXISTS idx_documents_name_trgm ON documents USING gin (name gin_trgm_ops)"),
+    ("idx_documents_search_vector", f"CREATE INDEX IF NOT EXISTS idx_documents_search_vector ON documents USING gin (({DOCUMENT_SEARCH_VECTOR}))"),
+]
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace (cache keys, prefix lookups)"""
+    return " ".join(query.lower().split())
+
+
+def prefix_tsquery(query: str) -> Optional[str]:
+    """
+    to_tsquery() input matching every word of query as a prefix
+    ("john sm" -> "john:* & sm:*"); None if query has no words
+    """
+    words = _WORD.findall(query.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def like_pattern(query: str) -> str:
+    """Substring ILIKE pattern with the LIKE wildcards in query escaped"""
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+# ============================================================================
+# LIST ENDPOINT FILTERS
+# ============================================================================
+
+def client_search_condition(Client, query: str):
+    """
+    Filter for the clients list search box: word-prefix match on
+    name/email/phone, or a substring of name or email (the previous
+    ILIKE behaviour, now served by the trigram indexes)
+    """
+    pattern = like_pattern(query)
+    conditions = [
+        Client.name.ilike(pattern),
+        Client.email.ilike(pattern),
+    ]
+    tsquery = prefix_tsquery(query)
+    if tsquery:
+        conditions.append(
+            text(f"{CLIENT_SEARCH_VECTOR} @@ to_tsquery('simple', :client_tsquery)")
+            .bindparams(client_tsquery=tsquery)
+        )
+    return or_(*conditions)
+
+
+def document_search_condition(Document, query: str):
+    """Filter for the documents list search box (see client_search_condition)"""
+    conditions = [Document.name.ilike(like_pattern(query))]
+    tsquery = prefix_tsquery(query)
+    if tsquery:
+        conditions.append(
+            text(f"{DOCUMENT_SEARCH_VECTOR} @@ to_tsquery('simple', :document_tsquery)")
+            .bindparams(document_tsquery=tsquery)
+        )
+    return or_(*conditions)
+
+
+# ============================================================================
+# RANKED SEARCH
+# ============================================================================
+
+def _word_prefix_terms(vector: str, tsquery: Optional[str]) -> Tuple[str, str]:
+    """
+    (rank term, match condition) of the word-prefix part of a ranked search,
+    each ready to be followed by the ILIKE part; empty without a tsquery
+    """
+    if not tsquery:
+        return "", ""
+    return (
+        f"ts_rank({vector}, to_tsquery('simple', :tsquery)) + ",
+        f"{vector} @@ to_tsquery('simple', :tsquery) OR ",
+    )
+
+
+async def search_clients(db: AsyncSession, query: str, limit: int) -> List[Dict[str, Any]]:
+    """Clients matching query, best match first"""
+    tsquery = prefix_tsquery(query)
+    word_rank, word_match = _word_prefix_terms(CLIENT_SEARCH_VECTOR, tsquery)
+
+    result = await db.execute(
+        text(f"""
+            SELECT
+                id::text AS id, name, email, phone, status,
+                {word_rank}GREATEST(similarity(name, :query), similarity(email, :query)) AS rank
+            FROM clients
+            WHERE {word_match}name ILIKE :pattern
+               OR email ILIKE :pattern
+               OR phone ILIKE :pattern
+            ORDER BY rank DESC, created_at DESC
+            LIMIT :limit
+        """),
+        {"tsquery": tsquery, "query": query, "pattern": like_pattern(query), "limit": limit}
+    )
+    return [dict(row._mapping) for row in result]
+
+
+async def search_documents(db: AsyncSession, query: str, limit: int) -> List[Dict[str, Any]]:
+    """Documents whose name matches query, best match first"""
+    tsquery = prefix_tsquery(query)
+    word_rank, word_match = _word_prefix_terms(DOCUMENT_SEARCH_VECTOR, tsquery)
+
+    result = await db.execute(
+        text(f"""
+            SELECT
+                id::text AS id, name, filing_id::text AS filing_id, document_type, status,
+                {word_rank}similarity(name, :query) AS rank
+            FROM documents
+            WHERE {word_match}name ILIKE :pattern
+            ORDER BY rank DESC, created_at DESC
+            LIMIT :limit
+        """),
+        {"tsquery": tsquery, "query": query, "pattern": like_pattern(query), "limit": limit}
+    )
+    return [dict(row._mapping) for row in result]
+
+
+SEARCHERS = {
+    "clients": search_clients,
+    "documents": search_documents,
+}
+
+
+def search_cache_key(kind: str, limit: int, normalized: str) -> str:
+    return f"search:{kind}:{limit}:{normalized}"
+
+
+async def cached_search(db: AsyncSession, kind: str, query: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    Run one searcher through the Redis cache
+
+    Each keystroke of a typeahead is a new query; if the previous keystroke
+    (query minus its last character) has word characters and is cached with
+    no results, this one cannot match anything either and the database is
+    skipped.
+    """
+    normalized = normalize_query(query)
+    key = search_cache_key(kind, limit, normalized)
+
+    cached = await cache.get(key)
+    if cached is not None:
+        return cached
+
+    previous = normalize_query(normalized[:-1])
+    if (
+        len(previous) >= MIN_QUERY_LENGTH
+        and prefix_tsquery(previous) is not None
+        and await cache.get(search_cache_key(kind, limit, previous)) == []
+    ):
+        results = []
+    else:
+        results = await SEARCHERS[kind](db, normalized, limit)
+        for item in results:
+            item["rank"] = round(float(item["rank"]), 4)
+
+    await cache.set(key, results, SEARCH_CACHE_TTL)
+    return results
+
+
+async def invalidate_search(kind: str) -> None:
+    """Drop cached results for one kind after a write"""
+    await cache.delete_pattern(f"search:{kind}:*")
@@ -1,13 +1,25 @@
 """
 Utility functions for the application
 """
-from typing import Optional, Tuple
+import base64
+import binascii
+import os
+import uuid
+from typing import Any, Callable, List, Optional, Tuple
+from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, select
+from sqlalchemy import func, select, text, tuple_, literal
+from sqlalchemy.sql import Select
+from app.core.redis_cache import cache
 from app.models.audit_log import AuditLog
 from datetime import datetime
 
 
+# Unfiltered totals above this many rows come from pg_class.reltuples instead of COUNT(*)
+APPROXIMATE_COUNT_THRESHOLD = int(os.getenv("APPROXIMATE_COUNT_THRESHOLD", 100000))
+COUNT_CACHE_TTL = int(os.getenv("COUNT_CACHE_TTL", 30))  # seconds
+
+
 async def create_audit_log(
     db: AsyncSession,
     action: str,
@@ -69,3 +81,193 @@ def calculate_pagination(page: int, page_size: int, total: int) -> dict:
         "has_prev": page > 1,
     }
 
+
+
+def encode_cursor(created_at: datetime, row_id) -> str:
+    """
+    Encode a keyset position (created_at, id) as an opaque cursor string
+    """
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_cursor back into (created_at, id)
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        if "\x00" in row_id:
+            raise ValueError("NUL in cursor id")
+        return datetime.fromisoformat(created_at), row_id
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_condition(cursor: str, created_at_column, id_column):
+    """
+    WHERE condition selecting rows after the cursor in
+    (created_at DESC, id DESC) order
+    """
+    created_at, row_id = decode_cursor(cursor)
+    try:
+        row_id = id_column.type.python_type(row_id)
+    except (ValueError, NotImplementedError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return tuple_(created_at_column, id_column) < tuple_(
+        literal(created_at, created_at_column.type),
+        literal(row_id, id_column.type),
+    )
+
+
+def keyset_sql(
+    cursor: str,
+    created_at_expr: str,
+    id_expr: str,
+    params: dict,
+    id_type: Callable[[str], Any] = uuid.UUID,
+) -> str:
+    """
+    Raw SQL counterpart of keyset_condition for text() queries
+    
+    Adds the :cursor_created_at / :cursor_id bind values to params and
+    returns the condition to AND into the WHERE clause. The cursor id is
+    converted with id_type (the id column's Python type) first, so a forged
+    cursor is a 400 rather than a database error.
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    created_at, row_id = decode_cursor(cursor)
+    try:
+        row_id = id_type(row_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    params["cursor_created_at"], params["cursor_id"] = created_at, row_id
+    return f"({created_at_expr}, {id_expr}) < (:cursor_created_at, :cursor_id)"
+
+
+def split_page(
+    rows: List[Any],
+    limit: Optional[int],
+    key: Callable[[Any], Tuple[datetime, Any]],
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim a page fetched with LIMIT limit + 1 and build its next cursor
+    
+    Args:
+        rows: Rows in (created_at DESC, id DESC) order, at most limit + 1
+        limit: Page size (None means the query was not limited)
+        key: Returns (created_at, id) for a row
+    
+    Returns:
+        (rows of this page, cursor for the next page or None on the last page)
+    """
+    if limit is None or len(rows) <= limit:
+        return list(rows), None
+    rows = list(rows[:limit])
+    return rows, encode_cursor(*key(rows[-1]))
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    created_at_column,
+    id_column,
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+    offset: int = 0,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of an ORM query ordered by (created_at DESC, id DESC)
+    
+    With a cursor the page is located by an index seek; offset is only
+    applied when no cursor is given (older clients paging by number).
+    
+    Returns:
+        (entities on this page, next cursor or None)
+    """
+    if cursor:
+        query = query.where(keyset_condition(cursor, created_at_column, id_column))
+    elif offset:
+        query = query.offset(offset)
+    
+    query = query.order_by(created_at_column.desc(), id_column.desc())
+    if limit is not None:
+        query = query.limit(limit + 1)
+    
+    result = await db.execute(query)
+    return split_page(
+        result.scalars().all(),
+        limit,
+        lambda item: (getattr(item, created_at_column.key), getattr(item, id_column.key)),
+    )
+
+
+async def approximate_count(db: AsyncSession, table: str) -> Optional[int]:
+    """
+    Planner row estimate for a table (None if unknown or never analyzed)
+    """
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table},
+    )
+    estimate = result.scalar()
+    return estimate if estimate is not None and estimate >= 0 else None
+
+
+def count_cache_key(prefix: str, **filters) -> str:
+    """
+    Redis key for a cached total, covering only the filters that are set
+    """
+    parts = [f"{name}={value}" for name, value in sorted(filters.items()) if value is not None]
+    return ":".join(["count", prefix, *parts])
+
+
+async def count_rows(
+    db: AsyncSession,
+    count_query,
+    params: Optional[dict] = None,
+    table: Optional[str] = None,
+    cache_key: Optional[str] = None,
+) -> int:
+    """
+    Total for a list endpoint
+    
+    Args:
+        db: Database session
+        count_query: SELECT COUNT(*) statement (ORM or text())
+        params: Bind values for a text() count query
+        table: Pass for unfiltered listings; large tables then use the
+            pg_class estimate instead of a full COUNT(*)
+        cache_key: Cache the exact count in Redis for COUNT_CACHE_TTL seconds
+    """
+    if table:
+        estimate = await approximate_count(db, table)
+        if estimate is not None and estimate >= APPROXIMATE_COUNT_THRESHOLD:
+            return estimate
+    
+    if cache_key:
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            return int(cached)
+    
+    result = await db.execute(count_query, params or {})
+    total = result.scalar() or 0
+    
+    if cache_key:
+        await cache.set(cache_key, total, COUNT_CACHE_TTL)
+    return total
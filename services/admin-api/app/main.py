@@ -8,6 +8,7 @@ import os
 from app.core.config import settings
 from app.core.database import init_db, close_db
 from app.core.redis_cache import cache
+from app.core.change_listener import change_listener
 from app.api.v1 import api_router
 from app.middleware.cors_middleware import ProductionCORSMiddleware
 
@@ -89,8 +90,10 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Admin sync: could not auto-create clients from users: {e}")
     await cache.connect()
+    change_listener.start()
     yield
     # Shutdown
+    await change_listener.stop()
     await cache.disconnect()
     await close_db()
 
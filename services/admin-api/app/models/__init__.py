@@ -8,6 +8,7 @@ from .payment import Payment
 from .audit_log import AuditLog
 from .cost_estimate import CostEstimate
 from .note import Note
+from .daily_metric import DailyMetric
 
 __all__ = [
     "AdminUser",
@@ -17,6 +18,7 @@ __all__ = [
     "AuditLog",
     "CostEstimate",
     "Note",
+    "DailyMetric",
 ]
 
 
@@ -0,0 +1,21 @@
+"""
+Daily metric rollup model
+"""
+from sqlalchemy import Column, String, Date, Float
+
+from app.core.database import Base
+
+
+class DailyMetric(Base):
+    """
+    Per-day deltas of the dashboard aggregates, maintained by database
+    triggers (see app.core.analytics_rollup). A metric's current value is
+    the sum of its deltas over all days.
+    """
+    __tablename__ = "daily_metrics"
+    
+    day = Column(Date, primary_key=True)
+    metric = Column(String(50), primary_key=True)
+    dimension = Column(String(100), primary_key=True, default="")
+    
+    value = Column(Float, nullable=False, default=0.0)
@@ -30,5 +30,6 @@ class AuditLogListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None
 
 
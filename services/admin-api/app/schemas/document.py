@@ -48,5 +48,6 @@ class DocumentListResponse(BaseModel):
     """Document list response"""
     documents: list[DocumentResponse]
     total: int
+    next_cursor: Optional[str] = None
 
 
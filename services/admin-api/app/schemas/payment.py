@@ -45,5 +45,6 @@ class PaymentListResponse(BaseModel):
     total: int
     total_revenue: float
     avg_payment: float
+    next_cursor: Optional[str] = None
 
 
@@ -29,4 +29,5 @@ class T1FormListResponse(BaseModel):
     total: int
     offset: int
     limit: int
+    next_cursor: Optional[str] = None
 
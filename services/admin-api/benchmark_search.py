@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Client Search Benchmark
+=======================
+Seeds a temporary clients table (default 100,000 rows) in one session and
+times the dashboard search queries before and after the search indexes
+from app.core.search are built.
+
+The temporary table shadows the real clients table for this session only;
+no existing data is read or modified.
+
+Usage:
+    python benchmark_search.py [--rows N] [--repeat N]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import engine
+from app.core.search import SEARCH_INDEXES, like_pattern, search_clients
+
+
+QUERIES = ["jo", "john", "john sm", "smith@", "416-555-01", "zzqx"]
+
+SEED_SQL = """
+    INSERT INTO clients (id, name, email, phone, status, created_at)
+    SELECT
+        gen_random_uuid(),
+        first_names[1 + i % 40] || ' ' || last_names[1 + (i / 40) % 50] || ' ' || i,
+        lower(first_names[1 + i % 40]) || '.' || lower(last_names[1 + (i / 40) % 50]) || i || '@example.com',
+        '416-555-' || lpad((i % 10000)::text, 4, '0'),
+        'documents_pending',
+        now() - (i || ' seconds')::interval
+    FROM generate_series(1, :rows) AS i,
+    LATERAL (SELECT
+        ARRAY['John','Jane','Alex','Maria','Wei','Priya','Omar','Sofia','Liam','Emma',
+              'Noah','Olivia','Ethan','Ava','Lucas','Mia','Mason','Isla','Logan','Zoe',
+              'Arjun','Chen','Fatima','Diego','Hana','Ivan','Kofi','Lena','Mateo','Nadia',
+              'Oscar','Paula','Quinn','Rosa','Sami','Tara','Uma','Victor','Wen','Yusuf'] AS first_names,
+        ARRAY['Smith','Brown','Tremblay','Martin','Roy','Wilson','Macdonald','Gagnon','Johnson','Taylor',
+              'Cote','Campbell','Anderson','Leblanc','Lee','Jones','White','Williams','Miller','Thompson',
+              'Gauthier','Young','Van','Morin','Bouchard','Scott','Stewart','Belanger','Reid','Pelletier',
+              'Moore','Lavoie','King','Clark','Singh','Patel','Wong','Chan','Nguyen','Kim',
+              'Khan','Ali','Sharma','Gill','Li','Zhang','Wang','Liu','Chen','Garcia'] AS last_names
+    ) names
+"""
+
+LEGACY_LIST_SQL = """
+    SELECT id, name, email FROM clients
+    WHERE name ILIKE :pattern OR email ILIKE :pattern
+    ORDER BY created_at DESC LIMIT 100
+"""
+
+LEGACY_COUNT_SQL = "SELECT COUNT(*) FROM clients WHERE name ILIKE :pattern OR email ILIKE :pattern"
+
+
+async def _time(fn, repeat: int) -> float:
+    """Median wall time of fn() in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def _measure(session: AsyncSession, repeat: int) -> dict:
+    results = {}
+    for query in QUERIES:
+        params = {"pattern": like_pattern(query)}
+
+        async def legacy():
+            await session.execute(text(LEGACY_LIST_SQL), params)
+            await session.execute(text(LEGACY_COUNT_SQL), params)
+
+        async def ranked():
+            await search_clients(session, query, 10)
+
+        results[query] = (await _time(legacy, repeat), await _time(ranked, repeat))
+    return results
+
+
+async def run(rows: int, repeat: int) -> None:
+    async with engine.connect() as conn:
+        session = AsyncSession(bind=conn)
+        await session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await session.execute(text("""
+            CREATE TEMP TABLE clients (
+                id uuid PRIMARY KEY,
+                name varchar(255) NOT NULL,
+                email varchar(255) NOT NULL,
+                phone varchar(20),
+                status varchar(50) NOT NULL,
+                created_at timestamptz NOT NULL
+            ) ON COMMIT PRESERVE ROWS
+        """))
+
+        start = time.perf_counter()
+        await session.execute(text(SEED_SQL), {"rows": rows})
+        await session.execute(text("ANALYZE clients"))
+        print(f"Seeded {rows:,} clients in {time.perf_counter() - start:.1f}s")
+
+        before = await _measure(session, repeat)
+
+        start = time.perf_counter()
+        for index_name, create_sql in SEARCH_INDEXES:
+            if index_name.startswith("idx_clients_"):
+                await session.execute(text(create_sql))
+        await session.execute(text("ANALYZE clients"))
+        print(f"Built client search indexes in {time.perf_counter() - start:.1f}s")
+
+        after = await _measure(session, repeat)
+        await session.rollback()
+        await session.close()
+
+    print()
+    print(f"{'query':<14} {'ILIKE+count':>12} {'ranked':>10} {'ILIKE+count':>12} {'ranked':>10}")
+    print(f"{'':<14} {'(no index, ms)':>23} {'(indexed, ms)':>23}")
+    print("-" * 62)
+    for query in QUERIES:
+        print(f"{query:<14} {before[query][0]:>12.2f} {before[query][1]:>10.2f} "
+              f"{after[query][0]:>12.2f} {after[query][1]:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeat))
@@ -8,9 +8,11 @@ import sys
 from sqlalchemy import text, Index, inspect
 from app.core.database import engine, Base
 from app.core.config import settings
+from app.core.search import SEARCH_INDEXES
+from app.core.analytics_rollup import install_rollups
 from app.models import (
     admin_user, client, document, payment, 
-    cost_estimate, note, audit_log
+    cost_estimate, note, audit_log, daily_metric
 )
 from app.core.config import settings
 
@@ -66,6 +68,21 @@ async def create_indexes():
         # Cost Estimates indexes
         ("cost_estimates", "client_id", "idx_cost_estimates_client_id", False),
         ("cost_estimates", "status", "idx_cost_estimates_status", False),
+        
+        # Keyset pagination: list endpoints order by (created_at, id) DESC and
+        # seek past the cursor, optionally behind an equality filter
+        ("clients", ["created_at", "id"], "idx_clients_created_id", False),
+        ("audit_logs", ["timestamp", "id"], "idx_audit_logs_timestamp_id", False),
+        ("documents", ["created_at", "id"], "idx_documents_created_id", False),
+        ("documents", ["filing_id", "created_at", "id"], "idx_documents_filing_created_id", False),
+        ("payments", ["created_at", "id"], "idx_payments_created_id", False),
+        ("payments", ["client_id", "created_at", "id"], "idx_payments_client_created_id", False),
+        
+        # Client-api tables listed by the admin API (same database)
+        ("files", ["created_at", "id"], "idx_files_created_id", False),
+        ("files", ["user_id", "created_at", "id"], "idx_files_user_created_id", False),
+        ("chat_messages", ["user_id", "created_at", "id"], "idx_chat_messages_user_created_id", False),
+        ("notifications", ["user_id", "created_at", "id"], "idx_notifications_user_created_id", False),
     ]
     
     async with engine.begin() as conn:
@@ -107,6 +124,40 @@ async def create_indexes():
     print("\n✅ Indexes created successfully")
 
 
+async def create_search_indexes():
+    """Create pg_trgm and full-text GIN indexes used by client/document search"""
+    print("\n🔎 Creating search indexes...")
+    
+    async with engine.begin() as conn:
+        try:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        except Exception as e:
+            print(f"   ⚠️  Could not enable pg_trgm (search indexes skipped): {e}")
+            return
+    
+    for index_name, create_sql in SEARCH_INDEXES:
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text(create_sql))
+            print(f"   ✅ Created index: {index_name}")
+        except Exception as e:
+            print(f"   ⚠️  Error creating index {index_name}: {e}")
+    
+    print("✅ Search indexes created successfully")
+
+
+async def create_analytics_rollups():
+    """Install daily_metrics triggers and rebuild the rollups from the base tables"""
+    print("\n📊 Installing analytics rollups...")
+    
+    try:
+        async with engine.begin() as conn:
+            await install_rollups(conn)
+        print("✅ Analytics rollups installed and rebuilt")
+    except Exception as e:
+        print(f"   ⚠️  Error installing analytics rollups: {e}")
+
+
 async def create_constraints():
     """Create foreign key constraints and check constraints"""
     print("\n🔗 Creating database constraints...")
@@ -235,7 +286,7 @@ async def analyze_tables():
     
     tables = [
         "admin_users", "clients", "documents", "payments",
-        "notes", "audit_logs", "cost_estimates"
+        "notes", "audit_logs", "cost_estimates", "daily_metrics"
     ]
     
     async with engine.begin() as conn:
@@ -298,15 +349,21 @@ async def main():
         # Step 2: Create indexes for performance
         await create_indexes()
         
-        # Step 3: Create constraints
-        await create_constraints()
+        # Step 3: Create search indexes
+        await create_search_indexes()
         
-        # Step 4: Analyze tables
-        await analyze_tables()
+        # Step 4: Create constraints
+        await create_constraints()
         
         # Step 5: Cleanup dummy data
         await cleanup_dummy_data()
         
+        # Step 6: Install analytics triggers and rebuild daily_metrics
+        await create_analytics_rollups()
+        
+        # Step 7: Analyze tables
+        await analyze_tables()
+        
         print("\n" + "=" * 60)
         print("✅ Database setup complete!")
         print("=" * 60)
@@ -0,0 +1,215 @@
+"""Add t1_form_index: unified, trigger-maintained T1 form listing
+
+The admin dashboard lists T1 forms from two schemas:
+- legacy/encrypted: t1_personal_forms
+- new business schema: t1_forms_main + t1_personal_info
+
+Listing them through a UNION ALL derived table meant every page (and its
+COUNT) was a full scan. t1_form_index holds one row per form with the listed
+columns, kept current by row triggers on every source table, so the admin
+list can filter and keyset-paginate on plain indexes.
+
+Revision ID: a3c1e7f20b5d
+Revises: 20241218_t1_business
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c1e7f20b5d'
+down_revision = '20241218_t1_business'
+branch_labels = None
+depends_on = None
+
+
+# Rows predating server defaults may lack created_at; the keyset order needs a value
+PERSONAL_FORMS_SELECT = """
+    SELECT
+        'personal', t1.id, t1.user_id, t1.tax_year, t1.status,
+        t1.first_name, t1.last_name, COALESCE(t1.email, u.email),
+        COALESCE(t1.created_at, 'epoch'::timestamptz), t1.updated_at, t1.submitted_at
+    FROM t1_personal_forms t1
+    LEFT JOIN users u ON u.id = t1.user_id
+"""
+
+FORMS_MAIN_SELECT = """
+    SELECT
+        'main', tm.id, tm.user_id, EXTRACT(YEAR FROM tm.created_at)::int, tm.status,
+        pi.first_name, pi.last_name, COALESCE(pi.email, u.email),
+        COALESCE(tm.created_at, 'epoch'::timestamptz), tm.updated_at,
+        CASE WHEN tm.status = 'submitted' THEN tm.updated_at ELSE NULL END
+    FROM t1_forms_main tm
+    LEFT JOIN t1_personal_info pi ON pi.form_id = tm.id
+    LEFT JOIN users u ON u.id = tm.user_id
+"""
+
+INDEX_COLUMNS = (
+    "source, id, user_id, tax_year, status, first_name, last_name, "
+    "client_email, created_at, updated_at, submitted_at"
+)
+
+UPSERT_SET = """
+    user_id = EXCLUDED.user_id,
+    tax_year = EXCLUDED.tax_year,
+    status = EXCLUDED.status,
+    first_name = EXCLUDED.first_name,
+    last_name = EXCLUDED.last_name,
+    client_email = EXCLUDED.client_email,
+    created_at = EXCLUDED.created_at,
+    updated_at = EXCLUDED.updated_at,
+    submitted_at = EXCLUDED.submitted_at
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        't1_form_index',
+        sa.Column('source', sa.String(length=20), nullable=False),
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('tax_year', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('first_name', sa.String(length=100), nullable=True),
+        sa.Column('last_name', sa.String(length=100), nullable=True),
+        sa.Column('client_email', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('submitted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('source', 'id'),
+    )
+
+    # Keyset order is (created_at DESC, id DESC); each filter gets a matching prefix
+    op.execute("CREATE INDEX ix_t1_form_index_created_id ON t1_form_index (created_at DESC, id DESC)")
+    op.execute("CREATE INDEX ix_t1_form_index_status_created ON t1_form_index (status, created_at DESC, id DESC)")
+    op.execute("CREATE INDEX ix_t1_form_index_user_created ON t1_form_index (user_id, created_at DESC, id DESC)")
+    op.execute("CREATE INDEX ix_t1_form_index_client_email ON t1_form_index (lower(client_email))")
+
+    # Re-derive one form's index row from its source tables (delete it if the form is gone)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION t1_form_index_sync_personal(p_id varchar) RETURNS void AS $$
+        BEGIN
+            INSERT INTO t1_form_index ({INDEX_COLUMNS})
+            {PERSONAL_FORMS_SELECT}
+            WHERE t1.id = p_id
+            ON CONFLICT (source, id) DO UPDATE SET {UPSERT_SET};
+            IF NOT FOUND THEN
+                DELETE FROM t1_form_index WHERE source = 'personal' AND id = p_id;
+            END IF;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION t1_form_index_sync_main(p_id varchar) RETURNS void AS $$
+        BEGIN
+            INSERT INTO t1_form_index ({INDEX_COLUMNS})
+            {FORMS_MAIN_SELECT}
+            WHERE tm.id = p_id
+            ON CONFLICT (source, id) DO UPDATE SET {UPSERT_SET};
+            IF NOT FOUND THEN
+                DELETE FROM t1_form_index WHERE source = 'main' AND id = p_id;
+            END IF;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # Row triggers on every source table
+    op.execute("""
+        CREATE OR REPLACE FUNCTION t1_form_index_personal_forms_trigger() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.id IS DISTINCT FROM NEW.id) THEN
+                PERFORM t1_form_index_sync_personal(OLD.id);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM t1_form_index_sync_personal(NEW.id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION t1_form_index_forms_main_trigger() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.id IS DISTINCT FROM NEW.id) THEN
+                PERFORM t1_form_index_sync_main(OLD.id);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM t1_form_index_sync_main(NEW.id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION t1_form_index_personal_info_trigger() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND OLD.form_id IS DISTINCT FROM NEW.form_id) THEN
+                PERFORM t1_form_index_sync_main(OLD.form_id);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM t1_form_index_sync_main(NEW.form_id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION t1_form_index_users_trigger() RETURNS trigger AS $$
+        BEGIN
+            PERFORM t1_form_index_sync_personal(id) FROM t1_personal_forms WHERE user_id = NEW.id;
+            PERFORM t1_form_index_sync_main(id) FROM t1_forms_main WHERE user_id = NEW.id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    # UPDATE OF limits the triggers to statements that set a column the index carries
+    op.execute("""
+        CREATE TRIGGER trg_t1_form_index_personal_forms
+        AFTER INSERT OR DELETE OR UPDATE OF
+            id, user_id, tax_year, status, first_name, last_name, email,
+            created_at, updated_at, submitted_at
+        ON t1_personal_forms
+        FOR EACH ROW EXECUTE FUNCTION t1_form_index_personal_forms_trigger()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_t1_form_index_forms_main
+        AFTER INSERT OR DELETE OR UPDATE OF id, user_id, status, created_at, updated_at
+        ON t1_forms_main
+        FOR EACH ROW EXECUTE FUNCTION t1_form_index_forms_main_trigger()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_t1_form_index_personal_info
+        AFTER INSERT OR DELETE OR UPDATE OF form_id, first_name, last_name, email
+        ON t1_personal_info
+        FOR EACH ROW EXECUTE FUNCTION t1_form_index_personal_info_trigger()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_t1_form_index_users
+        AFTER UPDATE OF email ON users
+        FOR EACH ROW
+        WHEN (OLD.email IS DISTINCT FROM NEW.email)
+        EXECUTE FUNCTION t1_form_index_users_trigger()
+    """)
+
+    # Backfill
+    op.execute(f"INSERT INTO t1_form_index ({INDEX_COLUMNS}) {PERSONAL_FORMS_SELECT}")
+    op.execute(f"INSERT INTO t1_form_index ({INDEX_COLUMNS}) {FORMS_MAIN_SELECT}")
+    op.execute("ANALYZE t1_form_index")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_t1_form_index_users ON users")
+    op.execute("DROP TRIGGER IF EXISTS trg_t1_form_index_personal_info ON t1_personal_info")
+    op.execute("DROP TRIGGER IF EXISTS trg_t1_form_index_forms_main ON t1_forms_main")
+    op.execute("DROP TRIGGER IF EXISTS trg_t1_form_index_personal_forms ON t1_personal_forms")
+    op.execute("DROP FUNCTION IF EXISTS t1_form_index_users_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS t1_form_index_personal_info_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS t1_form_index_forms_main_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS t1_form_index_personal_forms_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS t1_form_index_sync_main(varchar)")
+    op.execute("DROP FUNCTION IF EXISTS t1_form_index_sync_personal(varchar)")
+    op.drop_table('t1_form_index')
@@ -0,0 +1,41 @@
+"""Add admin_sync_outbox for asynchronous admin dashboard sync
+
+Client-side writes (registration, T1 forms, uploads) used to sync the admin
+clients table inline, opening a new engine per call. They now add an outbox
+row in the same transaction; AdminSyncWorker drains it in batches.
+
+Revision ID: b7d2f4a91c3e
+Revises: a3c1e7f20b5d
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2f4a91c3e'
+down_revision = 'a3c1e7f20b5d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'admin_sync_outbox',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('event_type', sa.String(length=30), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('available_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_admin_sync_outbox_available', 'admin_sync_outbox', ['available_at', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_admin_sync_outbox_available', table_name='admin_sync_outbox')
+    op.drop_table('admin_sync_outbox')
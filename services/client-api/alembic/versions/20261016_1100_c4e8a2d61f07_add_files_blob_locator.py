@@ -0,0 +1,28 @@
+"""Add files.blob_locator for blob-stored ciphertext
+
+New uploads keep their raw ciphertext in a BlobStore (local filesystem or
+S3) and only the locator in Postgres. Existing rows keep their base64
+encrypted_data and remain readable; key rotation moves them to the store.
+
+Revision ID: c4e8a2d61f07
+Revises: b7d2f4a91c3e
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a2d61f07'
+down_revision = 'b7d2f4a91c3e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('files', sa.Column('blob_locator', sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('files', 'blob_locator')
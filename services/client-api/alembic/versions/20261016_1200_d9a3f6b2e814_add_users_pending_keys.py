@@ -0,0 +1,33 @@
+"""Add users.pending_* keys for resumable key rotation
+
+Key rotation now re-wraps per-file AES keys in committed batches instead of
+re-encrypting every file in one transaction. The incoming keypair is held
+in these columns until all files are re-wrapped, so an interrupted rotation
+can be resumed.
+
+Revision ID: d9a3f6b2e814
+Revises: c4e8a2d61f07
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9a3f6b2e814'
+down_revision = 'c4e8a2d61f07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('pending_public_key', sa.Text(), nullable=True))
+    op.add_column('users', sa.Column('pending_private_key', sa.Text(), nullable=True))
+    op.add_column('users', sa.Column('pending_key_salt', sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'pending_key_salt')
+    op.drop_column('users', 'pending_private_key')
+    op.drop_column('users', 'pending_public_key')
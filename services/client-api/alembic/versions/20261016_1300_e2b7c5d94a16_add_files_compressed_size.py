@@ -0,0 +1,36 @@
+"""Add files.compressed_size and a (user_id, created_at) index
+
+/api/v1/encryption/stats now aggregates in SQL instead of loading every
+file row and parsing encryption_metadata, so the compressed size becomes
+a column (backfilled from the metadata JSON). The index serves that
+aggregate and the per-user file listing.
+
+Revision ID: e2b7c5d94a16
+Revises: d9a3f6b2e814
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7c5d94a16'
+down_revision = 'd9a3f6b2e814'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('files', sa.Column('compressed_size', sa.Integer(), nullable=True))
+    op.execute("""
+        UPDATE files
+        SET compressed_size = (encryption_metadata::jsonb ->> 'compressed_size')::integer
+        WHERE encryption_metadata LIKE '{%'
+    """)
+    op.create_index('ix_files_user_id_created_at', 'files', ['user_id', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_files_user_id_created_at', table_name='files')
+    op.drop_column('files', 'compressed_size')
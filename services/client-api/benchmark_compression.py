@@ -0,0 +1,150 @@
+"""
+Document Compression Benchmark
+==============================
+Compares the compression codecs of the document encryption pipeline
+(shared/compression.py) over a corpus of sample tax documents: the T1
+form JSON, a CSV bank statement, an uncompressed text PDF, and PDF/JPEG
+scans whose bodies are already compressed. For each document it reports
+the codec choose_codec() picks, and per codec the compression time,
+full encrypt+decrypt time and compressed size.
+
+Usage:
+    python benchmark_compression.py [--repeat N] [--corpus DIR]
+
+With --corpus, every file in DIR is benchmarked instead of the built-in
+samples.
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+import zlib
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from shared import compression
+from shared.encryption import DocumentEncryption
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _t1_form() -> bytes:
+    with open(os.path.join(HERE, "T1_Personal_sample.json"), "rb") as f:
+        return f.read()
+
+
+def _bank_statement(rows: int = 5000, seed: int = 7) -> bytes:
+    """CSV statement export: dates, payees, amounts, running balance"""
+    rng = random.Random(seed)
+    payees = ["PAYROLL DEPOSIT", "HYDRO ONE", "ROGERS", "LOBLAWS #1123", "TD VISA PAYMENT",
+              "CRA TAX REFUND", "RRSP CONTRIBUTION", "INTERAC E-TRANSFER", "ESSO 4471", "RENT"]
+    balance = 5000.0
+    lines = ["date,description,debit,credit,balance"]
+    for i in range(rows):
+        amount = round(rng.uniform(5, 2500), 2)
+        credit = rng.random() < 0.2
+        balance += amount if credit else -amount
+        lines.append(f"2024-{1 + i % 12:02d}-{1 + i % 28:02d},{rng.choice(payees)},"
+                     f"{'' if credit else amount},{amount if credit else ''},{balance:.2f}")
+    return "\n".join(lines).encode()
+
+
+def _text_pdf(pages: int = 40) -> bytes:
+    """PDF with uncompressed content streams (e.g. a generated T4 slip summary)"""
+    parts = [b"%PDF-1.4\n"]
+    for page in range(pages):
+        stream = b"".join(
+            b"BT /F1 10 Tf 72 %d Td (Box %d  Employment income  %d.00) Tj ET\n" % (720 - row * 14, row, 1000 + page * row)
+            for row in range(48)
+        )
+        parts.append(b"%d 0 obj << /Length %d >> stream\n%s\nendstream endobj\n" % (page + 1, len(stream), stream))
+    parts.append(b"trailer << /Root 1 0 R >>\n%%EOF\n")
+    return b"".join(parts)
+
+
+def _scanned(header: bytes, size: int, seed: int) -> bytes:
+    """A scan: small header, then an entropy-coded (incompressible) body"""
+    return header + random.Random(seed).randbytes(size)
+
+
+def sample_corpus() -> List[Tuple[str, bytes]]:
+    text_pdf = _text_pdf()
+    return [
+        ("T1_Personal_sample.json", _t1_form()),
+        ("bank_statement_2024.csv", _bank_statement()),
+        ("t4_summary.pdf", text_pdf),
+        ("t4_summary_flate.pdf", b"%PDF-1.5\n" + zlib.compress(text_pdf, 9)),
+        ("receipt_scan.jpg", _scanned(b"\xff\xd8\xff\xe0\x00\x10JFIF\x00", 1_500_000, 1)),
+        ("notice_of_assessment.png", _scanned(b"\x89PNG\r\n\x1a\n", 800_000, 2)),
+        ("scan_without_extension", _scanned(b"", 1_000_000, 3)),
+    ]
+
+
+def load_corpus(directory: str) -> List[Tuple[str, bytes]]:
+    corpus = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                corpus.append((name, f.read()))
+    return corpus
+
+
+def _best(fn, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def run(corpus: List[Tuple[str, bytes]], repeat: int) -> None:
+    encryption = DocumentEncryption()
+    aes_key, iv = encryption.generate_document_key()
+    codecs = compression.available_codecs()
+    totals: Dict[str, List[float]] = {codec: [0.0, 0.0, 0] for codec in codecs}
+
+    print(f"Codecs available: {', '.join(codecs)}  (default: {compression.default_codec()})")
+    print()
+    print(f"{'document':<28} {'size (KB)':>10} {'chosen':>7}  {'codec':<6} "
+          f"{'compress (ms)':>13} {'enc+dec (ms)':>13} {'ratio':>6}")
+    print("-" * 92)
+    for name, data in corpus:
+        chosen = compression.choose_codec(data, filename=name)
+        for i, codec in enumerate(codecs):
+            compress_s = _best(lambda: compression.compress(data, codec), repeat)
+            round_trip_s = _best(
+                lambda: encryption.decrypt_document(
+                    encryption.encrypt_document(data, aes_key, iv, codec), aes_key, iv, codec
+                ),
+                repeat
+            )
+            compressed = len(compression.compress(data, codec))
+            totals[codec][0] += compress_s
+            totals[codec][1] += round_trip_s
+            totals[codec][2] += compressed
+
+            label = (name, f"{len(data) / 1024:.1f}", chosen) if i == 0 else ("", "", "")
+            print(f"{label[0]:<28} {label[1]:>10} {label[2]:>7}  {codec:<6} "
+                  f"{compress_s * 1000:>13.2f} {round_trip_s * 1000:>13.2f} {compressed / len(data):>6.3f}")
+
+    original = sum(len(data) for _, data in corpus)
+    pipeline_s = _best(
+        lambda: [encryption.encrypt_document(data, aes_key, iv, compression.choose_codec(data, filename=name))
+                 for name, data in corpus],
+        repeat
+    )
+    print()
+    print(f"Corpus total: {original / 1024:.1f} KB")
+    for codec, (compress_s, round_trip_s, compressed) in totals.items():
+        print(f"  {codec:<6} compress {compress_s * 1000:>9.2f} ms   enc+dec {round_trip_s * 1000:>9.2f} ms   "
+              f"ratio {compressed / original:.3f}")
+    print(f"  per-document codec selection: encrypt {pipeline_s * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--corpus", help="directory of documents to benchmark instead of the samples")
+    args = parser.parse_args()
+    run(load_corpus(args.corpus) if args.corpus else sample_corpus(), args.repeat)
@@ -6,14 +6,16 @@ All microservices combined into a single application for easier development and
 import sys
 import os
 import asyncio
+import tempfile
+import zipfile
 import uvicorn
 from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File as FastAPIFile, BackgroundTasks, Body
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, FileResponse, JSONResponse
+from fastapi.responses import RedirectResponse, FileResponse, JSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, func, delete
 from datetime import datetime, timedelta
 import uuid
 import logging
@@ -32,6 +34,7 @@ from shared.schemas import (
     FileUploadResponse, FileListResponse, ReportResponse, ReportRequest,
     MessageResponse, HealthResponse, EncryptedFileUploadResponse,
     EncryptedFileListResponse, EncryptedFileDecryptRequest, FileDecryptResponse,
+    EncryptedFileBatchDownloadRequest, EncryptionUnlockRequest, EncryptionUnlockResponse,
     EncryptionSetupRequest, EncryptionSetupResponse, KeyRotationRequest,
     FileStatsResponse, FirebaseRegister, FirebaseLogin, GoogleLogin
 )
@@ -40,7 +43,8 @@ from shared.utils import generate_otp, EmailService, S3Manager, generate_filenam
 from shared.encrypted_file_service import EncryptedFileService
 from shared.t1_routes import router as t1_router
 from shared.t1_business_routes import router as t1_business_router
-from shared.sync_to_admin import sync_file_to_admin_document
+from shared.sync_to_admin import enqueue_client_sync, enqueue_t1_form_sync, enqueue_file_sync, admin_sync_worker
+from shared.key_session import key_lock_listener
 from shared.cognito_service import get_cognito_service
 from shared.firebase_service import get_firebase_service
 
@@ -236,6 +240,8 @@ app.include_router(t1_business_router)
 # File upload configuration
 ALLOWED_FILE_TYPES = ['pdf', 'jpg', 'jpeg', 'png', 'doc', 'docx', 'xls', 'xlsx']
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+BATCH_ZIP_SPOOL_SIZE = 8 * 1024 * 1024  # batch download archives above this go to a temp file
+BATCH_ZIP_CHUNK_SIZE = 64 * 1024
 
 # ================================
 # HEALTH AND STATUS ENDPOINTS
@@ -283,6 +289,14 @@ async def health_check():
         version="1.0.0"
     )
 
+@app.get("/health/crypto", tags=["Health"])
+async def crypto_executor_metrics():
+    """
+    Crypto executor queue depth and latency per pool
+    """
+    from shared.crypto_executor import crypto_executor
+    return crypto_executor.health()
+
 @app.get("/dev/otps/{email}", tags=["Health"])
 async def get_development_otps(email: str, db: AsyncSession = Depends(get_db)):
     """
@@ -429,22 +443,17 @@ async def register_user(user_data: UserCreate, db: AsyncSession = Depends(get_db
         )
         
         db.add(new_user)
+        # Sync user to admin backend as client (committed with the user)
+        enqueue_client_sync(
+            db,
+            new_user.email,
+            first_name=new_user.first_name,
+            last_name=new_user.last_name,
+            user_id=new_user.id
+        )
         await db.commit()
         await db.refresh(new_user)
         
-        # Sync user to admin backend as client
-        try:
-            from shared.sync_to_admin import _get_or_create_client_by_email
-            await _get_or_create_client_by_email(
-                new_user.email, 
-                db_session=None,
-                first_name=new_user.first_name,
-                last_name=new_user.last_name
-            )
-            logger.info(f"Synced user {new_user.email} to admin backend as client")
-        except Exception as e:
-            logger.warning(f"Failed to sync user to admin backend: {e}")
-        
         # Log registration
         await log_user_action(db, str(new_user.id), "user_registered", "user", str(new_user.id))
         
@@ -677,17 +686,13 @@ async def login_user(login_data: UserLogin, db: AsyncSession = Depends(get_db)):
             await log_user_action(db, str(user.id), "user_login", "session", None)
             
             # Sync to admin dashboard - ensure client exists
-            try:
-                from shared.sync_to_admin import _get_or_create_client_by_email
-                await _get_or_create_client_by_email(
-                    login_data.email,
-                    db_session=None,
-                    first_name=user.first_name,
-                    last_name=user.last_name
-                )
-            except Exception as sync_error:
-                logger.warning(f"Failed to sync user login to admin: {sync_error}")
-                # Don't fail login if sync fails
+            enqueue_client_sync(
+                db,
+                login_data.email,
+                first_name=user.first_name,
+                last_name=user.last_name,
+                user_id=user.id
+            )
             
             logger.info(f"User logged in via Cognito: {login_data.email}")
             
@@ -962,22 +967,17 @@ async def verify_otp(otp_data: OTPVerify, db: AsyncSession = Depends(get_db)):
             is_active=True
         )
         db.add(user)
+        # Sync to admin backend (committed with the user)
+        enqueue_client_sync(
+            db,
+            user.email,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            user_id=user.id
+        )
         await db.commit()
         await db.refresh(user)
         logger.info(f"Created user from Firebase/OTP flow: {firebase_email}")
-        
-        # Sync to admin backend
-        try:
-            from shared.sync_to_admin import _get_or_create_client_by_email
-            await _get_or_create_client_by_email(
-                user.email,
-                db_session=None,
-                first_name=user.first_name,
-                last_name=user.last_name
-            )
-            logger.info(f"Synced user {user.email} to admin backend")
-        except Exception as e:
-            logger.warning(f"Failed to sync user to admin backend: {e}")
     
     # Mark user as verified if email verification
     if otp_data.purpose == "email_verification" and user:
@@ -1118,6 +1118,26 @@ async def refresh_token(
                 detail="Failed to refresh token"
             )
 
+@app.post("/api/v1/auth/logout", response_model=MessageResponse, tags=["Authentication"])
+async def logout(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Log out
+    
+    Revokes the user's refresh token and ends their unlocked encryption-key
+    session in every worker. The access token stays valid until it expires.
+    """
+    await db.execute(
+        delete(RefreshToken).where(RefreshToken.user_id == current_user.id)
+    )
+    await db.commit()
+    await encrypted_file_service.lock_user_keys(current_user)
+    
+    logger.info(f"User logged out: {current_user.email}")
+    return MessageResponse(message="Logged out", success=True)
+
 @app.get("/api/v1/auth/me", response_model=UserResponse, tags=["Authentication"])
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """
@@ -1202,22 +1222,17 @@ async def firebase_register(
         )
         
         db.add(new_user)
+        # Sync user to admin backend as client (committed with the user)
+        enqueue_client_sync(
+            db,
+            new_user.email,
+            first_name=new_user.first_name,
+            last_name=new_user.last_name,
+            user_id=new_user.id
+        )
         await db.commit()
         await db.refresh(new_user)
         
-        # Sync user to admin backend as client
-        try:
-            from shared.sync_to_admin import _get_or_create_client_by_email
-            await _get_or_create_client_by_email(
-                new_user.email,
-                db_session=None,
-                first_name=new_user.first_name,
-                last_name=new_user.last_name
-            )
-            logger.info(f"Synced user {new_user.email} to admin backend as client")
-        except Exception as e:
-            logger.warning(f"Failed to sync user to admin backend: {e}")
-        
         # Log registration
         await log_user_action(db, str(new_user.id), "user_registered_firebase", "user", str(new_user.id))
         
@@ -1281,21 +1296,17 @@ async def firebase_login(
                 is_active=True
             )
             db.add(new_user)
+            # Sync to admin backend (committed with the user)
+            enqueue_client_sync(
+                db,
+                new_user.email,
+                first_name=new_user.first_name,
+                last_name=new_user.last_name,
+                user_id=new_user.id
+            )
             await db.commit()
             await db.refresh(new_user)
             user = new_user
-            
-            # Sync to admin backend
-            try:
-                from shared.sync_to_admin import _get_or_create_client_by_email
-                await _get_or_create_client_by_email(
-                    user.email,
-                    db_session=None,
-                    first_name=user.first_name,
-                    last_name=user.last_name
-                )
-            except Exception as e:
-                logger.warning(f"Failed to sync user to admin backend: {e}")
         
         # Update email verification status if Firebase says it's verified
         if firebase_user.get('email_verified', False) and not user.email_verified:
@@ -1427,27 +1438,24 @@ async def create_t1_form(
     await calculate_form_taxes(new_form)
     
     db.add(new_form)
+    
+    # Sync to admin dashboard - ensure client exists (committed with the form)
+    enqueue_t1_form_sync(
+        db,
+        user_email=current_user.email,
+        first_name=first_name,
+        last_name=last_name,
+        form_id=str(new_form.id),
+        tax_year=form_data.tax_year,
+        status=new_form.status,
+        user_id=current_user.id
+    )
     await db.commit()
     await db.refresh(new_form)
     
     # Log form creation
     await log_user_action(db, str(current_user.id), "t1_form_created", "t1_form", str(new_form.id))
     
-    # Sync to admin dashboard - ensure client exists
-    try:
-        from shared.sync_to_admin import sync_t1_form_to_admin
-        await sync_t1_form_to_admin(
-            user_email=current_user.email,
-            first_name=first_name,
-            last_name=last_name,
-            form_id=str(new_form.id),
-            tax_year=form_data.tax_year,
-            status=new_form.status
-        )
-    except Exception as sync_error:
-        logger.warning(f"Failed to sync T1 form creation to admin: {sync_error}")
-        # Don't fail the request if sync fails
-    
     logger.info(f"T1 form created for user {current_user.email}, year {form_data.tax_year}")
     return new_form
 
@@ -1551,27 +1559,24 @@ async def update_tax_form(
     await calculate_form_taxes(form)
     
     form.updated_at = datetime.utcnow()
+    
+    # Sync to admin dashboard - update client if form status changed (committed with the form)
+    enqueue_t1_form_sync(
+        db,
+        user_email=current_user.email,
+        first_name=form.first_name,
+        last_name=form.last_name,
+        form_id=str(form.id),
+        tax_year=form.tax_year,
+        status=form.status,
+        user_id=current_user.id
+    )
     await db.commit()
     await db.refresh(form)
     
     # Log form update
     await log_user_action(db, str(current_user.id), "t1_form_updated", "t1_form", str(form.id))
     
-    # Sync to admin dashboard - update client if form status changed
-    try:
-        from shared.sync_to_admin import sync_t1_form_to_admin
-        await sync_t1_form_to_admin(
-            user_email=current_user.email,
-            first_name=form.first_name,
-            last_name=form.last_name,
-            form_id=str(form.id),
-            tax_year=form.tax_year,
-            status=form.status
-        )
-    except Exception as sync_error:
-        logger.warning(f"Failed to sync T1 form update to admin: {sync_error}")
-        # Don't fail the request if sync fails
-    
     logger.info(f"T1 form updated: {form_id}")
     return form
 
@@ -1622,27 +1627,24 @@ async def submit_tax_form(
     # Submit form
     form.status = "submitted"
     form.submitted_at = datetime.utcnow()
+    
+    # Sync to admin dashboard - update client status to under_review (committed with the form)
+    enqueue_t1_form_sync(
+        db,
+        user_email=current_user.email,
+        first_name=form.first_name,
+        last_name=form.last_name,
+        form_id=form_id,
+        tax_year=form.tax_year,
+        status="submitted",  # This will trigger status update
+        user_id=current_user.id
+    )
     await db.commit()
     await db.refresh(form)
     
     # Log form submission
     await log_user_action(db, str(current_user.id), "t1_form_submitted", "t1_form", str(form.id))
     
-    # Sync to admin dashboard - update client status to under_review
-    try:
-        from shared.sync_to_admin import sync_t1_form_to_admin
-        await sync_t1_form_to_admin(
-            user_email=current_user.email,
-            first_name=form.first_name,
-            last_name=form.last_name,
-            form_id=form_id,
-            tax_year=form.tax_year,
-            status="submitted"  # This will trigger status update
-        )
-    except Exception as sync_error:
-        logger.warning(f"Failed to sync T1 form submission to admin: {sync_error}")
-        # Don't fail the request if sync fails
-    
     logger.info(f"T1 form submitted: {form_id}")
     return MessageResponse(message="Tax form submitted successfully")
 
@@ -1747,6 +1749,8 @@ async def upload_file(
 
     # Store encrypted payload in DB (compression happens before encryption internally)
     try:
+        # Sync to admin dashboard (committed with the file record)
+        enqueue_file_sync(db, current_user, file.filename)
         file_record = await encrypted_file_service.encrypt_and_store_file(
             current_user,
             file_content,
@@ -1788,20 +1792,23 @@ async def list_user_files(
     if limit > 100:
         limit = 100
     
-    # Get files with pagination
+    # Get files with pagination (only the columns in FileUploadResponse)
     result = await db.execute(
-        select(File).where(File.user_id == current_user.id)
+        select(
+            File.id, File.filename, File.original_filename, File.file_type,
+            File.file_size, File.upload_status, File.created_at
+        )
+        .where(File.user_id == current_user.id)
         .order_by(File.created_at.desc())
         .offset(skip)
         .limit(limit)
     )
-    files = result.scalars().all()
+    files = result.all()
     
     # Get total count
-    count_result = await db.execute(
-        select(File).where(File.user_id == current_user.id)
+    total = await db.scalar(
+        select(func.count()).select_from(File).where(File.user_id == current_user.id)
     )
-    total = len(count_result.scalars().all())
     
     return FileListResponse(
         files=list(files),
@@ -2434,7 +2441,8 @@ async def upload_encrypted_file(
             detail=f"File too large. Maximum size is {MAX_FILE_SIZE // 1024 // 1024}MB"
         )
     
-    # Encrypt and store file
+    # Encrypt and store file (admin sync event is committed with the file record)
+    enqueue_file_sync(db, current_user, file.filename)
     file_record = await encrypted_file_service.encrypt_and_store_file(
         current_user, file_data, file.filename, file.content_type or 'application/octet-stream', db
     )
@@ -2465,6 +2473,7 @@ async def list_encrypted_files(
     List user's encrypted files
     """
     files = await encrypted_file_service.list_user_files(current_user, db, limit, offset)
+    total = await encrypted_file_service.count_user_files(current_user, db)
     
     file_responses = [
         EncryptedFileUploadResponse(
@@ -2483,7 +2492,7 @@ async def list_encrypted_files(
     
     return EncryptedFileListResponse(
         files=file_responses,
-        total=len(file_responses)
+        total=total
     )
 
 @app.post("/api/v1/files/encrypted/{file_id}/decrypt", response_model=FileDecryptResponse, tags=["Encrypted Files"])
@@ -2519,7 +2528,7 @@ async def decrypt_file(
 @app.get("/api/v1/files/encrypted/{file_id}/download")
 async def download_decrypted_file(
     file_id: str,
-    password: str,
+    password: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -2549,6 +2558,83 @@ async def download_decrypted_file(
             detail=f"Failed to download file: {str(e)}"
         )
 
+@app.post("/api/v1/files/encrypted/batch-download", tags=["Encrypted Files"])
+async def batch_download_decrypted_files(
+    request: EncryptedFileBatchDownloadRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Download several decrypted files as one ZIP archive (one key unlock)
+    """
+    # Files are decrypted one at a time into the archive; it spills to disk
+    # past BATCH_ZIP_SPOOL_SIZE instead of holding every plaintext in memory
+    archive_file = tempfile.SpooledTemporaryFile(max_size=BATCH_ZIP_SPOOL_SIZE)
+    try:
+        used_names = set()
+        with zipfile.ZipFile(archive_file, 'w', zipfile.ZIP_STORED) as archive:
+            async for document_data, filename, _ in encrypted_file_service.iter_decrypted_files(
+                current_user, [str(file_id) for file_id in request.file_ids], request.password, db
+            ):
+                # Keep entries distinct when several files share a name
+                name, n = filename, 1
+                while name in used_names:
+                    stem, ext = os.path.splitext(filename)
+                    name, n = f"{stem} ({n}){ext}", n + 1
+                used_names.add(name)
+                await asyncio.to_thread(archive.writestr, name, document_data)
+        archive_size = archive_file.tell()
+        archive_file.seek(0)
+    except BaseException:
+        archive_file.close()
+        raise
+    
+    async def archive_chunks():
+        try:
+            while True:
+                chunk = await asyncio.to_thread(archive_file.read, BATCH_ZIP_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            archive_file.close()
+    
+    return StreamingResponse(
+        archive_chunks(),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": "attachment; filename=documents.zip",
+            "Content-Length": str(archive_size)
+        }
+    )
+
+@app.post("/api/v1/encryption/unlock", response_model=EncryptionUnlockResponse, tags=["Encrypted Files"])
+async def unlock_encryption_keys(
+    request: EncryptionUnlockRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Unlock the user's encryption keys for a short session
+    Decrypt and download requests may then omit the password until it expires
+    (expires_in is 0 if the session could not be opened; send the password
+    with each request then)
+    """
+    expires_in = await encrypted_file_service.unlock_user_keys(current_user, request.password)
+    return EncryptionUnlockResponse(
+        message="Encryption keys unlocked",
+        expires_in=expires_in
+    )
+
+@app.post("/api/v1/encryption/lock", response_model=MessageResponse, tags=["Encrypted Files"])
+async def lock_encryption_keys(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    End the unlocked-key session in every worker (logout does this too)
+    """
+    await encrypted_file_service.lock_user_keys(current_user)
+    return MessageResponse(message="Encryption keys locked", success=True)
+
 @app.delete("/api/v1/files/encrypted/{file_id}", response_model=MessageResponse, tags=["Encrypted Files"])
 async def delete_encrypted_file(
     file_id: str,
@@ -2582,7 +2668,7 @@ async def rotate_encryption_keys(
 ):
     """
     Rotate user's encryption keys (when password changes)
-    This will re-encrypt all user files with new keys
+    This re-wraps every file's key for the new keypair (file contents are untouched)
     """
     success = await encrypted_file_service.rotate_user_keys(
         current_user, request.old_password, request.new_password, db
@@ -2590,7 +2676,7 @@ async def rotate_encryption_keys(
     
     if success:
         return MessageResponse(
-            message="Encryption keys rotated successfully. All files re-encrypted.",
+            message="Encryption keys rotated successfully. All file keys re-wrapped.",
             success=True
         )
     else:
@@ -2628,6 +2714,8 @@ async def startup_event():
     try:
         await Database.create_tables()
         logger.info("Database tables created/verified")
+        admin_sync_worker.start()
+        key_lock_listener.start()
         logger.info("TaxEase API started successfully")
         logger.info("API Documentation available at: http://localhost:8000/docs")
         logger.info("ReDoc Documentation available at: http://localhost:8000/redoc")
@@ -2639,4 +2727,8 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on application shutdown"""
     logger.info("TaxEase API shutting down...")
+    await admin_sync_worker.stop()
+    await key_lock_listener.stop()
+    from shared.crypto_executor import crypto_executor
+    crypto_executor.shutdown()
 
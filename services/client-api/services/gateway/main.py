@@ -1,12 +1,22 @@
 """
 API Gateway for TaxEase - Routes requests to microservices
+
+Upstream calls share one pooled httpx.AsyncClient (keep-alive) opened in
+the app lifespan. Request and response bodies are streamed through rather
+than buffered, and each upstream has its own circuit breaker so a dead
+service fails fast instead of tying up connections until the timeout.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+import asyncio
 import httpx
 import os
+import time
 from datetime import datetime
 import logging
 from slowapi import Limiter, _rate_limit_exceeded_handler
@@ -20,13 +30,101 @@ logger = logging.getLogger(__name__)
 # Rate limiting
 limiter = Limiter(key_func=get_remote_address)
 
+# Service URLs
+SERVICES = {
+    "auth": os.getenv("AUTH_SERVICE_URL", "http://localhost:8001"),
+    "tax": os.getenv("TAX_SERVICE_URL", "http://localhost:8002"),
+    "file": os.getenv("FILE_SERVICE_URL", "http://localhost:8003"),
+    "report": os.getenv("REPORT_SERVICE_URL", "http://localhost:8004"),
+}
+
+# Upstream connection pool and timeouts
+UPSTREAM_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("GATEWAY_MAX_CONNECTIONS", 100)),
+    max_keepalive_connections=int(os.getenv("GATEWAY_MAX_KEEPALIVE", 20)),
+    keepalive_expiry=float(os.getenv("GATEWAY_KEEPALIVE_EXPIRY", 30.0)),
+)
+UPSTREAM_TIMEOUT = httpx.Timeout(
+    float(os.getenv("GATEWAY_READ_TIMEOUT", 30.0)),
+    connect=float(os.getenv("GATEWAY_CONNECT_TIMEOUT", 5.0)),
+    pool=float(os.getenv("GATEWAY_POOL_TIMEOUT", 5.0)),
+)
+HEALTH_TIMEOUT = 5.0
+
+# Circuit breaker: open after N consecutive failures, retry one request after the cooldown
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("GATEWAY_CIRCUIT_FAILURES", 5))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("GATEWAY_CIRCUIT_RESET", 30.0))
+
+# Connection-scoped headers that must not be forwarded (RFC 9110 section 7.6.1)
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade",
+}
+
+
+class CircuitBreaker:
+    """Per-upstream circuit breaker (closed -> open -> half-open -> closed)"""
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow_request(self) -> bool:
+        """Closed: always; open: never; half-open: one trial request per cooldown"""
+        state = self.state
+        if state == "half-open":
+            # Re-arm the timer so only this request probes the upstream
+            self.opened_at = time.monotonic()
+            return True
+        return state == "closed"
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(f"Circuit for {self.name} opened after {self.failures} failures")
+            self.opened_at = time.monotonic()
+
+
+circuit_breakers = {
+    name: CircuitBreaker(name, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
+    for name in SERVICES
+}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared upstream client for the lifetime of the app"""
+    app.state.http_client = httpx.AsyncClient(limits=UPSTREAM_LIMITS, timeout=UPSTREAM_TIMEOUT)
+    try:
+        yield
+    finally:
+        await app.state.http_client.aclose()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="TaxEase API Gateway",
     description="API Gateway for TaxEase Microservices",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Add rate limiting
@@ -48,14 +146,6 @@ app.add_middleware(
     allowed_hosts=["*"]  # Configure for production
 )
 
-# Service URLs
-SERVICES = {
-    "auth": os.getenv("AUTH_SERVICE_URL", "http://localhost:8001"),
-    "tax": os.getenv("TAX_SERVICE_URL", "http://localhost:8002"),
-    "file": os.getenv("FILE_SERVICE_URL", "http://localhost:8003"),
-    "report": os.getenv("REPORT_SERVICE_URL", "http://localhost:8004"),
-}
-
 @app.get("/")
 @limiter.limit("10/minute")
 async def root(request: Request):
@@ -72,22 +162,26 @@ async def root(request: Request):
 async def health_check(request: Request):
     """Health check endpoint"""
     
-    # Check all services
-    service_status = {}
+    client: httpx.AsyncClient = request.app.state.http_client
     
-    async with httpx.AsyncClient() as client:
-        for service_name, service_url in SERVICES.items():
-            try:
-                response = await client.get(f"{service_url}/health", timeout=5.0)
-                service_status[service_name] = {
-                    "status": "healthy" if response.status_code == 200 else "unhealthy",
-                    "response_time": response.elapsed.total_seconds()
-                }
-            except Exception as e:
-                service_status[service_name] = {
-                    "status": "unhealthy",
-                    "error": str(e)
-                }
+    async def check(service_name: str, service_url: str):
+        try:
+            response = await client.get(f"{service_url}/health", timeout=HEALTH_TIMEOUT)
+            return {
+                "status": "healthy" if response.status_code == 200 else "unhealthy",
+                "response_time": response.elapsed.total_seconds(),
+                "circuit": circuit_breakers[service_name].state
+            }
+        except Exception as e:
+            return {
+                "status": "unhealthy",
+                "error": str(e),
+                "circuit": circuit_breakers[service_name].state
+            }
+    
+    # Check all services concurrently
+    results = await asyncio.gather(*(check(name, url) for name, url in SERVICES.items()))
+    service_status = dict(zip(SERVICES, results))
     
     return {
         "gateway": "healthy",
@@ -95,40 +189,77 @@ async def health_check(request: Request):
         "services": service_status
     }
 
+def _forward_headers(items) -> list:
+    """Drop hop-by-hop headers (and those named in Connection) from (name, value) pairs"""
+    items = list(items)
+    connection_tokens = {
+        token.strip().lower()
+        for key, value in items if key.lower() == "connection"
+        for token in value.split(",")
+    }
+    excluded = HOP_BY_HOP_HEADERS | connection_tokens
+    return [(key, value) for key, value in items if key.lower() not in excluded]
+
 async def proxy_request(service_name: str, path: str, request: Request):
-    """Proxy request to microservice"""
+    """Stream a request to a microservice and its response back to the caller"""
     
     service_url = SERVICES.get(service_name)
     if not service_url:
         raise HTTPException(status_code=404, detail=f"Service {service_name} not found")
     
+    breaker = circuit_breakers[service_name]
+    if not breaker.allow_request():
+        raise HTTPException(status_code=503, detail=f"Service {service_name} temporarily unavailable")
+    
     # Build target URL
     target_url = f"{service_url}{path}"
     
-    # Get request body
-    body = await request.body()
+    # Forward headers (excluding host and hop-by-hop)
+    headers = [
+        (key, value) for key, value in _forward_headers(request.headers.items())
+        if key.lower() != "host"
+    ]
     
-    # Forward headers (excluding host)
-    headers = dict(request.headers)
-    headers.pop("host", None)
+    # Stream the body through only if the caller sent one (no chunked empty GETs)
+    has_body = "content-length" in request.headers or "transfer-encoding" in request.headers
     
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.request(
-                method=request.method,
-                url=target_url,
-                headers=headers,
-                params=request.query_params,
-                content=body,
-                timeout=30.0
-            )
-            
-            # Return response
-            return response.json() if response.headers.get("content-type", "").startswith("application/json") else response.text
-            
-        except httpx.RequestError as e:
-            logger.error(f"Error proxying request to {service_name}: {e}")
-            raise HTTPException(status_code=502, detail=f"Service {service_name} unavailable")
+    client: httpx.AsyncClient = request.app.state.http_client
+    upstream_request = client.build_request(
+        method=request.method,
+        url=target_url,
+        headers=headers,
+        params=request.query_params,
+        content=request.stream() if has_body else None
+    )
+    
+    try:
+        upstream = await client.send(upstream_request, stream=True)
+    except httpx.TimeoutException as e:
+        breaker.record_failure()
+        logger.error(f"Timeout proxying request to {service_name}: {e}")
+        raise HTTPException(status_code=504, detail=f"Service {service_name} timed out")
+    except httpx.RequestError as e:
+        breaker.record_failure()
+        logger.error(f"Error proxying request to {service_name}: {e}")
+        raise HTTPException(status_code=502, detail=f"Service {service_name} unavailable")
+    
+    if upstream.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    
+    # Body is passed through undecoded, so Content-Encoding/Length stay valid
+    response = StreamingResponse(
+        upstream.aiter_raw(),
+        status_code=upstream.status_code,
+        background=BackgroundTask(upstream.aclose)
+    )
+    # Raw header list keeps repeated headers (Set-Cookie) intact
+    response.raw_headers = [
+        (key.encode("latin-1"), value.encode("latin-1"))
+        for key, value in _forward_headers(upstream.headers.multi_items())
+    ]
+    return response
 
 # Auth service routes
 @app.api_route("/api/v1/auth/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
@@ -0,0 +1,253 @@
+"""
+Blob storage for encrypted file bodies
+
+Ciphertext is kept out of Postgres: the database stores metadata plus a
+locator string ("<driver>:<key>") and the raw binary ciphertext lives in a
+blob store. Two drivers:
+
+- local: content-addressed files under BLOB_STORE_PATH, sharded by the
+  first bytes of the SHA-256 (ab/cd/abcd...), written atomically
+- s3: the same keys in an S3 bucket (S3_BUCKET_NAME), with boto3 calls on
+  a dedicated I/O thread pool; self-contained because client-api images
+  are built from services/client-api alone and cannot import backend/
+
+BLOB_STORE selects the driver used for new blobs; reads resolve the driver
+from the locator, so blobs written under a previous setting stay readable.
+"""
+import io
+import os
+import asyncio
+import hashlib
+import logging
+import tempfile
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict
+
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+BLOB_STORE = os.getenv("BLOB_STORE", "local")  # local, s3
+BLOB_STORE_PATH = os.getenv("BLOB_STORE_PATH", "./storage/blobs")
+BLOB_KEY_PREFIX = os.getenv("BLOB_KEY_PREFIX", "blobs")
+STREAM_CHUNK_SIZE = 64 * 1024
+
+S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "taxease-prod-documents")
+S3_REGION = os.getenv("AWS_REGION", "ca-central-1")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+S3_MAX_POOL_CONNECTIONS = int(os.getenv("S3_MAX_POOL_CONNECTIONS", 50))
+S3_IO_WORKERS = int(os.getenv("S3_IO_WORKERS", S3_MAX_POOL_CONNECTIONS))
+S3_MULTIPART_THRESHOLD = int(os.getenv("S3_MULTIPART_THRESHOLD_MB", 8)) * 1024 * 1024
+S3_TRANSFER_CONCURRENCY = int(os.getenv("S3_TRANSFER_CONCURRENCY", 10))
+S3_NOT_FOUND_CODES = {"404", "NoSuchKey", "NotFound"}
+
+
+def content_key(data: bytes) -> str:
+    """Sharded content address for data: <prefix>/ab/cd/<sha256>"""
+    digest = hashlib.sha256(data).hexdigest()
+    return f"{BLOB_KEY_PREFIX}/{digest[:2]}/{digest[2:4]}/{digest}"
+
+
+class BlobStore:
+    """Interface implemented by every blob storage driver"""
+
+    scheme = ""
+
+    async def put(self, data: bytes, content_type: str = "application/octet-stream") -> str:
+        """Store data and return its locator"""
+        raise NotImplementedError
+
+    async def get(self, locator: str) -> bytes:
+        """Read a whole blob"""
+        chunks = [chunk async for chunk in self.stream(locator)]
+        return b"".join(chunks)
+
+    def stream(self, locator: str, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Read a blob in chunks without holding it in memory"""
+        raise NotImplementedError
+
+    async def delete(self, locator: str) -> None:
+        raise NotImplementedError
+
+    def locator(self, key: str) -> str:
+        return f"{self.scheme}:{key}"
+
+    def key(self, locator: str) -> str:
+        scheme, _, key = locator.partition(":")
+        if scheme != self.scheme or not key:
+            raise ValueError(f"Locator {locator!r} does not belong to the {self.scheme} blob store")
+        return key
+
+
+class LocalBlobStore(BlobStore):
+    """Content-addressed blobs on the local filesystem"""
+
+    scheme = "local"
+
+    def __init__(self, root: str = BLOB_STORE_PATH):
+        self.root = os.path.abspath(root)
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"Blob key escapes the store root: {key!r}")
+        return path
+
+    def _write(self, path: str, data: bytes) -> None:
+        if os.path.exists(path):
+            return  # same content, already stored
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    async def put(self, data: bytes, content_type: str = "application/octet-stream") -> str:
+        key = content_key(data)
+        await asyncio.to_thread(self._write, self._path(key), data)
+        return self.locator(key)
+
+    async def stream(self, locator: str, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        path = self._path(self.key(locator))
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Blob not found: {locator}")
+        f = await asyncio.to_thread(open, path, "rb")
+        try:
+            while True:
+                chunk = await asyncio.to_thread(f.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            f.close()
+
+    async def delete(self, locator: str) -> None:
+        path = self._path(self.key(locator))
+        try:
+            await asyncio.to_thread(os.remove, path)
+        except FileNotFoundError:
+            pass
+
+
+class S3BlobStore(BlobStore):
+    """Content-addressed blobs in an S3 bucket"""
+
+    scheme = "s3"
+
+    def __init__(self, bucket: str = S3_BUCKET_NAME, client=None):
+        self.bucket = bucket
+        # The client is thread-safe; its connection pool is shared by the
+        # I/O workers and multipart transfer threads
+        self.client = client or boto3.client(
+            "s3",
+            region_name=S3_REGION,
+            endpoint_url=S3_ENDPOINT_URL,
+            config=Config(
+                max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                retries={"max_attempts": 5, "mode": "adaptive"},
+                tcp_keepalive=True,
+            ),
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=S3_MULTIPART_THRESHOLD,
+            max_concurrency=S3_TRANSFER_CONCURRENCY,
+            use_threads=True,
+        )
+        self._executor = ThreadPoolExecutor(max_workers=S3_IO_WORKERS, thread_name_prefix="blob-s3")
+
+    async def _run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    @staticmethod
+    def _not_found(e: ClientError) -> bool:
+        return e.response.get("Error", {}).get("Code", "") in S3_NOT_FOUND_CODES
+
+    def _upload(self, key: str, data: bytes, content_type: str) -> None:
+        self.client.upload_fileobj(
+            io.BytesIO(data),
+            self.bucket,
+            key,
+            ExtraArgs={"ServerSideEncryption": "AES256", "ContentType": content_type},
+            Config=self.transfer_config,
+        )
+
+    def _download(self, key: str) -> bytes:
+        buffer = io.BytesIO()
+        try:
+            self.client.download_fileobj(self.bucket, key, buffer, Config=self.transfer_config)
+        except ClientError as e:
+            if self._not_found(e):
+                raise FileNotFoundError(f"Blob not found: s3:{key}")
+            raise
+        return buffer.getvalue()
+
+    def _open(self, key: str):
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+        except ClientError as e:
+            if self._not_found(e):
+                raise FileNotFoundError(f"Blob not found: s3:{key}")
+            raise
+
+    async def put(self, data: bytes, content_type: str = "application/octet-stream") -> str:
+        key = content_key(data)
+        await self._run(self._upload, key, data, content_type)
+        return self.locator(key)
+
+    async def get(self, locator: str) -> bytes:
+        # Transfer manager download: parallel ranged GETs for large blobs
+        return await self._run(self._download, self.key(locator))
+
+    async def stream(self, locator: str, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        body = await self._run(self._open, self.key(locator))
+        try:
+            while True:
+                chunk = await self._run(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+    async def delete(self, locator: str) -> None:
+        await self._run(self.client.delete_object, Bucket=self.bucket, Key=self.key(locator))
+
+
+BLOB_STORE_DRIVERS = {
+    LocalBlobStore.scheme: LocalBlobStore,
+    S3BlobStore.scheme: S3BlobStore,
+}
+
+_stores: Dict[str, BlobStore] = {}
+
+
+def _store(scheme: str) -> BlobStore:
+    if scheme not in _stores:
+        if scheme not in BLOB_STORE_DRIVERS:
+            raise ValueError(f"Unknown blob store: {scheme!r}")
+        _stores[scheme] = BLOB_STORE_DRIVERS[scheme]()
+    return _stores[scheme]
+
+
+def get_blob_store() -> BlobStore:
+    """Store that new blobs are written to (BLOB_STORE)"""
+    return _store(BLOB_STORE)
+
+
+def blob_store_for(locator: str) -> BlobStore:
+    """Store that holds the blob at locator"""
+    return _store(locator.partition(":")[0])
@@ -0,0 +1,200 @@
+"""
+Compression stage of the document encryption pipeline
+
+Documents are compressed before AES encryption with a pluggable codec:
+
+- zstd / lz4 when the optional zstandard / lz4 packages are installed,
+  gzip (stdlib zlib) otherwise; DOCUMENT_COMPRESSION picks one ("auto"
+  prefers zstd, then gzip)
+- formats that are compressed already (PDF, JPEG, PNG, Office Open XML...)
+  skip the stage ("none"), and unknown types are probed with a sample first
+- codecs work on a stream of chunks, so the encryptor consumes compressed
+  output as it is produced instead of holding a second full copy
+
+The codec is recorded as metadata['compression']; documents without it
+were written by the old pipeline and are gzip.
+"""
+import os
+import zlib
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # optional
+    lz4_frame = None
+
+DOCUMENT_COMPRESSION = os.getenv("DOCUMENT_COMPRESSION", "auto")  # auto, zstd, lz4, gzip, none
+GZIP_LEVEL = int(os.getenv("DOCUMENT_GZIP_LEVEL", 6))
+ZSTD_LEVEL = int(os.getenv("DOCUMENT_ZSTD_LEVEL", 3))
+STREAM_CHUNK_SIZE = 1024 * 1024
+PROBE_SIZE = 64 * 1024
+PROBE_MIN_SAVING = 0.05  # compress only if the probe shrinks by at least 5%
+
+LEGACY_CODEC = "gzip"  # documents encrypted before the codec was recorded
+
+ALREADY_COMPRESSED_EXTENSIONS = {
+    ".pdf", ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic",
+    ".docx", ".xlsx", ".pptx", ".zip", ".gz", ".7z", ".mp4", ".mov",
+}
+ALREADY_COMPRESSED_MIME_TYPES = {
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+}
+
+
+class _Stream:
+    """Incremental (de)compressor: feed chunks to process(), then finish()"""
+
+    def __init__(self, process: Callable[[bytes], bytes], finish: Callable[[], bytes]):
+        self.process = process
+        self.finish = finish
+
+
+class Codec:
+    """A named compression codec"""
+
+    def __init__(self, name: str, compressor: Callable[[], _Stream], decompressor: Callable[[], _Stream]):
+        self.name = name
+        self.compressor = compressor
+        self.decompressor = decompressor
+
+
+def _identity() -> _Stream:
+    return _Stream(lambda chunk: chunk, lambda: b"")
+
+
+def _gzip_compressor() -> _Stream:
+    # wbits=31: gzip framing, readable by gzip.decompress like the old pipeline's output
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return _Stream(compressor.compress, compressor.flush)
+
+
+def _gzip_decompressor() -> _Stream:
+    decompressor = zlib.decompressobj(31)
+    return _Stream(decompressor.decompress, decompressor.flush)
+
+
+def _zstd_compressor() -> _Stream:
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    return _Stream(compressor.compress, compressor.flush)
+
+
+def _zstd_decompressor() -> _Stream:
+    decompressor = zstandard.ZstdDecompressor().decompressobj()
+    return _Stream(decompressor.decompress, lambda: b"")
+
+
+def _lz4_compressor() -> _Stream:
+    compressor = lz4_frame.LZ4FrameCompressor()
+    header = [compressor.begin()]  # emitted with the first output
+
+    def process(chunk: bytes) -> bytes:
+        return (header.pop() if header else b"") + compressor.compress(chunk)
+
+    def finish() -> bytes:
+        return (header.pop() if header else b"") + compressor.flush()
+
+    return _Stream(process, finish)
+
+
+def _lz4_decompressor() -> _Stream:
+    decompressor = lz4_frame.LZ4FrameDecompressor()
+    return _Stream(decompressor.decompress, lambda: b"")
+
+
+CODECS: Dict[str, Codec] = {
+    "none": Codec("none", _identity, _identity),
+    "gzip": Codec("gzip", _gzip_compressor, _gzip_decompressor),
+}
+if zstandard is not None:
+    CODECS["zstd"] = Codec("zstd", _zstd_compressor, _zstd_decompressor)
+if lz4_frame is not None:
+    CODECS["lz4"] = Codec("lz4", _lz4_compressor, _lz4_decompressor)
+
+
+def available_codecs() -> List[str]:
+    return list(CODECS)
+
+
+def get_codec(name: str) -> Codec:
+    if name not in CODECS:
+        raise ValueError(f"Compression codec {name!r} is not available (installed: {', '.join(CODECS)})")
+    return CODECS[name]
+
+
+def default_codec() -> str:
+    """Codec for compressible documents (DOCUMENT_COMPRESSION)"""
+    if DOCUMENT_COMPRESSION == "auto":
+        return "zstd" if "zstd" in CODECS else "gzip"
+    get_codec(DOCUMENT_COMPRESSION)
+    return DOCUMENT_COMPRESSION
+
+
+def is_already_compressed(filename: Optional[str] = None, mime_type: Optional[str] = None) -> bool:
+    if filename and os.path.splitext(filename)[1].lower() in ALREADY_COMPRESSED_EXTENSIONS:
+        return True
+    if mime_type:
+        mime_type = mime_type.split(";")[0].strip().lower()
+        return mime_type in ALREADY_COMPRESSED_MIME_TYPES or mime_type.startswith(("image/", "video/"))
+    return False
+
+
+def choose_codec(data: bytes, filename: Optional[str] = None, mime_type: Optional[str] = None,
+                 codec: Optional[str] = None) -> str:
+    """
+    Codec for one document: "none" for already-compressed formats and for
+    data whose leading PROBE_SIZE bytes do not compress, else codec (default_codec())
+    """
+    codec = codec or default_codec()
+    if codec == "none" or is_already_compressed(filename, mime_type):
+        return "none"
+    if len(data) > PROBE_SIZE:
+        probe = data[:PROBE_SIZE]
+        if len(compress(probe, codec)) > len(probe) * (1 - PROBE_MIN_SAVING):
+            return "none"
+    return codec
+
+
+def iter_chunks(data: bytes, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    view = memoryview(data)
+    for start in range(0, len(data), chunk_size):
+        yield bytes(view[start:start + chunk_size])
+
+
+def compress_stream(chunks: Iterable[bytes], codec: str) -> Iterator[bytes]:
+    stream = get_codec(codec).compressor()
+    for chunk in chunks:
+        out = stream.process(chunk)
+        if out:
+            yield out
+    out = stream.finish()
+    if out:
+        yield out
+
+
+def decompress_stream(chunks: Iterable[bytes], codec: str) -> Iterator[bytes]:
+    stream = get_codec(codec).decompressor()
+    for chunk in chunks:
+        out = stream.process(chunk)
+        if out:
+            yield out
+    out = stream.finish()
+    if out:
+        yield out
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    return b"".join(compress_stream(iter_chunks(data), codec))
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    return b"".join(decompress_stream(iter_chunks(data), codec))
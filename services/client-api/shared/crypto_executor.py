@@ -0,0 +1,168 @@
+"""
+Crypto executor for the client API
+
+CPU-bound cryptography (AES over file contents, RSA-OAEP, PBKDF2) must not
+run on the event loop: one 100k-iteration PBKDF2 derivation stalls every
+other request on the worker for tens of milliseconds.
+
+- Cipher work runs on a dedicated thread pool (OpenSSL releases the GIL),
+  separate from Starlette's shared threadpool used by sync routes.
+- Key derivation optionally runs on a process pool (CRYPTO_KDF_PROCESSES > 0);
+  otherwise it shares the thread pool. Functions sent to the process pool
+  must be picklable (module-level).
+
+Each pool reports queue depth, in-flight count and wait/run latency via
+metrics().
+
+This is a copy of backend/app/core/crypto_executor.py: client-api images
+are built from services/client-api alone and cannot import backend/. Only
+the configuration lines differ (decouple here, os.getenv there); keep the
+rest identical, backend/tests/test_crypto_executor.py checks it.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from decouple import config
+
+
+CRYPTO_THREAD_WORKERS = config('CRYPTO_THREAD_WORKERS', default=min(32, (os.cpu_count() or 1) + 4), cast=int)
+CRYPTO_KDF_PROCESSES = config('CRYPTO_KDF_PROCESSES', default=0, cast=int)
+
+
+def _timed_call(fn: Callable, args: tuple, kwargs: dict) -> tuple:
+    """Run fn in the worker, returning (result, started_at, finished_at)"""
+    started = time.monotonic()
+    result = fn(*args, **kwargs)
+    return result, started, time.monotonic()
+
+
+class PoolMetrics:
+    """Counters and latency totals for one executor pool"""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_seconds_total = 0.0
+        self.run_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.run_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def on_submit(self) -> None:
+        with self._lock:
+            self.submitted += 1
+
+    def on_done(self, submitted_at: float, started: Optional[float], finished: Optional[float]) -> None:
+        with self._lock:
+            self.started += 1
+            if started is None:
+                # Failed in the worker: only the total latency is known
+                self.failed += 1
+                return
+            wait, run = max(started - submitted_at, 0.0), finished - started
+            self.completed += 1
+            self.wait_seconds_total += wait
+            self.run_seconds_total += run
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+            self.run_seconds_max = max(self.run_seconds_max, run)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = self.submitted - self.started
+            done = max(self.completed, 1)
+            return {
+                "workers": self.workers,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "in_flight": in_flight,
+                "queue_depth": max(in_flight - self.workers, 0),
+                "avg_wait_ms": round(self.wait_seconds_total / done * 1000, 3),
+                "avg_run_ms": round(self.run_seconds_total / done * 1000, 3),
+                "max_wait_ms": round(self.wait_seconds_max * 1000, 3),
+                "max_run_ms": round(self.run_seconds_max * 1000, 3),
+            }
+
+
+class CryptoExecutor:
+    """Awaitable front-end over the crypto thread pool and optional KDF process pool"""
+
+    def __init__(self, thread_workers: int = CRYPTO_THREAD_WORKERS, kdf_processes: int = CRYPTO_KDF_PROCESSES):
+        self.thread_workers = thread_workers
+        self.kdf_processes = kdf_processes
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.thread_metrics = PoolMetrics("thread", thread_workers)
+        self.process_metrics = PoolMetrics("process", kdf_processes)
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self.thread_workers,
+                    thread_name_prefix="crypto"
+                )
+            return self._threads
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=self.kdf_processes)
+            return self._processes
+
+    async def _submit(self, pool: Executor, metrics: PoolMetrics, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        loop = asyncio.get_running_loop()
+        submitted_at = time.monotonic()
+        metrics.on_submit()
+        try:
+            result, started, finished = await loop.run_in_executor(pool, _timed_call, fn, args, kwargs)
+        except BaseException:
+            metrics.on_done(submitted_at, None, None)
+            raise
+        metrics.on_done(submitted_at, started, finished)
+        return result
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a cipher operation on the crypto thread pool"""
+        return await self._submit(self._thread_pool(), self.thread_metrics, fn, args, kwargs)
+
+    async def run_kdf(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a key derivation on the process pool if configured, else the thread pool"""
+        if self.kdf_processes > 0:
+            return await self._submit(self._process_pool(), self.process_metrics, fn, args, kwargs)
+        return await self.run(fn, *args, **kwargs)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth and latency per pool"""
+        metrics = {"thread_pool": self.thread_metrics.snapshot()}
+        if self.kdf_processes > 0:
+            metrics["process_pool"] = self.process_metrics.snapshot()
+        return metrics
+
+    def health(self) -> Dict[str, Any]:
+        """GET /health/crypto body; one shape for every service using this module"""
+        return {"pools": self.metrics(), "timestamp": datetime.utcnow()}
+
+    def shutdown(self) -> None:
+        """Stop both pools (application shutdown)"""
+        with self._lock:
+            if self._threads is not None:
+                self._threads.shutdown(wait=False, cancel_futures=True)
+                self._threads = None
+            if self._processes is not None:
+                self._processes.shutdown(wait=False, cancel_futures=True)
+                self._processes = None
+
+
+crypto_executor = CryptoExecutor()
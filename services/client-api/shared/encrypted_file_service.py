@@ -1,36 +1,149 @@
 """
 Encrypted File Service for TaxEase
 Handles end-to-end encrypted file operations
+
+Ciphertext is written as raw bytes to the blob store (see blob_store.py);
+the files row keeps metadata and File.blob_locator. Files stored before
+that carry base64 ciphertext in files.encrypted_data or encrypted_documents
+and remain readable.
+
+Each file body has its own AES key, wrapped with the user's RSA public key
+(metadata['encrypted_key'], tagged with metadata['key_id']). Key rotation
+therefore only re-wraps those keys; bodies are never re-encrypted.
+
+POST /encryption/unlock caches the unlocked private key for a short time
+(key_session.py), so consecutive decrypts derive the key once. Other
+requests that carry the password unlock it for themselves; a batch
+download unlocks each key once for the whole batch.
 """
+import os
 import json
+import base64
+import logging
 import hashlib
-from typing import Optional, Tuple, Dict, Any, List
+from typing import AsyncIterator, Optional, Tuple, Dict, Any, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, update, and_, or_, func, case
 from fastapi import HTTPException, status
 from datetime import datetime
 
-from .encryption import SecureDocumentManager, KeyManager
+from .encryption import SecureDocumentManager, KeyManager, derive_password_key, key_fingerprint
+from .crypto_executor import crypto_executor
 from .models import User, File, EncryptedDocument
 from .database import get_db
+from .blob_store import get_blob_store, blob_store_for
+from .key_session import unlocked_keys, broadcast_lock
+
+logger = logging.getLogger(__name__)
+
+KEY_ROTATION_BATCH_SIZE = int(os.getenv('KEY_ROTATION_BATCH_SIZE', 200))
 
 
 class EncryptedFileService:
     """
     Service for handling encrypted file operations
+    
+    All key derivation, RSA and AES work runs on the crypto executor so the
+    event loop keeps serving other requests.
     """
     
     def __init__(self):
         self.doc_manager = SecureDocumentManager()
         self.key_manager = KeyManager()
     
+    async def _derive_key(self, password: str, salt: bytes) -> bytes:
+        """
+        Derive a user's private-key password key (PBKDF2) on the executor
+        """
+        return await crypto_executor.run_kdf(derive_password_key, password, salt)
+    
+    async def _derive_user_key(self, user: User, password: Optional[str]) -> Optional[bytes]:
+        """
+        Derive and verify the user's key; None if the password is wrong
+        """
+        return await self._unlock_private_key(user, user.private_key, user.key_salt, password)
+    
+    async def _unlock_private_key(self, user: User, private_key: Optional[str], key_salt: Optional[str],
+                                  password: Optional[str], open_session: bool = False) -> Optional[bytes]:
+        """
+        Derive and verify the key protecting private_key; None if the password
+        is wrong (or, without a password, if there is no unlocked-key session).
+        Only with open_session is the unlocked key kept for later requests.
+        """
+        if not all([private_key, key_salt]):
+            return None
+        
+        derived_key = unlocked_keys.get(str(user.id), key_salt, password)
+        if derived_key is None and password is not None:
+            derived_key = await self._derive_key(password, base64.b64decode(key_salt))
+            ok = await crypto_executor.run(
+                self.key_manager.verify_user_access,
+                private_key, password, key_salt,
+                derived_key=derived_key
+            )
+            if not ok:
+                return None
+        
+        if derived_key is not None and open_session:
+            unlocked_keys.put(str(user.id), key_salt, password, derived_key)
+        return derived_key
+    
+    @staticmethod
+    def _unlock_failed(password: Optional[str], detail: str) -> HTTPException:
+        if password is None:
+            detail = "Encryption keys are locked. Provide your password or unlock them first."
+        return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+    
+    async def unlock_user_keys(self, user: User, password: str) -> int:
+        """
+        Open an unlocked-key session; returns its lifetime in seconds (0 if
+        this worker cannot hold sessions right now)
+        """
+        unlocked = await self._unlock_private_key(
+            user, user.private_key, user.key_salt, password, open_session=True
+        ) is not None
+        if user.pending_private_key:
+            # Mid-rotation, re-wrapped files use the pending keypair (new password)
+            pending = await self._unlock_private_key(
+                user, user.pending_private_key, user.pending_key_salt, password, open_session=True
+            )
+            unlocked = unlocked or pending is not None
+        if not unlocked:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect password, could not unlock keys"
+            )
+        return unlocked_keys.ttl if unlocked_keys.enabled else 0
+    
+    async def lock_user_keys(self, user: User) -> None:
+        """
+        End the user's unlocked-key session in every worker
+        """
+        await broadcast_lock(str(user.id))
+    
+    def _wrapping_keypair(self, user: User, metadata: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        (private_key, key_salt) of the keypair that wraps a file's key:
+        the pending keypair for files already re-wrapped by an unfinished
+        rotation, the current one otherwise
+        """
+        if user.pending_public_key and metadata.get('key_id') == key_fingerprint(user.pending_public_key):
+            return user.pending_private_key, user.pending_key_salt
+        return user.private_key, user.key_salt
+    
     async def setup_user_encryption(self, user: User, password: str, db: AsyncSession) -> bool:
         """
         Set up encryption keys for a user
         """
         try:
             # Generate encryption keys
-            keys = self.key_manager.store_user_keys(str(user.id), password)
+            salt = os.urandom(self.doc_manager.encryption.salt_size)
+            derived_key = await self._derive_key(password, salt)
+            keys = await crypto_executor.run(
+                self.key_manager.store_user_keys,
+                str(user.id), password,
+                salt=salt, derived_key=derived_key
+            )
             
             # Store keys in user record
             user.public_key = keys['public_key']
@@ -52,12 +165,7 @@ class EncryptedFileService:
         """
         Verify user can access their encryption keys
         """
-        if not all([user.private_key, user.key_salt]):
-            return False
-            
-        return self.key_manager.verify_user_access(
-            user.private_key, password, user.key_salt
-        )
+        return await self._derive_user_key(user, password) is not None
     
     async def encrypt_and_store_file(self, user: User, file_data: bytes, 
                                    filename: str, file_type: str, 
@@ -73,11 +181,16 @@ class EncryptedFileService:
                     detail="User encryption not set up. Please complete account setup."
                 )
             
-            # Encrypt the document
-            encrypted_doc = self.doc_manager.encrypt_and_store_document(
-                file_data, filename, user.public_key
+            # Encrypt the document (raw ciphertext, no base64); during a key
+            # rotation new files are wrapped for the incoming keypair directly
+            encrypted_doc = await crypto_executor.run(
+                self.doc_manager.encrypt_and_store_document,
+                file_data, filename, user.pending_public_key or user.public_key, raw=True
             )
             
+            # Write the ciphertext to the blob store; the row keeps only its locator
+            blob_locator = await get_blob_store().put(encrypted_doc['encrypted_data'])
+            
             # Create file record
             file_record = File(
                 user_id=user.id,
@@ -85,31 +198,20 @@ class EncryptedFileService:
                 original_filename=filename,
                 file_type=file_type,
                 file_size=len(file_data),
+                compressed_size=encrypted_doc['metadata']['compressed_size'],
                 encrypted_key=encrypted_doc['metadata']['encrypted_key'],
                 encryption_metadata=json.dumps(encrypted_doc['metadata']),
                 is_encrypted=True,
-                upload_status="encrypting"
+                blob_locator=blob_locator,
+                upload_status="encrypted"
             )
             
             db.add(file_record)
-            await db.flush()  # Get the file ID
-            
-            # Store encrypted data separately for large files
-            if len(encrypted_doc['encrypted_data']) > 1024 * 1024:  # > 1MB
-                encrypted_document = EncryptedDocument(
-                    file_id=file_record.id,
-                    encrypted_data=encrypted_doc['encrypted_data'].encode('utf-8'),
-                    checksum=encrypted_doc['metadata']['checksum'],
-                    compression_ratio=encrypted_doc['metadata']['compressed_size'] / encrypted_doc['metadata']['original_size']
-                )
-                db.add(encrypted_document)
-                file_record.encrypted_data = None  # Don't store large data in file table
-            else:
-                # Store small files directly in file table
-                file_record.encrypted_data = encrypted_doc['encrypted_data'].encode('utf-8')
-            
-            file_record.upload_status = "encrypted"
-            await db.commit()
+            try:
+                await db.commit()
+            except Exception:
+                await self._discard_blob(blob_locator)
+                raise
             
             return file_record
             
@@ -121,9 +223,10 @@ class EncryptedFileService:
             )
     
     async def decrypt_and_retrieve_file(self, user: User, file_id: str, 
-                                      password: str, db: AsyncSession) -> Tuple[bytes, str, str]:
+                                      password: Optional[str], db: AsyncSession) -> Tuple[bytes, str, str]:
         """
         Decrypt and retrieve a file for a user
+        (password may be None while the user has an unlocked-key session)
         """
         try:
             # Get file record
@@ -138,73 +241,113 @@ class EncryptedFileService:
                     detail="File not found"
                 )
             
-            if not file_record.is_encrypted:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="File is not encrypted"
-                )
-            
-            # Verify user can access encryption keys
-            if not await self.verify_user_encryption_access(user, password):
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Incorrect password, could not decrypt key"
-                )
+            return await self._decrypt_file_record(user, file_record, password, db)
             
-            # Get encrypted data
-            encrypted_data_b64 = None
-            if file_record.encrypted_data:
-                encrypted_data_b64 = file_record.encrypted_data.decode('utf-8')
-            else:
-                # Check separate encrypted document table
-                result = await db.execute(
-                    select(EncryptedDocument).where(EncryptedDocument.file_id == file_record.id)
-                )
-                encrypted_doc = result.scalar_one_or_none()
-                if encrypted_doc:
-                    encrypted_data_b64 = encrypted_doc.encrypted_data.decode('utf-8')
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to decrypt file: {str(e)}"
+            )
+    
+    async def iter_decrypted_files(self, user: User, file_ids: List[str], password: Optional[str],
+                                   db: AsyncSession) -> AsyncIterator[Tuple[bytes, str, str]]:
+        """
+        Decrypt several of a user's files one at a time, unlocking each key once
+        Yielded in the order of file_ids; any missing file fails the batch
+        before the first is decrypted
+        """
+        try:
+            result = await db.execute(
+                select(File).where(and_(File.id.in_(file_ids), File.user_id == user.id))
+            )
+            records = {str(file_record.id): file_record for file_record in result.scalars().all()}
             
-            if not encrypted_data_b64:
+            missing = [str(file_id) for file_id in file_ids if str(file_id) not in records]
+            if missing:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Encrypted file data not found"
+                    detail=f"Files not found: {', '.join(missing)}"
                 )
             
-            # Decrypt the file
-            metadata = json.loads(file_record.encryption_metadata)
-            
-            document_data, original_filename = self.doc_manager.decrypt_and_retrieve_document(
-                encrypted_data_b64,
-                metadata,
-                user.private_key,
-                password,
-                user.key_salt
-            )
-            
-            return document_data, original_filename, file_record.file_type
+            # The first file unlocks the key (PBKDF2 once); the rest reuse it
+            unlocked: Dict[str, bytes] = {}
+            for file_id in file_ids:
+                yield await self._decrypt_file_record(user, records[str(file_id)], password, db, unlocked)
             
         except HTTPException:
             raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to decrypt file: {str(e)}"
+                detail=f"Failed to decrypt files: {str(e)}"
             )
     
+    async def _decrypt_file_record(self, user: User, file_record: File, password: Optional[str],
+                                   db: AsyncSession, unlocked: Optional[Dict[str, bytes]] = None
+                                   ) -> Tuple[bytes, str, str]:
+        """
+        Decrypt one file; unlocked maps key salts to keys this request has
+        already unlocked
+        """
+        if not file_record.is_encrypted:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File is not encrypted"
+            )
+        
+        # Verify user can access encryption keys (derived once, reused below)
+        metadata = json.loads(file_record.encryption_metadata)
+        private_key, key_salt = self._wrapping_keypair(user, metadata)
+        derived_key = unlocked.get(key_salt) if unlocked is not None else None
+        if derived_key is None:
+            derived_key = await self._unlock_private_key(user, private_key, key_salt, password)
+            if derived_key is None:
+                raise self._unlock_failed(password, "Incorrect password, could not decrypt key")
+            if unlocked is not None:
+                unlocked[key_salt] = derived_key
+        
+        # Get encrypted data
+        encrypted_data_b64 = await self._load_ciphertext(file_record, db)
+        
+        if not encrypted_data_b64:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Encrypted file data not found"
+            )
+        
+        # Decrypt the file
+        document_data, original_filename = await crypto_executor.run(
+            self.doc_manager.decrypt_and_retrieve_document,
+            encrypted_data_b64,
+            metadata,
+            private_key,
+            password,
+            key_salt,
+            derived_key=derived_key
+        )
+        
+        return document_data, original_filename, file_record.file_type
+    
     async def list_user_files(self, user: User, db: AsyncSession, 
                             limit: int = 10, offset: int = 0) -> List[Dict[str, Any]]:
         """
         List user's files with metadata
         """
         try:
+            # Only the listed columns, not full File entities
             result = await db.execute(
-                select(File)
+                select(
+                    File.id, File.original_filename, File.file_type, File.file_size,
+                    File.is_encrypted, File.upload_status, File.created_at, File.encryption_metadata
+                )
                 .where(File.user_id == user.id)
                 .order_by(File.created_at.desc())
                 .limit(limit)
                 .offset(offset)
             )
-            files = result.scalars().all()
+            files = result.all()
             
             file_list = []
             for file_record in files:
@@ -237,6 +380,12 @@ class EncryptedFileService:
                 detail=f"Failed to list files: {str(e)}"
             )
     
+    async def count_user_files(self, user: User, db: AsyncSession) -> int:
+        """
+        Total number of user's files (for paginated listings)
+        """
+        return await db.scalar(select(func.count()).select_from(File).where(File.user_id == user.id))
+    
     async def delete_encrypted_file(self, user: User, file_id: str, 
                                   password: str, db: AsyncSession) -> bool:
         """
@@ -268,9 +417,14 @@ class EncryptedFileService:
             )
             
             # Delete file record
+            blob_locator = file_record.blob_locator
             await db.delete(file_record)
             await db.commit()
             
+            # Remove the ciphertext only once the row is gone
+            if blob_locator:
+                await self._discard_blob(blob_locator)
+            
             return True
             
         except HTTPException:
@@ -286,77 +440,108 @@ class EncryptedFileService:
                              new_password: str, db: AsyncSession) -> bool:
         """
         Rotate user's encryption keys (when password changes)
-        This requires re-encrypting all user files
+        
+        Only the per-file AES keys are re-wrapped from the old keypair to the
+        new one, in committed batches. The new keypair is kept in
+        users.pending_* until every file is done, so an interrupted rotation
+        is resumed by calling this again with the same passwords (files
+        re-wrapped so far stay readable with the new password meanwhile).
         """
         try:
             # Verify current password
-            if not self.verify_user_encryption_access(user, old_password):
+            old_derived_key = await self._derive_user_key(user, old_password)
+            if old_derived_key is None:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid current password"
                 )
             
-            # Generate new keys
-            new_keys = self.key_manager.rotate_user_keys(
-                str(user.id), old_password, new_password,
-                user.private_key, user.key_salt
-            )
-            
-            # Get all user's encrypted files
-            result = await db.execute(
-                select(File).where(and_(File.user_id == user.id, File.is_encrypted == True))
-            )
-            files = result.scalars().all()
-            
-            # Re-encrypt all files with new keys
-            for file_record in files:
-                # Decrypt with old keys
-                encrypted_data_b64 = None
-                if file_record.encrypted_data:
-                    encrypted_data_b64 = file_record.encrypted_data.decode('utf-8')
-                else:
-                    result = await db.execute(
-                        select(EncryptedDocument).where(EncryptedDocument.file_id == file_record.id)
+            if user.pending_public_key:
+                # Resume an unfinished rotation: files may already be wrapped for its keypair
+                if await self._unlock_private_key(user, user.pending_private_key, user.pending_key_salt,
+                                                  new_password) is None:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="A key rotation to a different password is in progress; "
+                               "retry with that new password to complete it"
                     )
-                    encrypted_doc = result.scalar_one()
-                    encrypted_data_b64 = encrypted_doc.encrypted_data.decode('utf-8')
-                
-                metadata = json.loads(file_record.encryption_metadata)
-                
-                # Decrypt with old keys
-                document_data, _ = self.doc_manager.decrypt_and_retrieve_document(
-                    encrypted_data_b64, metadata,
-                    user.private_key, old_password, user.key_salt
+            else:
+                # Generate new keys
+                new_salt = os.urandom(self.doc_manager.encryption.salt_size)
+                new_derived_key = await self._derive_key(new_password, new_salt)
+                new_keys = await crypto_executor.run(
+                    self.key_manager.rotate_user_keys,
+                    str(user.id), old_password, new_password,
+                    user.private_key, user.key_salt,
+                    old_derived_key=old_derived_key,
+                    new_salt=new_salt,
+                    new_derived_key=new_derived_key
                 )
-                
-                # Re-encrypt with new keys
-                new_encrypted_doc = self.doc_manager.encrypt_and_store_document(
-                    document_data, file_record.original_filename, new_keys['public_key']
+                user.pending_public_key = new_keys['public_key']
+                user.pending_private_key = new_keys['private_key']
+                user.pending_key_salt = new_keys['salt']
+                await db.commit()
+            
+            new_key_id = key_fingerprint(user.pending_public_key)
+            
+            # Re-wrap file keys batch by batch (keyset over files.id)
+            last_id = None
+            while True:
+                query = (
+                    select(File.id, File.encryption_metadata)
+                    .where(and_(File.user_id == user.id, File.is_encrypted == True))
+                    .order_by(File.id)
+                    .limit(KEY_ROTATION_BATCH_SIZE)
                 )
+                if last_id is not None:
+                    query = query.where(File.id > last_id)
+                rows = (await db.execute(query)).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
                 
-                # Update file record
-                file_record.encrypted_key = new_encrypted_doc['metadata']['encrypted_key']
-                file_record.encryption_metadata = json.dumps(new_encrypted_doc['metadata'])
+                batch = []
+                for row in rows:
+                    metadata = json.loads(row.encryption_metadata)
+                    if metadata.get('key_id') != new_key_id:
+                        batch.append((row.id, metadata))
+                if not batch:
+                    continue
                 
-                # Update encrypted data
-                if file_record.encrypted_data:
-                    file_record.encrypted_data = new_encrypted_doc['encrypted_data'].encode('utf-8')
-                else:
-                    # Update separate encrypted document
-                    result = await db.execute(
-                        select(EncryptedDocument).where(EncryptedDocument.file_id == file_record.id)
-                    )
-                    encrypted_doc = result.scalar_one()
-                    encrypted_doc.encrypted_data = new_encrypted_doc['encrypted_data'].encode('utf-8')
-                    encrypted_doc.checksum = new_encrypted_doc['metadata']['checksum']
-            
-            # Update user keys
-            user.public_key = new_keys['public_key']
-            user.private_key = new_keys['private_key']
-            user.key_salt = new_keys['salt']
+                rewrapped = await crypto_executor.run(
+                    self.key_manager.rewrap_document_keys,
+                    [metadata['encrypted_key'] for _, metadata in batch],
+                    user.private_key, old_derived_key, user.pending_public_key
+                )
+                
+                params = []
+                for (file_id, metadata), encrypted_key in zip(batch, rewrapped):
+                    metadata['encrypted_key'] = encrypted_key
+                    metadata['key_id'] = new_key_id
+                    params.append({
+                        'id': file_id,
+                        'encrypted_key': encrypted_key,
+                        'encryption_metadata': json.dumps(metadata)
+                    })
+                await db.execute(update(File), params)
+                await db.commit()
+            
+            # Every file is wrapped for the new keypair: make it current
+            user.public_key = user.pending_public_key
+            user.private_key = user.pending_private_key
+            user.key_salt = user.pending_key_salt
+            user.pending_public_key = None
+            user.pending_private_key = None
+            user.pending_key_salt = None
             user.key_created_at = datetime.utcnow()
-            
             await db.commit()
+            
+            # Sessions were unlocked for the old keypair (keyed by its salt,
+            # so a missed broadcast leaves nothing usable behind)
+            try:
+                await broadcast_lock(str(user.id))
+            except Exception as e:
+                logger.warning(f"Failed to broadcast key lock for user {user.id}: {e}")
             return True
             
         except HTTPException:
@@ -368,6 +553,34 @@ class EncryptedFileService:
                 detail=f"Failed to rotate encryption keys: {str(e)}"
             )
     
+    async def _load_ciphertext(self, file_record: File, db: AsyncSession):
+        """
+        Ciphertext of a file: raw bytes from the blob store, or the base64
+        text of legacy files stored in the database (None if missing)
+        """
+        if file_record.blob_locator:
+            try:
+                return await blob_store_for(file_record.blob_locator).get(file_record.blob_locator)
+            except FileNotFoundError:
+                return None
+        
+        # files.encrypted_data is deferred: load it only for the legacy rows that have it
+        encrypted_data = await db.scalar(select(File.encrypted_data).where(File.id == file_record.id))
+        if not encrypted_data:
+            # Check separate encrypted document table
+            result = await db.execute(
+                select(EncryptedDocument.encrypted_data).where(EncryptedDocument.file_id == file_record.id)
+            )
+            encrypted_data = result.scalar_one_or_none()
+        return encrypted_data.decode('utf-8') if encrypted_data else None
+    
+    async def _discard_blob(self, blob_locator: str) -> None:
+        """Best-effort blob removal (an orphaned blob is harmless, a failed request is not)"""
+        try:
+            await blob_store_for(blob_locator).delete(blob_locator)
+        except Exception as e:
+            logger.warning(f"Failed to delete blob {blob_locator}: {e}")
+    
     def _generate_secure_filename(self) -> str:
         """
         Generate a secure random filename
@@ -380,23 +593,20 @@ class EncryptedFileService:
         Get file storage statistics for user
         """
         try:
+            # One aggregate row; unencrypted files (or ones without a recorded
+            # compressed size) count at their original size
             result = await db.execute(
-                select(File).where(File.user_id == user.id)
+                select(
+                    func.count(File.id),
+                    func.count(File.id).filter(File.is_encrypted.is_(True)),
+                    func.coalesce(func.sum(File.file_size), 0),
+                    func.coalesce(func.sum(func.coalesce(
+                        case((File.is_encrypted.is_(True), File.compressed_size)),
+                        File.file_size
+                    )), 0),
+                ).where(File.user_id == user.id)
             )
-            files = result.scalars().all()
-            
-            total_files = len(files)
-            encrypted_files = len([f for f in files if f.is_encrypted])
-            total_original_size = sum(f.file_size for f in files)
-            
-            # Calculate compression stats for encrypted files
-            total_compressed_size = 0
-            for file_record in files:
-                if file_record.is_encrypted and file_record.encryption_metadata:
-                    metadata = json.loads(file_record.encryption_metadata)
-                    total_compressed_size += metadata.get('compressed_size', file_record.file_size)
-                else:
-                    total_compressed_size += file_record.file_size
+            total_files, encrypted_files, total_original_size, total_compressed_size = result.one()
             
             return {
                 'total_files': total_files,
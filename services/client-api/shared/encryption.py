@@ -3,19 +3,46 @@ End-to-End Encryption Service for Document Security
 Provides compression and encryption for sensitive documents
 """
 import os
-import gzip
 import base64
 import hashlib
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives import hashes, serialization, padding as sym_padding
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
 from cryptography.hazmat.backends import default_backend
-from typing import Tuple, Optional, Dict, Any
+from typing import Tuple, Optional, Dict, Any, List
 import json
 import secrets
 from datetime import datetime, timedelta
 
+from . import compression
+
+
+PBKDF2_ITERATIONS = 100000
+
+
+def derive_password_key(password: str, salt: bytes) -> bytes:
+    """
+    Derive the 32-byte key protecting a user's private key (PBKDF2-SHA256).
+    Module-level so it can be shipped to a process pool.
+    """
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=PBKDF2_ITERATIONS,
+        backend=default_backend()
+    )
+    return kdf.derive(password.encode())
+
+
+def key_fingerprint(public_key_pem: str) -> str:
+    """
+    Short identifier of a user public key (stored as metadata['key_id'])
+    Tells which keypair wraps a document key, e.g. midway through a rotation
+    """
+    return hashlib.sha256(base64.b64decode(public_key_pem)).hexdigest()[:16]
+
 
 class DocumentEncryption:
     """
@@ -23,7 +50,7 @@ class DocumentEncryption:
     Features:
     - AES-256 encryption for documents
     - RSA key pair generation for users
-    - Document compression before encryption
+    - Document compression before encryption (codec per document, see compression.py)
     - Key derivation from user passwords
     - Secure key storage and management
     """
@@ -34,10 +61,14 @@ class DocumentEncryption:
         self.iv_size = 16      # 128 bits
         self.salt_size = 32    # 256 bits
         
-    def generate_user_keypair(self, password: str) -> Dict[str, str]:
+    def generate_user_keypair(self, password: str, salt: Optional[bytes] = None,
+                              derived_key: Optional[bytes] = None) -> Dict[str, str]:
         """
         Generate RSA key pair for a user
         Returns encrypted private key and public key
+        
+        Pass salt and derived_key (from derive_password_key) to skip the
+        PBKDF2 step, e.g. when it already ran on the crypto executor.
         """
         # Generate RSA key pair
         private_key = rsa.generate_private_key(
@@ -48,15 +79,10 @@ class DocumentEncryption:
         public_key = private_key.public_key()
         
         # Derive encryption key from password
-        salt = os.urandom(self.salt_size)
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-            backend=self.backend
-        )
-        key = kdf.derive(password.encode())
+        if derived_key is None:
+            salt = os.urandom(self.salt_size)
+            derived_key = derive_password_key(password, salt)
+        key = derived_key
         
         # Encrypt private key with derived key
         private_pem = private_key.private_bytes(
@@ -78,17 +104,17 @@ class DocumentEncryption:
             'created_at': datetime.utcnow().isoformat()
         }
     
-    def compress_document(self, document_data: bytes) -> bytes:
+    def compress_document(self, document_data: bytes, codec: str = compression.LEGACY_CODEC) -> bytes:
         """
-        Compress document data using gzip
+        Compress document data with a codec from compression.CODECS
         """
-        return gzip.compress(document_data, compresslevel=9)
+        return compression.compress(document_data, codec)
     
-    def decompress_document(self, compressed_data: bytes) -> bytes:
+    def decompress_document(self, compressed_data: bytes, codec: str = compression.LEGACY_CODEC) -> bytes:
         """
         Decompress document data
         """
-        return gzip.decompress(compressed_data)
+        return compression.decompress(compressed_data, codec)
     
     def generate_document_key(self) -> Tuple[bytes, bytes]:
         """
@@ -98,39 +124,47 @@ class DocumentEncryption:
         iv = os.urandom(self.iv_size)
         return key, iv
     
-    def encrypt_document(self, document_data: bytes, aes_key: bytes, iv: bytes) -> bytes:
+    def encrypt_document(self, document_data: bytes, aes_key: bytes, iv: bytes,
+                         codec: str = compression.LEGACY_CODEC) -> bytes:
         """
         Encrypt document data using AES-256-CBC
         """
-        # Compress first
-        compressed_data = self.compress_document(document_data)
-        
-        # Pad data to block size
-        padded_data = self._pad_data(compressed_data)
-        
-        # Encrypt
+        return self._encrypt_stream(document_data, aes_key, iv, codec)[0]
+    
+    def _encrypt_stream(self, document_data: bytes, aes_key: bytes, iv: bytes,
+                        codec: str) -> Tuple[bytes, int]:
+        """
+        Compress, pad and encrypt chunk by chunk
+        Returns the ciphertext and the compressed size
+        """
         cipher = Cipher(algorithms.AES(aes_key), modes.CBC(iv), backend=self.backend)
         encryptor = cipher.encryptor()
-        encrypted_data = encryptor.update(padded_data) + encryptor.finalize()
+        padder = sym_padding.PKCS7(128).padder()
+        
+        encrypted_parts = []
+        compressed_size = 0
+        for compressed_chunk in compression.compress_stream(compression.iter_chunks(document_data), codec):
+            compressed_size += len(compressed_chunk)
+            encrypted_parts.append(encryptor.update(padder.update(compressed_chunk)))
+        encrypted_parts.append(encryptor.update(padder.finalize()) + encryptor.finalize())
         
-        return encrypted_data
+        return b"".join(encrypted_parts), compressed_size
     
-    def decrypt_document(self, encrypted_data: bytes, aes_key: bytes, iv: bytes) -> bytes:
+    def decrypt_document(self, encrypted_data: bytes, aes_key: bytes, iv: bytes,
+                         codec: str = compression.LEGACY_CODEC) -> bytes:
         """
         Decrypt document data and decompress
         """
-        # Decrypt
         cipher = Cipher(algorithms.AES(aes_key), modes.CBC(iv), backend=self.backend)
         decryptor = cipher.decryptor()
-        padded_data = decryptor.update(encrypted_data) + decryptor.finalize()
-        
-        # Unpad
-        compressed_data = self._unpad_data(padded_data)
+        unpadder = sym_padding.PKCS7(128).unpadder()
         
-        # Decompress
-        document_data = self.decompress_document(compressed_data)
+        def compressed_chunks():
+            for encrypted_chunk in compression.iter_chunks(encrypted_data):
+                yield unpadder.update(decryptor.update(encrypted_chunk))
+            yield unpadder.update(decryptor.finalize()) + unpadder.finalize()
         
-        return document_data
+        return b"".join(compression.decompress_stream(compressed_chunks(), codec))
     
     def encrypt_document_key(self, aes_key: bytes, iv: bytes, public_key_pem: str) -> str:
         """
@@ -156,20 +190,14 @@ class DocumentEncryption:
         
         return base64.b64encode(encrypted_key).decode('utf-8')
     
-    def decrypt_document_key(self, encrypted_key_b64: str, private_key_pem: str, password: str, salt: str) -> Tuple[bytes, bytes]:
+    def decrypt_document_key(self, encrypted_key_b64: str, private_key_pem: str, password: str, salt: str,
+                             derived_key: Optional[bytes] = None) -> Tuple[bytes, bytes]:
         """
         Decrypt the document AES key using RSA private key
         """
         # Derive key from password
-        salt_bytes = base64.b64decode(salt)
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt_bytes,
-            iterations=100000,
-            backend=self.backend
-        )
-        derived_key = kdf.derive(password.encode())
+        if derived_key is None:
+            derived_key = derive_password_key(password, base64.b64decode(salt))
         
         # Load private key
         private_key = serialization.load_pem_private_key(
@@ -195,16 +223,21 @@ class DocumentEncryption:
         
         return aes_key, iv
     
-    def create_encrypted_document(self, document_data: bytes, public_key_pem: str) -> Dict[str, Any]:
+    def create_encrypted_document(self, document_data: bytes, public_key_pem: str,
+                                  raw: bool = False, filename: Optional[str] = None,
+                                  mime_type: Optional[str] = None) -> Dict[str, Any]:
         """
         Full document encryption process
         Returns encrypted document with metadata
+        (encrypted_data is base64 text, or the raw ciphertext bytes if raw)
+        filename / mime_type let already-compressed formats skip compression
         """
         # Generate document encryption key
         aes_key, iv = self.generate_document_key()
         
-        # Encrypt document
-        encrypted_document = self.encrypt_document(document_data, aes_key, iv)
+        # Compress and encrypt document
+        codec = compression.choose_codec(document_data, filename, mime_type)
+        encrypted_document, compressed_size = self._encrypt_stream(document_data, aes_key, iv, codec)
         
         # Encrypt the document key with user's public key
         encrypted_key = self.encrypt_document_key(aes_key, iv, public_key_pem)
@@ -212,8 +245,10 @@ class DocumentEncryption:
         # Create metadata
         metadata = {
             'encrypted_key': encrypted_key,
+            'key_id': key_fingerprint(public_key_pem),
             'original_size': len(document_data),
-            'compressed_size': len(self.compress_document(document_data)),
+            'compressed_size': compressed_size,
+            'compression': codec,
             'encrypted_size': len(encrypted_document),
             'encryption_algorithm': 'AES-256-CBC',
             'key_algorithm': 'RSA-2048-OAEP',
@@ -222,26 +257,33 @@ class DocumentEncryption:
         }
         
         return {
-            'encrypted_data': base64.b64encode(encrypted_document).decode('utf-8'),
+            'encrypted_data': encrypted_document if raw else base64.b64encode(encrypted_document).decode('utf-8'),
             'metadata': metadata
         }
     
-    def decrypt_encrypted_document(self, encrypted_data_b64: str, metadata: Dict[str, Any], 
-                                 private_key_pem: str, password: str, salt: str) -> bytes:
+    def decrypt_encrypted_document(self, encrypted_data_b64, metadata: Dict[str, Any], 
+                                 private_key_pem: str, password: str, salt: str,
+                                 derived_key: Optional[bytes] = None) -> bytes:
         """
         Full document decryption process
+        (encrypted_data_b64 may also be the raw ciphertext bytes)
         """
         # Decrypt document key
         aes_key, iv = self.decrypt_document_key(
             metadata['encrypted_key'], 
             private_key_pem, 
             password, 
-            salt
+            salt,
+            derived_key=derived_key
         )
         
         # Decrypt document
-        encrypted_data = base64.b64decode(encrypted_data_b64)
-        document_data = self.decrypt_document(encrypted_data, aes_key, iv)
+        if isinstance(encrypted_data_b64, bytes):
+            encrypted_data = encrypted_data_b64
+        else:
+            encrypted_data = base64.b64decode(encrypted_data_b64)
+        codec = metadata.get('compression', compression.LEGACY_CODEC)
+        document_data = self.decrypt_document(encrypted_data, aes_key, iv, codec)
         
         # Verify checksum
         if hashlib.sha256(document_data).hexdigest() != metadata['checksum']:
@@ -249,21 +291,32 @@ class DocumentEncryption:
         
         return document_data
     
-    def _pad_data(self, data: bytes) -> bytes:
-        """
-        PKCS7 padding for AES
-        """
-        block_size = 16
-        padding_length = block_size - (len(data) % block_size)
-        padding = bytes([padding_length] * padding_length)
-        return data + padding
-    
-    def _unpad_data(self, padded_data: bytes) -> bytes:
+    def rewrap_document_keys(self, encrypted_keys_b64: List[str], private_key_pem: str,
+                             derived_key: bytes, new_public_key_pem: str) -> List[str]:
         """
-        Remove PKCS7 padding
+        Re-wrap document keys (AES key + IV) from one RSA keypair to another
+        Document bodies are untouched; both keys are loaded once per call
         """
-        padding_length = padded_data[-1]
-        return padded_data[:-padding_length]
+        private_key = serialization.load_pem_private_key(
+            base64.b64decode(private_key_pem),
+            password=derived_key,
+            backend=self.backend
+        )
+        new_public_key = serialization.load_pem_public_key(
+            base64.b64decode(new_public_key_pem),
+            backend=self.backend
+        )
+        oaep = padding.OAEP(
+            mgf=padding.MGF1(algorithm=hashes.SHA256()),
+            algorithm=hashes.SHA256(),
+            label=None
+        )
+        
+        rewrapped = []
+        for encrypted_key_b64 in encrypted_keys_b64:
+            key_data = private_key.decrypt(base64.b64decode(encrypted_key_b64), oaep)
+            rewrapped.append(base64.b64encode(new_public_key.encrypt(key_data, oaep)).decode('utf-8'))
+        return rewrapped
 
 
 class SecureDocumentManager:
@@ -283,28 +336,33 @@ class SecureDocumentManager:
         return keypair
     
     def encrypt_and_store_document(self, document_data: bytes, filename: str, 
-                                 public_key_pem: str) -> Dict[str, Any]:
+                                 public_key_pem: str, raw: bool = False) -> Dict[str, Any]:
         """
         Encrypt document and prepare for storage
         """
-        encrypted_doc = self.encryption.create_encrypted_document(document_data, public_key_pem)
+        mime_type = self._get_mime_type(filename)
+        encrypted_doc = self.encryption.create_encrypted_document(
+            document_data, public_key_pem, raw=raw, filename=filename, mime_type=mime_type
+        )
         
         # Add file metadata
         encrypted_doc['metadata'].update({
             'original_filename': filename,
             'file_extension': os.path.splitext(filename)[1].lower(),
-            'mime_type': self._get_mime_type(filename)
+            'mime_type': mime_type
         })
         
         return encrypted_doc
     
-    def decrypt_and_retrieve_document(self, encrypted_data_b64: str, metadata: Dict[str, Any],
-                                    private_key_pem: str, password: str, salt: str) -> Tuple[bytes, str]:
+    def decrypt_and_retrieve_document(self, encrypted_data_b64, metadata: Dict[str, Any],
+                                    private_key_pem: str, password: str, salt: str,
+                                    derived_key: Optional[bytes] = None) -> Tuple[bytes, str]:
         """
         Decrypt document and return data with filename
         """
         document_data = self.encryption.decrypt_encrypted_document(
-            encrypted_data_b64, metadata, private_key_pem, password, salt
+            encrypted_data_b64, metadata, private_key_pem, password, salt,
+            derived_key=derived_key
         )
         
         filename = metadata.get('original_filename', 'document')
@@ -338,29 +396,26 @@ class KeyManager:
     def __init__(self):
         self.encryption = DocumentEncryption()
     
-    def store_user_keys(self, user_id: str, password: str) -> Dict[str, str]:
+    def store_user_keys(self, user_id: str, password: str, salt: Optional[bytes] = None,
+                        derived_key: Optional[bytes] = None) -> Dict[str, str]:
         """
         Generate and return user encryption keys
         Keys should be stored securely in database
         """
-        return self.encryption.generate_user_keypair(password)
+        return self.encryption.generate_user_keypair(password, salt=salt, derived_key=derived_key)
     
     def rotate_user_keys(self, user_id: str, old_password: str, new_password: str, 
-                        current_private_key: str, salt: str) -> Dict[str, str]:
+                        current_private_key: str, salt: str,
+                        old_derived_key: Optional[bytes] = None,
+                        new_salt: Optional[bytes] = None,
+                        new_derived_key: Optional[bytes] = None) -> Dict[str, str]:
         """
         Rotate user keys when password changes
         """
         # First verify old password can decrypt current key
         try:
-            salt_bytes = base64.b64decode(salt)
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt_bytes,
-                iterations=100000,
-                backend=default_backend()
-            )
-            old_derived_key = kdf.derive(old_password.encode())
+            if old_derived_key is None:
+                old_derived_key = derive_password_key(old_password, base64.b64decode(salt))
             
             # Try to load the private key with old password
             serialization.load_pem_private_key(
@@ -372,22 +427,27 @@ class KeyManager:
             raise ValueError("Invalid old password")
         
         # Generate new keys with new password
-        return self.encryption.generate_user_keypair(new_password)
+        return self.encryption.generate_user_keypair(
+            new_password, salt=new_salt, derived_key=new_derived_key
+        )
     
-    def verify_user_access(self, private_key_pem: str, password: str, salt: str) -> bool:
+    def rewrap_document_keys(self, encrypted_keys_b64: List[str], private_key_pem: str,
+                             derived_key: bytes, new_public_key_pem: str) -> List[str]:
+        """
+        Re-wrap a batch of document keys for a rotated keypair
+        """
+        return self.encryption.rewrap_document_keys(
+            encrypted_keys_b64, private_key_pem, derived_key, new_public_key_pem
+        )
+    
+    def verify_user_access(self, private_key_pem: str, password: str, salt: str,
+                           derived_key: Optional[bytes] = None) -> bool:
         """
         Verify user can access their private key
         """
         try:
-            salt_bytes = base64.b64decode(salt)
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt_bytes,
-                iterations=100000,
-                backend=default_backend()
-            )
-            derived_key = kdf.derive(password.encode())
+            if derived_key is None:
+                derived_key = derive_password_key(password, base64.b64decode(salt))
             
             serialization.load_pem_private_key(
                 base64.b64decode(private_key_pem),
@@ -0,0 +1,174 @@
+"""
+Short-lived unlocked-key sessions for the encrypted files API
+
+Unlocking a user's private key costs a 100k-iteration PBKDF2 derivation.
+After one successful unlock the derived key is kept here for
+KEY_SESSION_TTL seconds so further decrypts skip it:
+
+- entries are sealed with AES-GCM under a random per-process key (bound to
+  the user id and key salt), so raw derived keys never sit in the cache
+- a request that supplies the password is matched against an HMAC of it,
+  which is cheap, instead of being re-derived
+- a request that supplies no password uses the session if there is one
+- lock() wipes a user's entries (explicit lock, key rotation)
+
+Only POST /encryption/unlock opens a session; other password-checked
+requests unlock the key for themselves alone.
+
+The cache is per process, so ending a session (lock, logout, rotation)
+goes through broadcast_lock(): pg_notify(KEY_LOCK_CHANNEL, <user id>) is
+LISTENed to by a KeyLockListener in every worker. A worker that is not
+listening could miss a lock, so its cache is cleared and serves no
+sessions until the listener is (re)connected.
+"""
+
+import asyncio
+import hmac
+import os
+import hashlib
+import logging
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import asyncpg
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from decouple import config
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from .database import DATABASE_URL, engine
+
+logger = logging.getLogger(__name__)
+
+
+KEY_SESSION_TTL = config('KEY_SESSION_TTL', default=900, cast=int)  # seconds
+KEY_SESSION_MAX_ENTRIES = config('KEY_SESSION_MAX_ENTRIES', default=10000, cast=int)
+KEY_LOCK_CHANNEL = 'encryption_keys_locked'
+KEY_LOCK_RECONNECT_DELAY = 5  # seconds
+
+
+class UnlockedKeyCache:
+    """TTL + LRU cache of sealed derived keys, keyed by (user id, key salt)"""
+
+    def __init__(self, ttl: int = KEY_SESSION_TTL, max_entries: int = KEY_SESSION_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._aead = AESGCM(AESGCM.generate_key(bit_length=256))
+        self._hmac_key = os.urandom(32)
+        # (user_id, key_salt) -> (expires_at, nonce, sealed key, password verifier)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, bytes, bytes, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.enabled = False  # set while lock broadcasts are being received
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Stop serving sessions and forget every unlocked key"""
+        with self._lock:
+            self.enabled = False
+            self._entries.clear()
+
+    def _verifier(self, user_id: str, password: str) -> bytes:
+        return hmac.new(self._hmac_key, f"{user_id}:{password}".encode(), hashlib.sha256).digest()
+
+    def put(self, user_id: str, key_salt: str, password: str, derived_key: bytes) -> int:
+        """Store an unlocked key; returns its lifetime in seconds (0 if disabled)"""
+        nonce = os.urandom(12)
+        sealed = self._aead.encrypt(nonce, derived_key, f"{user_id}:{key_salt}".encode())
+        entry = (time.monotonic() + self.ttl, nonce, sealed, self._verifier(user_id, password))
+        with self._lock:
+            if not self.enabled:
+                return 0
+            self._entries[(user_id, key_salt)] = entry
+            self._entries.move_to_end((user_id, key_salt))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return self.ttl
+
+    def get(self, user_id: str, key_salt: str, password: Optional[str] = None) -> Optional[bytes]:
+        """
+        The derived key for (user_id, key_salt) if unlocked and not expired;
+        with a password, only if it is the password that unlocked it
+        """
+        with self._lock:
+            entry = self._entries.get((user_id, key_salt)) if self.enabled else None
+            if entry is None:
+                return None
+            expires_at, nonce, sealed, verifier = entry
+            if expires_at <= time.monotonic():
+                del self._entries[(user_id, key_salt)]
+                return None
+        if password is not None and not hmac.compare_digest(verifier, self._verifier(user_id, password)):
+            return None
+        return self._aead.decrypt(nonce, sealed, f"{user_id}:{key_salt}".encode())
+
+    def lock(self, user_id: str) -> None:
+        """Forget every unlocked key of a user"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+
+unlocked_keys = UnlockedKeyCache()
+
+
+async def broadcast_lock(user_id: str) -> None:
+    """End a user's unlocked-key sessions in every worker"""
+    unlocked_keys.lock(user_id)
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("SELECT pg_notify(:channel, :user_id)"),
+            {'channel': KEY_LOCK_CHANNEL, 'user_id': user_id}
+        )
+
+
+class KeyLockListener:
+    """Background LISTEN on KEY_LOCK_CHANNEL; unlocked_keys is enabled only while it is connected"""
+
+    def __init__(self, cache: UnlockedKeyCache = unlocked_keys, dsn: Optional[str] = None):
+        self.cache = cache
+        self.dsn = dsn
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self.cache.disable()
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        self.cache.lock(payload)
+
+    async def _run(self) -> None:
+        while True:
+            connection = None
+            try:
+                dsn = self.dsn or make_url(DATABASE_URL).set(drivername='postgresql').render_as_string(hide_password=False)
+                connection = await asyncpg.connect(dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(KEY_LOCK_CHANNEL, self._on_notification)
+                self.cache.enable()
+                await closed.wait()
+                logger.warning("Key lock listener connection closed; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Key lock listener failed: {e}")
+            finally:
+                self.cache.disable()
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(KEY_LOCK_RECONNECT_DELAY)
+
+
+key_lock_listener = KeyLockListener()
@@ -4,9 +4,9 @@ Database models for TaxEase application
 
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, Float, ForeignKey, LargeBinary
+from sqlalchemy import Column, String, DateTime, Boolean, Text, Integer, Float, ForeignKey, LargeBinary, Index, JSON
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 
 from .database import Base
@@ -30,6 +30,10 @@ class User(Base):
     private_key = Column(Text, nullable=True)  # Encrypted RSA private key
     key_salt = Column(String(255), nullable=True)  # Salt for key derivation
     key_created_at = Column(DateTime(timezone=True), nullable=True)
+    # New keypair while a key rotation is in progress (see EncryptedFileService.rotate_user_keys)
+    pending_public_key = Column(Text, nullable=True)
+    pending_private_key = Column(Text, nullable=True)
+    pending_key_salt = Column(String(255), nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -78,7 +82,7 @@ class T1PersonalForm(Base):
     status = Column(String(20), default="draft")  # draft, in_progress, review, submitted, processed
     
     # Encrypted form data (contains all the detailed form information)
-    encrypted_form_data = Column(LargeBinary, nullable=True)  # Encrypted + compressed form JSON
+    encrypted_form_data = deferred(Column(LargeBinary, nullable=True))  # Encrypted + compressed form JSON
     encryption_metadata = Column(Text, nullable=True)  # JSON metadata about encryption
     is_encrypted = Column(Boolean, default=True)
     
@@ -131,12 +135,15 @@ class File(Base):
     original_filename = Column(String(255), nullable=False)
     file_type = Column(String(100), nullable=False)
     file_size = Column(Integer, nullable=False)  # Original file size
+    compressed_size = Column(Integer, nullable=True)  # Size after compression, before encryption
     
     # Encryption metadata
-    encrypted_data = Column(LargeBinary, nullable=True)  # Encrypted + compressed file data
+    # Legacy: base64 ciphertext (new files use blob_locator); deferred so File queries never load it
+    encrypted_data = deferred(Column(LargeBinary, nullable=True))
     encrypted_key = Column(Text, nullable=True)  # RSA encrypted AES key
     encryption_metadata = Column(Text, nullable=True)  # JSON metadata about encryption
     is_encrypted = Column(Boolean, default=True)
+    blob_locator = Column(String(255), nullable=True)  # BlobStore locator of the raw ciphertext
     
     # Legacy S3 support (for non-encrypted files)
     s3_bucket = Column(String(100), nullable=True)
@@ -147,6 +154,10 @@ class File(Base):
     
     # Relationships
     user = relationship("User", back_populates="files")
+    
+    __table_args__ = (
+        Index('ix_files_user_id_created_at', 'user_id', 'created_at'),
+    )
 
 class Report(Base):
     """Generated reports"""
@@ -170,7 +181,7 @@ class EncryptedDocument(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     file_id = Column(UUID(as_uuid=True), ForeignKey("files.id"), nullable=False)
-    encrypted_data = Column(LargeBinary, nullable=False)  # Large encrypted data
+    encrypted_data = deferred(Column(LargeBinary, nullable=False))  # Large encrypted data
     checksum = Column(String(64), nullable=False)  # SHA256 checksum
     compression_ratio = Column(Float, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -190,3 +201,19 @@ class AuditLog(Base):
     
     # Relationships
     user = relationship("User", back_populates="audit_logs")
+
+class AdminSyncOutbox(Base):
+    """Pending admin-dashboard sync events (written with the change, drained by AdminSyncWorker)"""
+    __tablename__ = "admin_sync_outbox"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    event_type = Column(String(30), nullable=False)  # client, t1_form, file
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    
+    __table_args__ = (
+        Index('ix_admin_sync_outbox_available', 'available_at', 'created_at'),
+    )
@@ -4,7 +4,7 @@ Pydantic schemas for request/response validation
 
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import BaseModel, EmailStr, Field, validator
 from uuid import UUID
 from typing import Any, Dict
 
@@ -212,8 +212,19 @@ class EncryptedFileListResponse(BaseSchema):
     total: int
 
 class EncryptedFileDecryptRequest(BaseSchema):
+    password: Optional[str] = None  # optional while keys are unlocked
+
+class EncryptedFileBatchDownloadRequest(BaseSchema):
+    file_ids: List[UUID] = Field(..., min_length=1, max_length=50)
+    password: Optional[str] = None  # optional while keys are unlocked
+
+class EncryptionUnlockRequest(BaseSchema):
     password: str
 
+class EncryptionUnlockResponse(BaseSchema):
+    message: str
+    expires_in: int  # seconds
+
 class FileDecryptResponse(BaseSchema):
     message: str
     filename: str
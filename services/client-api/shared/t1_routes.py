@@ -5,8 +5,8 @@ Handles comprehensive T1 form data with automatic encryption
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.orm import selectinload, undefer
 import uuid
 import json
 import base64
@@ -184,19 +184,31 @@ async def get_t1_forms(
     Returns metadata only (encrypted content requires separate decrypt call)
     """
     try:
-        query = select(T1PersonalForm).where(T1PersonalForm.user_id == current_user.id)
+        filters = [T1PersonalForm.user_id == current_user.id]
         
         # Apply filters
         if status_filter:
-            query = query.where(T1PersonalForm.status == status_filter)
+            filters.append(T1PersonalForm.status == status_filter)
         if tax_year:
-            query = query.where(T1PersonalForm.tax_year == tax_year)
+            filters.append(T1PersonalForm.tax_year == tax_year)
+        
+        # Only the listed columns; the encrypted form body is never loaded
+        query = select(
+            T1PersonalForm.id, T1PersonalForm.user_id, T1PersonalForm.created_at,
+            T1PersonalForm.updated_at, T1PersonalForm.status, T1PersonalForm.is_encrypted,
+            T1PersonalForm.encryption_metadata, T1PersonalForm.first_name,
+            T1PersonalForm.last_name, T1PersonalForm.email,
+            T1PersonalForm.has_foreign_property, T1PersonalForm.has_medical_expenses,
+            T1PersonalForm.has_charitable_donations, T1PersonalForm.has_moving_expenses,
+            T1PersonalForm.is_self_employed, T1PersonalForm.is_first_home_buyer,
+            T1PersonalForm.is_first_time_filer
+        ).where(*filters)
             
         # Apply pagination
         query = query.offset(offset).limit(limit).order_by(T1PersonalForm.created_at.desc())
         
         result = await db.execute(query)
-        forms = result.scalars().all()
+        forms = result.all()
         
         # Convert to response format (metadata only)
         form_responses = []
@@ -235,14 +247,9 @@ async def get_t1_forms(
             form_responses.append(form_response)
         
         # Get total count
-        count_query = select(T1PersonalForm).where(T1PersonalForm.user_id == current_user.id)
-        if status_filter:
-            count_query = count_query.where(T1PersonalForm.status == status_filter)
-        if tax_year:
-            count_query = count_query.where(T1PersonalForm.tax_year == tax_year)
-            
-        total_result = await db.execute(count_query)
-        total = len(total_result.scalars().all())
+        total = await db.scalar(
+            select(func.count()).select_from(T1PersonalForm).where(*filters)
+        )
         
         return {
             "forms": form_responses,
@@ -273,13 +280,14 @@ async def get_t1_form(
     - If False, returns only metadata for privacy
     """
     try:
-        # Get form from database
-        result = await db.execute(
-            select(T1PersonalForm).where(
-                T1PersonalForm.id == form_id,
-                T1PersonalForm.user_id == current_user.id
-            )
+        # Get form from database (the deferred encrypted body only when decrypting)
+        query = select(T1PersonalForm).where(
+            T1PersonalForm.id == form_id,
+            T1PersonalForm.user_id == current_user.id
         )
+        if decrypt:
+            query = query.options(undefer(T1PersonalForm.encrypted_form_data))
+        result = await db.execute(query)
         form = result.scalar_one_or_none()
         
         if not form:
@@ -361,12 +369,12 @@ async def update_t1_form(
     Update a T1 form with re-encryption of modified data
     """
     try:
-        # Get existing form
+        # Get existing form (with its deferred encrypted body, merged below)
         result = await db.execute(
             select(T1PersonalForm).where(
                 T1PersonalForm.id == form_id,
                 T1PersonalForm.user_id == current_user.id
-            )
+            ).options(undefer(T1PersonalForm.encrypted_form_data))
         )
         form = result.scalar_one_or_none()
         